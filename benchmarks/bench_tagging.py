@@ -0,0 +1,69 @@
+# 자동 태깅 처리량 측정 (images/second)
+# 사용: python -m benchmarks.bench_tagging --model models/xxx.onnx --images <폴더> --batch-sizes 1,8,32
+import argparse
+import glob
+import os
+import time
+
+import numpy as np
+
+from src.ai.preprocess import make_batch
+from src.ai.tagger import GarmentTagger
+
+IMAGE_PATTERNS = ('*.jpg', '*.jpeg', '*.png', '*.bmp')
+
+
+def collect_images(folder, limit):
+    paths = []
+    for pattern in IMAGE_PATTERNS:
+        paths.extend(glob.glob(os.path.join(folder, '**', pattern), recursive=True))
+    return sorted(paths)[:limit]
+
+
+def bench_inference(tagger, n_images, repeats=3):
+    # 디코딩 제외, 세션 추론만 (무작위 입력)
+    batch = np.random.rand(tagger.batch_size, 3, tagger.input_size, tagger.input_size).astype(np.float32)
+    tagger.predict_arrays(batch)  # 워밍업
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(0, n_images, tagger.batch_size):
+            tagger.predict_arrays(batch)
+        best = min(best, time.perf_counter() - start)
+    processed = -(-n_images // tagger.batch_size) * tagger.batch_size
+    return processed / best
+
+
+def bench_end_to_end(tagger, paths):
+    # 디코딩 + 전처리 + 추론
+    start = time.perf_counter()
+    tagger.predict_paths(paths)
+    elapsed = time.perf_counter() - start
+    decode_start = time.perf_counter()
+    make_batch(paths[:tagger.batch_size], tagger.input_size)
+    decode_per_image = (time.perf_counter() - decode_start) / max(1, min(len(paths), tagger.batch_size))
+    return len(paths) / elapsed, decode_per_image
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ONNX 자동 태깅 처리량 벤치마크")
+    parser.add_argument('--model', default=None, help="ONNX 모델 경로 (기본: models_info.json 우선순위)")
+    parser.add_argument('--images', default=None, help="실제 이미지 폴더 (없으면 추론만 측정)")
+    parser.add_argument('--count', type=int, default=256, help="측정할 이미지 수")
+    parser.add_argument('--batch-sizes', default='1,8,32')
+    args = parser.parse_args(argv)
+
+    paths = collect_images(args.images, args.count) if args.images else []
+    print(f"{'batch':>6} {'infer img/s':>12} {'e2e img/s':>10} {'decode ms/img':>14}")
+    for batch_size in (int(b) for b in args.batch_sizes.split(',')):
+        tagger = GarmentTagger(args.model, batch_size=batch_size)
+        infer_ips = bench_inference(tagger, args.count)
+        if paths:
+            e2e_ips, decode_s = bench_end_to_end(tagger, paths)
+            print(f"{tagger.batch_size:>6} {infer_ips:>12.1f} {e2e_ips:>10.1f} {decode_s * 1000:>14.2f}")
+        else:
+            print(f"{tagger.batch_size:>6} {infer_ips:>12.1f} {'-':>10} {'-':>14}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,359 @@
+# 옷장 규모별 핫패스 벤치마크 (화면 없이 offscreen으로 실제 MainWindow 코드 경로를 측정)
+# 사용: python -m benchmarks.run --sizes 100,1000,10000,50000 --out results.json
+#       python -m benchmarks.run --sizes 1000 --compare baseline.json   (느려진 항목이 있으면 종료 코드 1)
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import numpy as np
+
+DEFAULT_SIZES = '100,1000,10000,50000'
+DEFAULT_THRESHOLD = 0.2   # 기준보다 20% 넘게 나빠지면 회귀로 판정
+MIN_DELTA_MS = 1.0        # 이보다 작은 시간 차이는 측정 잡음으로 보고 회귀로 치지 않음
+INGEST_SAMPLE = 100       # 가져오기(handle_image_files)로 넣는 새 이미지 수
+THUMBNAIL_SAMPLE = 100    # 썸네일 디코딩/캐시 측정 이미지 수
+TAGGING_SAMPLE = 64
+REPEATS = 10              # 빠른 동기 호출의 반복 측정 횟수
+OUTFIT_PAGES = 50         # 넘겨 보는 추천 코디 수
+LOAD_TIMEOUT = 600        # 비동기 작업(옷장 불러오기/가져오기) 대기 상한(초)
+SEARCH_QUERIES = ['상', '셔츠', '셫', 'ㅅㅊ', '파랑', '셔츠 파랑', 'item_01', '없는 항목', '']
+RECOMMEND_REQUESTS = [
+    dict(situation='일상', style='캐주얼', weather='맑음', temperature=20),
+    dict(situation='업무', style='포멀', weather='흐림', temperature=8),
+    dict(situation='데이트', style='빈티지', weather='비', temperature=27, priority='style'),
+]
+
+
+def summarize(samples, unit='ms', better='lower'):
+    samples = np.asarray(samples, dtype=np.float64)
+    return {
+        'value': float(np.median(samples)),
+        'p95': float(np.percentile(samples, 95)),
+        'runs': int(len(samples)),
+        'unit': unit,
+        'better': better,
+    }
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return (time.perf_counter() - start) * 1000.0, result
+
+
+class Bench:
+    # 한 번의 실행 결과: {'<규모>/<항목>': summarize(...)}
+    def __init__(self, app):
+        self.app = app
+        self.results = {}
+
+    def record(self, key, samples, unit='ms', better='lower'):
+        self.results[key] = summarize(samples, unit, better)
+        print(f"  {key:<32} {self.results[key]['value']:>10.2f} {unit}", flush=True)
+
+    def pump(self, done, timeout=LOAD_TIMEOUT):
+        # 조건이 참이 될 때까지 이벤트 루프를 돌림 (스레드 풀 결과의 queued 시그널 처리)
+        deadline = time.perf_counter() + timeout
+        while not done():
+            if time.perf_counter() > deadline:
+                raise TimeoutError("벤치마크 대기 시간 초과")
+            self.app.processEvents()
+            time.sleep(0.001)
+
+    def call(self, fn, *args):
+        # 동기 호출 + 그로 인해 예약된 배치/다시 그리기까지
+        start = time.perf_counter()
+        fn(*args)
+        self.app.processEvents()
+        return (time.perf_counter() - start) * 1000.0
+
+
+def bench_closet(bench, n, workdir, pool, ingest_images):
+    from benchmarks.synthetic import build_closet
+    from src.ai.recommend import OutfitRecommender, RecommendRequest
+    from src.ui.main_window import MainWindow
+    from src.ui.outfit_result_widget import outfit_key
+    from src.utils.thumbnails import ThumbnailCache
+
+    home = os.path.join(workdir, f'home_{n}')
+    shutil.rmtree(home, ignore_errors=True)
+    os.makedirs(home)
+    os.environ['EDGE_FASHION_HOME'] = home
+    build_closet(home, n, pool)
+    prefix = str(n)
+
+    # 시작 후 옷장 복원 (DB 읽기 -> 인덱스/모델 -> 색/임베딩 색인), 이어서 첫 화면 썸네일이 모두 채워질 때까지
+    start = time.perf_counter()
+    window = MainWindow()
+    window.show()
+    bench.pump(lambda: len(window.closet_index) >= n)
+    bench.pump(lambda: not window.embedding_index.needs_rebuild())
+    bench.app.processEvents()
+    bench.record(f'{prefix}/closet_load', [(time.perf_counter() - start) * 1000.0])
+    image_list = window.image_list
+    model = image_list.source_model
+    # 격자는 배치 레이아웃이라 첫 배치가 화면을 채울 때까지 기다린 뒤 보이는 경로를 구함
+    bench.pump(lambda: image_list.visible_paths())
+    visible = image_list.visible_paths()
+    bench.pump(lambda: all(model.has_icon(p) for p in visible))
+    bench.record(f'{prefix}/first_screen', [(time.perf_counter() - start) * 1000.0])
+
+    # 불러오기가 끝난 뒤 유휴 시간에 검색 색인이 다 채워질 때까지
+    start = time.perf_counter()
+    bench.pump(lambda: not window.search_index.has_pending)
+    bench.record(f'{prefix}/search_index_idle', [(time.perf_counter() - start) * 1000.0])
+
+    # 궁합 캐시: 처음 채우기(디스크에 없을 때)는 유휴 시간 합계, 이어서 옷 한 벌 색이 바뀌었을 때 그 행만 다시 계산
+    start = time.perf_counter()
+    bench.pump(lambda: not window.compatibility.has_pending)
+    bench.record(f'{prefix}/compat_idle', [(time.perf_counter() - start) * 1000.0])
+    samples = []
+    for item in list(window.closet_index.items.values())[:3]:
+        colors = window.color_index.colors_of(item.item_id)
+        if colors is None:
+            continue
+        labs, weights = colors[0][::-1].copy(), colors[1][::-1].copy()
+        window.set_item_colors([(item.path, labs, weights)], persist=False)
+        start = time.perf_counter()
+        bench.pump(lambda: not window.compatibility.index_pending())
+        samples.append((time.perf_counter() - start) * 1000.0)
+    if samples:
+        bench.record(f'{prefix}/compat_update_one', samples)
+
+    # 메모리 아이콘만 비우고 다시 그리기 (디스크 썸네일 캐시 적중 경로)
+    samples = []
+    for _ in range(3):
+        model.icon_cache.clear()
+        start = time.perf_counter()
+        image_list.viewport().update()
+        bench.pump(lambda: all(model.has_icon(p) for p in visible))
+        samples.append((time.perf_counter() - start) * 1000.0)
+    bench.record(f'{prefix}/thumbnail_viewport', samples)
+
+    # 사이드바 카테고리/하위 항목 필터
+    sidebar = window.sidebar
+    nodes = []
+    for i in range(sidebar.topLevelItemCount()):
+        top = sidebar.topLevelItem(i)
+        nodes.append(top)
+        nodes.extend(top.child(j) for j in range(top.childCount()))
+    samples = [bench.call(window.filter_images_by_category, node, 0) for node in nodes]
+    bench.record(f'{prefix}/filter_category', samples)
+    image_list.set_visible_ids(window.closet_index.all_ids)
+
+    # 사이드바 검색 (색인 질의 + 트리 숨김/표시 + 격자 필터)
+    samples = [bench.call(window.filter_sidebar, query) for _ in range(REPEATS // 2) for query in SEARCH_QUERIES]
+    bench.record(f'{prefix}/sidebar_search', samples)
+
+    # 기온 슬라이더 드래그 한 칸 = 입을 수 있는 옷 수 갱신, 이어서 '입을 수 있는 옷만' 격자 필터
+    slider = window.temp_gauge.slider
+    samples = [bench.call(slider.setValue, t) for t in range(slider.minimum(), slider.maximum() + 1)]
+    bench.record(f'{prefix}/wearable_count', samples)
+    window.wearable_check.setChecked(True)
+    samples = [bench.call(lambda t=t: (slider.setValue(t), window.refresh_wearable()))
+               for t in range(-10, 35, 5)]
+    bench.record(f'{prefix}/wearable_filter', samples)
+    window.wearable_check.setChecked(False)
+    bench.app.processEvents()
+
+    # 스타일 분석 탭: 처음 열기(페이지 생성 + 차트), 이어서 옷 한 벌 재등록 뒤 바뀐 집계만 다시 그리기
+    tabs = window.tab_widget
+    bench.record(f'{prefix}/analysis_open', [bench.call(tabs.setCurrentIndex, 1)])
+    item = next(iter(window.closet_index.items.values()))
+    samples = []
+    for _ in range(3):
+        window.add_closet_items([(item.path, item.tags, item.content_hash)], persist=False)
+        samples.append(bench.call(window.analysis_page.refresh))
+    bench.record(f'{prefix}/analysis_refresh', samples)
+    tabs.setCurrentIndex(0)
+    bench.app.processEvents()
+
+    # 테마 전환 (라이트 <-> 다크)
+    samples = [bench.call(window.on_theme_changed, i % 2) for i in range(REPEATS)]
+    bench.record(f'{prefix}/apply_theme', samples)
+
+    # 추천: 옷장 스냅샷 생성 + 조건별 탐색
+    samples = [timed(OutfitRecommender, window.closet_index, window.color_index, window.embedding_index)[0]
+               for _ in range(3)]
+    bench.record(f'{prefix}/recommender_build', samples)
+    recommender = window.recommender()
+    samples = [timed(recommender.recommend, RecommendRequest(**params))[0]
+               for _ in range(REPEATS // 2) for params in RECOMMEND_REQUESTS]
+    bench.record(f'{prefix}/recommend', samples)
+
+    # 추천 결과 넘겨 보기: 처음 보는 코디(합성 이미지가 나올 때까지), 이어서 다시 보는 코디(합성 이미지 캐시 적중)
+    # 넘길 때마다 미리 읽기가 끝날 때까지 기다림 (사용자가 코디를 보는 시간)
+    widget = window.outfit_result_widget
+    widget.show_outfits(recommender.recommend(RecommendRequest(top_n=OUTFIT_PAGES)))
+    current = lambda: outfit_key(widget.outfits[widget.index])
+    idle = lambda: current() in widget.collages and not widget.loader.has_pending
+    bench.pump(idle)
+
+    def page(step):
+        samples = []
+        for _ in range(len(widget.outfits) - 1):
+            start = time.perf_counter()
+            step()
+            bench.pump(lambda: current() in widget.collages)
+            bench.app.processEvents()
+            samples.append((time.perf_counter() - start) * 1000.0)
+            bench.pump(idle)
+        return samples
+
+    if len(widget.outfits) > 1:
+        bench.record(f'{prefix}/outfit_page_first', page(widget.show_next))
+        bench.record(f'{prefix}/outfit_page_cached', page(widget.show_previous))
+
+    # 썸네일 디코딩 단위 비용 (캐시 없음 / 디스크 캐시 적중)
+    cache = ThumbnailCache(os.path.join(home, 'bench_thumbnails'))
+    sample = pool[:THUMBNAIL_SAMPLE]
+    cold = [timed(cache.get_or_create, path)[0] for path in sample]
+    warm = [timed(cache.get_or_create, path)[0] for path in sample]
+    bench.record(f'{prefix}/thumbnail_decode', cold)
+    bench.record(f'{prefix}/thumbnail_cached', warm)
+
+    # 여러 파일 드롭 = handle_image_files -> 일괄 가져오기(해시/태깅/색 분석/저장소 복사) 완료까지
+    start = time.perf_counter()
+    window.handle_image_files(list(ingest_images))
+    bench.pump(lambda: window.import_job is None and not window.import_queue)
+    elapsed = (time.perf_counter() - start) * 1000.0
+    bench.record(f'{prefix}/ingest_per_image', [elapsed / len(ingest_images)])
+
+    window.close()
+    window.deleteLater()
+    bench.app.processEvents()
+
+
+def bench_tagging(bench, model_path, images):
+    # 모델이 있을 때만: 세션 추론 처리량, 디코딩 포함 처리량, 전처리 캐시 적중 시 처리량
+    from benchmarks.bench_tagging import bench_inference
+    from src.ai.inference import InferenceService
+    from src.ai.tagger import GarmentTagger, find_default_model
+    from src.data.tensor_cache import TensorCache
+    from src.utils.hashing import content_hash
+    from src.utils.paths import app_data_dir
+
+    model_path = model_path or find_default_model()
+    if not model_path:
+        print("  (분류 모델이 없어 태깅 측정 생략)")
+        return None
+    tagger = GarmentTagger(model_path, batch_size=32)
+    bench.record('tagging/infer_ips', [bench_inference(tagger, 256)], 'img/s', 'higher')
+    service = InferenceService(model_path, tensor_cache=TensorCache(app_data_dir('bench_tensors')))
+    try:
+        service.warm_up()
+        keys = [content_hash(path) for path in images]
+        for label in ('tagging/decode_ips', 'tagging/cached_ips'):
+            elapsed, _ = timed(service.predict_paths, images, None, keys)
+            bench.record(label, [len(images) / (elapsed / 1000.0)], 'img/s', 'higher')
+    finally:
+        service.close()
+    return model_path
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout.strip()
+    except OSError:
+        return ''
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    # 두 결과의 공통 항목을 비교해 표로 출력하고 회귀 항목 목록을 반환
+    regressions = []
+    print(f"\n{'항목':<32} {'기준':>10} {'현재':>10} {'변화':>8}")
+    for key, current in results.items():
+        base = baseline.get(key)
+        if base is None or not base['value'] or not current['value']:
+            continue
+        if current['better'] == 'higher':
+            slowdown = base['value'] / current['value'] - 1.0
+        else:
+            slowdown = current['value'] / base['value'] - 1.0
+        mark = ''
+        noise = current['unit'] == 'ms' and abs(current['value'] - base['value']) < MIN_DELTA_MS
+        if slowdown > threshold and not noise:
+            regressions.append(key)
+            mark = '  회귀'
+        print(f"{key:<32} {base['value']:>10.2f} {current['value']:>10.2f} {slowdown:>+7.0%}{mark}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="가상 옷장 규모별 핫패스 벤치마크 (headless)")
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help="옷장 항목 수 목록 (쉼표 구분)")
+    parser.add_argument('--out', default=None, help="결과 JSON 저장 경로")
+    parser.add_argument('--compare', default=None, help="비교할 기준 결과 JSON")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help="회귀로 볼 악화 비율")
+    parser.add_argument('--model', default=None, help="태깅 측정용 ONNX 모델 (기본: models_info.json 우선순위)")
+    parser.add_argument('--skip-tagging', action='store_true')
+    parser.add_argument('--workdir', default=None, help="가상 옷장/이미지를 만들 폴더 (기본: 임시 폴더, 끝나면 삭제)")
+    args = parser.parse_args(argv)
+    baseline = None
+    if args.compare:
+        # 측정 전에 읽어, 경로가 틀렸으면 바로 실패
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix='edge_fashion_bench_')
+    os.environ['EDGE_FASHION_HOME'] = os.path.join(workdir, 'home')
+    from PySide6.QtWidgets import QApplication, QDialog
+    from benchmarks.synthetic import POOL_SIZE, make_images
+    import src.ui.main_window as main_window
+    # 확신도가 낮은 가져오기 결과의 검토 대화상자는 모달이라, 측정 중에는 바로 닫힌 것으로 처리
+    main_window.ImportReviewDialog.exec = lambda self: QDialog.Rejected
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    bench = Bench(app)
+    try:
+        print("이미지 풀 생성...", flush=True)
+        pool = make_images(os.path.join(workdir, 'pool'), POOL_SIZE, seed=0)
+        ingest_images = make_images(os.path.join(workdir, 'ingest'), INGEST_SAMPLE, seed=1)
+        sizes = [int(s) for s in args.sizes.split(',') if s]
+        for n in sizes:
+            print(f"옷장 {n}벌", flush=True)
+            bench_closet(bench, n, workdir, pool, ingest_images)
+        model_path = None
+        if not args.skip_tagging:
+            print("자동 태깅", flush=True)
+            model_path = bench_tagging(bench, args.model, pool[:TAGGING_SAMPLE])
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        'meta': {
+            'revision': git_revision(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'sizes': sizes,
+            'model': os.path.basename(model_path) if model_path else None,
+        },
+        'results': bench.results,
+    }
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n결과 저장: {args.out}")
+    if baseline is not None:
+        regressions = compare(bench.results, baseline['results'], args.threshold)
+        if regressions:
+            print(f"\n회귀 {len(regressions)}건: {', '.join(regressions)}")
+            return 1
+        print("\n회귀 없음")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,101 @@
+# 벤치마크용 가상 옷장 생성: 실제 JPEG 이미지 풀 + 옷장 DB/임베딩 저장소 채우기
+import os
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from src.ai.color import NUM_COLORS, pack_colors
+from src.ai.embedding import EMBEDDING_DIM
+from src.data.categories import CATEGORIES
+from src.data.closet_db import ClosetDB
+from src.data.embedding_store import EmbeddingStore
+
+IMAGE_SIZE = (240, 320)   # (가로, 세로) 휴대폰 사진을 줄인 정도
+POOL_SIZE = 500           # 서로 다른 이미지 수. 옷장 항목은 이 풀을 하드 링크로 나눠 씀
+JPEG_QUALITY = 88
+
+
+def garment_image(rng, size=IMAGE_SIZE):
+    # 밝은 배경 + 옷 모양 도형 몇 개 + 약한 잡음 (단색 이미지보다 실제 사진에 가까운 디코딩/색 분석 비용)
+    w, h = size
+    background = tuple(int(c) for c in rng.integers(190, 255, 3))
+    img = Image.new('RGB', size, background)
+    draw = ImageDraw.Draw(img)
+    body = tuple(int(c) for c in rng.integers(0, 255, 3))
+    draw.rectangle([w * 0.25, h * 0.2, w * 0.75, h * 0.85], fill=body)
+    for _ in range(int(rng.integers(2, 6))):
+        x, y = rng.integers(0, w - 40), rng.integers(0, h - 40)
+        dx, dy = rng.integers(20, w // 2), rng.integers(20, h // 2)
+        draw.ellipse([x, y, x + dx, y + dy], fill=tuple(int(c) for c in rng.integers(0, 255, 3)))
+    pixels = np.asarray(img, dtype=np.int16) + rng.integers(-6, 7, (h, w, 3), dtype=np.int16)
+    return Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8))
+
+
+def make_images(folder, count, seed=0):
+    # folder에 count장의 JPEG를 만들고 경로 목록 반환 (이미 있으면 재사용)
+    os.makedirs(folder, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    paths = []
+    for i in range(count):
+        path = os.path.join(folder, f'img_{i:05d}.jpg')
+        if not os.path.exists(path):
+            garment_image(rng).save(path, quality=JPEG_QUALITY)
+        paths.append(path)
+    return paths
+
+
+def _link(source, target):
+    if os.path.exists(target):
+        return
+    try:
+        os.link(source, target)
+    except OSError:
+        os.symlink(source, target)
+
+
+def synthetic_items(n, pool, folder, seed=0):
+    # [(경로, 태그, 내용 해시)] n개. 카테고리/하위 항목은 고르게, 경로는 풀 이미지의 하드 링크
+    os.makedirs(folder, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    labels = [(cat, sub) for cat, subs in CATEGORIES.items() for sub in subs]
+    choice = rng.integers(0, len(labels), n)
+    items = []
+    for i in range(n):
+        cat, sub = labels[choice[i]]
+        path = os.path.join(folder, f'item_{i:06d}.jpg')
+        _link(pool[i % len(pool)], path)
+        items.append((path, {cat: sub}, rng.bytes(16).hex()))
+    return items
+
+
+def synthetic_colors(n, seed=0):
+    # (n, NUM_COLORS, 3) Lab 대표색, (n, NUM_COLORS) 비중
+    rng = np.random.default_rng(seed)
+    labs = np.stack([rng.uniform(10, 95, (n, NUM_COLORS)), rng.uniform(-60, 60, (n, NUM_COLORS)),
+                     rng.uniform(-60, 60, (n, NUM_COLORS))], axis=2).astype(np.float32)
+    weights = rng.dirichlet(np.ones(NUM_COLORS), n).astype(np.float32)
+    weights = -np.sort(-weights, axis=1)
+    return labs, weights
+
+
+def synthetic_embeddings(n, seed=0):
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((n, EMBEDDING_DIM)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors.astype(np.float16)
+
+
+def build_closet(home, n, pool, seed=0):
+    # home(EDGE_FASHION_HOME)의 옷장 DB와 임베딩 저장소를 n개 항목으로 채움 -> 앱 시작 시 그대로 불러옴
+    items = synthetic_items(n, pool, os.path.join(home, 'closet_images'), seed)
+    labs, weights = synthetic_colors(n, seed)
+    vectors = synthetic_embeddings(n, seed)
+    db = ClosetDB(os.path.join(home, 'closet.db'))
+    db.upsert_items(items)
+    db.set_colors([(path, pack_colors(labs[i], weights[i])) for i, (path, _, _) in enumerate(items)])
+    db.close()
+    os.makedirs(os.path.join(home, 'embeddings'), exist_ok=True)
+    store = EmbeddingStore(os.path.join(home, 'embeddings'))
+    store.add_many([(digest, vectors[i]) for i, (_, _, digest) in enumerate(items)])
+    store.close()
+    return items
@@ -1,9 +1,60 @@
-from PySide6.QtWidgets import QApplication
 import sys
-from src.ui.main_window import MainWindow
+import time
 
-if __name__ == "__main__":
+_START = time.perf_counter()
+
+# --profile-startup 실행 시 시간을 잴 무거운 모듈 (시작 시점에는 import되지 않아야 함)
+HEAVY_MODULES = ['numpy', 'PIL.Image', 'cv2', 'onnx', 'onnxruntime', 'torch', 'torchvision', 'sklearn']
+
+
+def profile_startup():
+    # import/생성/첫 프레임/모델 예열 시점을 프로세스 시작 기준(ms)으로 출력하고 종료
+    marks = []
+
+    def mark(label):
+        marks.append((label, (time.perf_counter() - _START) * 1000.0))
+
+    from PySide6.QtWidgets import QApplication
+    mark('import PySide6')
+    app = QApplication(sys.argv)
+    mark('QApplication 생성')
+    from src.ui.main_window import MainWindow
+    mark('import main_window')
+    window = MainWindow()
+    mark('MainWindow 생성')
+    window.show()
+    window.repaint()
+    mark('첫 프레임')
+    loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+    # 첫 프레임 직후 예약된 작업(옷장 불러오기, 모델 예열 시작)을 처리
+    app.processEvents()
+    if window.warmup_thread is not None:
+        window.warmup_thread.join()
+        mark('모델 예열 완료')
+    previous = 0.0
+    for label, at in marks:
+        print(f"{at:9.1f} ms  (+{at - previous:7.1f})  {label}")
+        previous = at
+    print(f"첫 프레임까지 import된 무거운 모듈: {', '.join(loaded) or '없음'}")
+    window.close()
+    return 0
+
+
+def main():
+    from PySide6.QtWidgets import QApplication
+    from src.ui.main_window import MainWindow
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
-    sys.exit(app.exec())
+    return app.exec()
+
+
+if __name__ == "__main__":
+    if '--benchmark' in sys.argv:
+        # 화면 없이 옷장 규모별 벤치마크 실행 (나머지 인자는 benchmarks.run으로 전달)
+        from benchmarks.run import main as run_benchmarks
+        sys.exit(run_benchmarks([arg for arg in sys.argv[1:] if arg != '--benchmark']))
+    if '--profile-startup' in sys.argv:
+        sys.argv.remove('--profile-startup')
+        sys.exit(profile_startup())
+    sys.exit(main())
@@ -0,0 +1,344 @@
+# 오프라인 모델 내보내기/양자화 도구
+#   python models/export_model.py export                 # torchvision MobileNetV2 -> ONNX -> INT8
+#   python models/export_model.py export --onnx 모델.onnx  # 이미 있는 FP32 ONNX에서 시작
+#   python models/export_model.py bench --fp32 A.onnx --int8 B.onnx
+# 결과물: models/<이름>_v<버전>_fp32.onnx (융합/상수 접기), <이름>_v<버전>_int8.onnx, <이름>_v<버전>.json (매니페스트)
+import argparse
+import glob
+import json
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from src.ai.preprocess import INPUT_SIZE, make_batch  # noqa: E402
+from src.ai.tagger import IMAGENET_TO_TAXONOMY, LABELS, MODELS_DIR, _softmax, _taxonomy_projection  # noqa: E402
+from src.data.categories import CATEGORIES  # noqa: E402
+from src.data.mask_store import default_mask_store  # noqa: E402
+from src.utils.hashing import content_hash, file_sha256  # noqa: E402
+
+DEFAULT_NAME = 'mobilenet_v2'
+CALIBRATION_COUNT = 256     # 보정(calibration)에 쓰는 옷장 이미지 수
+CALIBRATION_BATCH = 8
+BENCH_RUNS = 50             # 지연 시간 측정 반복 수 (batch 1)
+BENCH_BATCH = 32            # 처리량 측정 배치
+IMAGE_EXTS = ('.jpg', '.jpeg', '.png', '.bmp', '.gif', '.webp')
+
+
+def next_version(name, models_dir=MODELS_DIR):
+    versions = [0]
+    for path in glob.glob(os.path.join(models_dir, f'{name}_v*.json')):
+        stem = os.path.basename(path)[len(name) + 2:-len('.json')]
+        if stem.isdigit():
+            versions.append(int(stem))
+    return max(versions) + 1
+
+
+def export_torch(output_path, arch=DEFAULT_NAME):
+    # torchvision 사전학습 모델을 trace해서 ONNX로 (배치 차원은 동적)
+    import torch
+    from torchvision import models
+    model = getattr(models, arch)(weights='DEFAULT').eval()
+    dummy = torch.rand(1, 3, INPUT_SIZE, INPUT_SIZE)
+    with torch.no_grad():
+        traced = torch.jit.trace(model, dummy)
+        torch.onnx.export(traced, dummy, output_path, input_names=['input'], output_names=['logits'],
+                          dynamic_axes={'input': {0: 'batch'}, 'logits': {0: 'batch'}},
+                          opset_version=17, do_constant_folding=True)
+    return output_path
+
+
+def optimize_graph(input_path, output_path):
+    # 모양 추론 + ONNX Runtime 그래프 최적화(Conv/BN/활성화 융합, 상수 접기)를 미리 적용해 저장
+    from onnxruntime.quantization.shape_inference import quant_pre_process
+    quant_pre_process(input_path, output_path, skip_optimization=False)
+    return output_path
+
+
+def closet_image_paths():
+    # 저장된 옷장 이미지 (카테고리별 목록)
+    from src.data.closet_db import ClosetDB
+    db = ClosetDB()
+    try:
+        by_cat = {cat: [p for p in db.paths_for(main_cat=cat) if os.path.exists(p)] for cat in CATEGORIES}
+    finally:
+        db.close()
+    return by_cat
+
+
+def sample_calibration_paths(count, image_dir=None, seed=0):
+    # 카테고리가 고르게 섞이도록 카테고리별로 번갈아 뽑음 (폴더를 주면 폴더 이미지에서 무작위)
+    rng = random.Random(seed)
+    if image_dir:
+        paths = sorted(p for p in glob.glob(os.path.join(image_dir, '**', '*'), recursive=True)
+                       if p.lower().endswith(IMAGE_EXTS))
+        rng.shuffle(paths)
+        return paths[:count]
+    groups = [paths for paths in closet_image_paths().values() if paths]
+    for paths in groups:
+        rng.shuffle(paths)
+    picked = []
+    while len(picked) < count and any(groups):
+        for paths in groups:
+            if paths and len(picked) < count:
+                picked.append(paths.pop())
+    return picked
+
+
+def split_held_out(paths, calib_count, bench_count):
+    # (보정용, 벤치마크용) 겹치지 않게 앞/뒤로 나눔. 보정에 쓴 이미지로 일치율을 재면 INT8 범위가 그 이미지에 맞춰져 있어 높게 나옴
+    # 이미지가 모자라면 요청한 비율대로 나눔. 뽑는 순서가 카테고리를 번갈아 돌므로 양쪽 모두 카테고리가 섞임
+    if len(paths) < calib_count + bench_count:
+        bench_count = len(paths) * bench_count // max(calib_count + bench_count, 1)
+    cut = len(paths) - bench_count
+    return paths[:cut], paths[cut:]
+
+
+def _content_key(path):
+    try:
+        return content_hash(path)
+    except OSError:
+        return None
+
+
+def load_batches(paths, batch_size, input_size=INPUT_SIZE):
+    # 디코딩에 성공한 이미지만 NCHW 배치로. 앱 추론과 같게 옷 영역 밖은 배경색으로 칠함
+    # (내용 해시별 마스크는 앱과 같은 저장소를 써서, 이미 분할한 옷장 이미지는 다시 분할하지 않음)
+    masks = default_mask_store()
+    for start in range(0, len(paths), batch_size):
+        chunk = paths[start:start + batch_size]
+        batch, ok = make_batch(chunk, input_size, keys=[_content_key(p) for p in chunk], masks=masks)
+        if ok.any():
+            yield np.ascontiguousarray(batch[ok])
+
+
+def make_calibration_reader(model_path, paths):
+    from onnxruntime.quantization import CalibrationDataReader
+
+    class ClosetCalibrationReader(CalibrationDataReader):
+        # 옷장 이미지를 실제 전처리 그대로 통과시켜 활성값 범위를 수집
+        def __init__(self):
+            input_name = _input_name(model_path)
+            self._batches = ({input_name: batch} for batch in load_batches(paths, CALIBRATION_BATCH))
+
+        def get_next(self):
+            return next(self._batches, None)
+
+    return ClosetCalibrationReader()
+
+
+def quantize_int8(fp32_path, int8_path, calibration_paths, per_channel=True):
+    # 정적 INT8 (QDQ 형식): 가중치 int8 채널별, 활성값 uint8. ORT CPU가 QLinearConv 등으로 융합해 실행
+    from onnxruntime.quantization import CalibrationMethod, QuantFormat, QuantType, quantize_static
+    quantize_static(fp32_path, int8_path, make_calibration_reader(fp32_path, calibration_paths),
+                    quant_format=QuantFormat.QDQ, per_channel=per_channel,
+                    activation_type=QuantType.QUInt8, weight_type=QuantType.QInt8,
+                    calibrate_method=CalibrationMethod.MinMax)
+    return int8_path
+
+
+def _session(model_path, threads=0):
+    import onnxruntime as ort
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    options.intra_op_num_threads = threads
+    return ort.InferenceSession(model_path, options, providers=['CPUExecutionProvider'])
+
+
+def _input_name(model_path):
+    import onnx
+    model = onnx.load(model_path, load_external_data=False)
+    initializers = {init.name for init in model.graph.initializer}
+    return next(i.name for i in model.graph.input if i.name not in initializers)
+
+
+def describe_model(model_path):
+    # 매니페스트용 입력/출력 모양과 라벨 정보
+    session = _session(model_path)
+    model_input, model_output = session.get_inputs()[0], session.get_outputs()[0]
+    probe = np.zeros((1, 3, INPUT_SIZE, INPUT_SIZE), dtype=np.float32)
+    num_classes = session.run([model_output.name], {model_input.name: probe})[0].reshape(1, -1).shape[1]
+    info = {
+        'input': {'name': model_input.name, 'shape': [d if isinstance(d, int) else 'batch' for d in model_input.shape],
+                  'dtype': 'float32', 'layout': 'NCHW', 'normalization': 'imagenet'},
+        'output': {'name': model_output.name, 'num_classes': num_classes},
+    }
+    if num_classes == len(LABELS):
+        info['labels'] = [f'{cat}/{sub}' for cat, sub in LABELS]
+    else:
+        # ImageNet 분류기: 옷장 분류 체계로 옮기는 클래스만 기록
+        info['labels'] = {str(cls): f'{cat}/{sub}' for cls, (cat, sub) in sorted(IMAGENET_TO_TAXONOMY.items())}
+        info['label_space'] = f'imagenet-{num_classes}'
+    return info
+
+
+def _percentile(values, q):
+    return float(np.percentile(np.asarray(values), q))
+
+
+def benchmark(fp32_path, int8_path, eval_paths, runs=BENCH_RUNS, batch_size=BENCH_BATCH, threads=0):
+    # FP32 vs INT8: batch 1 지연(p50/p95), batch_size 처리량, 같은 이미지에 대한 top-1 일치율
+    batches = list(load_batches(eval_paths, batch_size)) if eval_paths else []
+    if not batches:
+        batches = [np.random.default_rng(0).standard_normal((batch_size, 3, INPUT_SIZE, INPUT_SIZE)).astype(np.float32)]
+    single = batches[0][:1]
+    report = {'images': int(sum(len(b) for b in batches)) if eval_paths else 0}
+    logits = {}
+    for label, path in (('fp32', fp32_path), ('int8', int8_path)):
+        session = _session(path, threads)
+        input_name, output_name = session.get_inputs()[0].name, session.get_outputs()[0].name
+        for _ in range(3):   # 첫 실행의 메모리 할당/커널 선택은 제외
+            session.run([output_name], {input_name: single})
+        latencies = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            session.run([output_name], {input_name: single})
+            latencies.append((time.perf_counter() - start) * 1000.0)
+        start = time.perf_counter()
+        outputs = [session.run([output_name], {input_name: batch})[0].reshape(len(batch), -1) for batch in batches]
+        elapsed = time.perf_counter() - start
+        logits[label] = np.concatenate(outputs)
+        report[label] = {
+            'size_mb': round(os.path.getsize(path) / 1e6, 2),
+            'latency_p50_ms': round(_percentile(latencies, 50), 2),
+            'latency_p95_ms': round(_percentile(latencies, 95), 2),
+            'throughput_ips': round(len(logits[label]) / elapsed, 1),
+        }
+    a, b = logits['fp32'], logits['int8']
+    report['top1_agreement'] = round(float((a.argmax(axis=1) == b.argmax(axis=1)).mean()), 4)
+    # 앱이 실제로 쓰는 옷장 분류 체계 기준 일치율
+    projection = _taxonomy_projection(a.shape[1])
+    report['taxonomy_agreement'] = round(float(((_softmax(a) @ projection).argmax(axis=1)
+                                                == (_softmax(b) @ projection).argmax(axis=1)).mean()), 4)
+    report['speedup_p50'] = round(report['fp32']['latency_p50_ms'] / max(report['int8']['latency_p50_ms'], 1e-6), 2)
+    return report
+
+
+def print_report(report):
+    print(f"{'':6}{'크기(MB)':>10}{'p50(ms)':>10}{'p95(ms)':>10}{'처리량(장/s)':>14}")
+    for label in ('fp32', 'int8'):
+        r = report[label]
+        print(f"{label:6}{r['size_mb']:>10}{r['latency_p50_ms']:>10}{r['latency_p95_ms']:>10}{r['throughput_ips']:>14}")
+    print(f"p50 속도 향상 {report['speedup_p50']}x, top-1 일치율 {report['top1_agreement']:.1%}, "
+          f"분류 체계 일치율 {report['taxonomy_agreement']:.1%} (이미지 {report['images']}장)")
+
+
+def register(manifest, manifest_path, models_dir=MODELS_DIR, priority=0):
+    # models_info.json 맨 앞 우선순위로 등록 -> find_default_model이 이 INT8 모델을 먼저 고름
+    info_path = os.path.join(models_dir, 'models_info.json')
+    info = {'models': []}
+    if os.path.exists(info_path):
+        with open(info_path, encoding='utf-8') as f:
+            info = json.load(f)
+    entry = {
+        'name': f"{manifest['name']}-int8-v{manifest['version']}",
+        'filename': manifest['file'],
+        'source': 'Local INT8',
+        'priority': priority,
+        'manifest': os.path.basename(manifest_path),
+    }
+    info['models'] = [m for m in info.get('models', []) if m.get('filename') != entry['filename']] + [entry]
+    with open(info_path, 'w', encoding='utf-8') as f:
+        json.dump(info, f, ensure_ascii=False, indent=2)
+
+
+def run_export(args):
+    models_dir = args.models_dir
+    version = next_version(args.name, models_dir)
+    stem = os.path.join(models_dir, f'{args.name}_v{version}')
+    fp32_path, int8_path, manifest_path = f'{stem}_fp32.onnx', f'{stem}_int8.onnx', f'{stem}.json'
+    source = args.onnx
+    if source is None:
+        source = export_torch(f'{stem}_raw.onnx', args.name)
+        print(f"ONNX 내보내기: {source}")
+    optimize_graph(source, fp32_path)
+    if args.onnx is None:
+        os.remove(source)
+    print(f"그래프 최적화: {fp32_path}")
+
+    bench_count = 0 if args.skip_bench else args.bench_images
+    calibration, held_out = split_held_out(sample_calibration_paths(args.calib_count + bench_count, args.calib_dir),
+                                           args.calib_count, bench_count)
+    if not calibration:
+        sys.exit("보정용 이미지가 없습니다 (옷장이 비어 있으면 --calib-dir로 폴더를 지정하세요)")
+    start = time.perf_counter()
+    quantize_int8(fp32_path, int8_path, calibration, per_channel=not args.per_tensor)
+    print(f"INT8 양자화: {int8_path} (보정 이미지 {len(calibration)}장, {time.perf_counter() - start:.1f}s)")
+
+    manifest = {
+        'name': args.name,
+        'version': version,
+        'file': os.path.basename(int8_path),
+        'sha256': file_sha256(int8_path),
+        'fp32_file': os.path.basename(fp32_path),
+        'fp32_sha256': file_sha256(fp32_path),
+        'source': os.path.basename(args.onnx) if args.onnx else f'torchvision.{args.name}',
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'quantization': {'format': 'QDQ', 'weights': 'int8', 'activations': 'uint8',
+                         'per_channel': not args.per_tensor, 'calibration': 'minmax',
+                         'calibration_images': len(calibration), 'held_out_images': len(held_out)},
+    }
+    manifest.update(describe_model(int8_path))
+    if not args.skip_bench:
+        report = benchmark(fp32_path, int8_path, held_out, runs=args.runs)
+        print_report(report)
+        manifest['benchmark'] = report
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    print(f"매니페스트: {manifest_path}")
+    if args.register:
+        register(manifest, manifest_path, models_dir)
+        print("models_info.json에 등록했습니다")
+
+
+def run_bench(args):
+    # export와 같은 순서로 뽑고 보정에 쓴 앞쪽 --calib-count장은 건너뜀 (옷장이 그 사이 바뀌지 않았다면 겹치지 않음)
+    _, paths = split_held_out(sample_calibration_paths(args.calib_count + args.images, args.image_dir),
+                              args.calib_count, args.images)
+    report = benchmark(args.fp32, args.int8, paths, runs=args.runs, threads=args.threads)
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="의류 분류 모델 ONNX 내보내기 / INT8 양자화 / 벤치마크")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    export = sub.add_parser('export', help="FP32 ONNX 최적화 + 정적 INT8 양자화 + 매니페스트")
+    export.add_argument('--onnx', help="이미 있는 FP32 ONNX (없으면 torchvision 모델을 trace해서 내보냄)")
+    export.add_argument('--name', default=DEFAULT_NAME, help="결과 파일 이름 (torch 내보내기 시 torchvision 모델 이름)")
+    export.add_argument('--models-dir', default=MODELS_DIR)
+    export.add_argument('--calib-dir', help="보정용 이미지 폴더 (기본: 저장된 옷장 이미지)")
+    export.add_argument('--calib-count', type=int, default=CALIBRATION_COUNT)
+    export.add_argument('--per-tensor', action='store_true', help="채널별 대신 텐서 단위 가중치 양자화")
+    export.add_argument('--bench-images', type=int, default=128, help="일치율 비교에 쓸 이미지 수 (보정 이미지와 겹치지 않음)")
+    export.add_argument('--runs', type=int, default=BENCH_RUNS)
+    export.add_argument('--skip-bench', action='store_true')
+    export.add_argument('--register', action='store_true', help="models_info.json에 최우선 모델로 등록")
+    export.set_defaults(func=run_export)
+
+    bench = sub.add_parser('bench', help="FP32 vs INT8 지연/처리량/top-1 일치율 비교")
+    bench.add_argument('--fp32', required=True)
+    bench.add_argument('--int8', required=True)
+    bench.add_argument('--image-dir', help="비교용 이미지 폴더 (기본: 저장된 옷장 이미지)")
+    bench.add_argument('--images', type=int, default=128)
+    bench.add_argument('--calib-count', type=int, default=CALIBRATION_COUNT, help="export에 쓴 보정 이미지 수 (비교에서 제외)")
+    bench.add_argument('--runs', type=int, default=BENCH_RUNS)
+    bench.add_argument('--threads', type=int, default=0, help="intra-op 스레드 수 (0 = 런타임 기본값)")
+    bench.add_argument('--json', help="결과를 JSON으로 저장할 경로")
+    bench.set_defaults(func=run_bench)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
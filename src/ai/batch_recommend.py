@@ -0,0 +1,220 @@
+import argparse
+import datetime
+import json
+import os
+import sys
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from src.ai.color import hex_to_lab, unpack_colors
+from src.ai.embedding import EMBEDDING_DIM
+from src.ai.recommend import OutfitRecommender, RecommendRequest
+from src.data.ann_index import IVFIndex
+from src.data.categories import SITUATIONS, STYLES, WEATHERS
+from src.data.closet_db import ClosetDB
+from src.data.closet_index import ClosetIndex
+from src.data.color_index import ColorIndex
+from src.data.embedding_store import EmbeddingStore
+from src.utils.paths import app_data_dir
+
+# 화면 없이(PySide6 없이) 옷장 DB를 읽어 여러 날의 코디를 미리 추천하고 JSON Lines로 내보냄
+# 옷장 속성 배열은 공유 메모리에 한 번만 올리고, 날짜별 탐색은 프로세스 풀의 워커가 나눠 맡음
+
+DEFAULT_DAYS = 30
+SHARED_ALIGN = 64             # 공유 메모리 안 배열 시작 위치 정렬 (바이트)
+# 부모가 다음 옷장 DB를 읽는 동안 워커가 이전 옷장을 탐색하도록, 동시에 공유 메모리에 올려 두는 옷장 수
+CLOSETS_IN_FLIGHT = 2
+
+
+def load_recommender(db_path):
+    # 옷장 DB(와 같은 폴더의 embeddings/) -> OutfitRecommender. 앱 시작 때 load_closet과 같은 인덱스를 만듦
+    closet_index, color_index = ClosetIndex(), ColorIndex()
+    db = ClosetDB(db_path)
+    try:
+        for chunk in db.iter_items():
+            for stored in chunk:
+                item = closet_index.add(stored.path, stored.tags, stored.content_hash)
+                if stored.colors:
+                    color_index.add(item.item_id, *unpack_colors(stored.colors))
+    finally:
+        db.close()
+    embedding_index = None
+    directory = os.path.join(os.path.dirname(os.path.abspath(db_path)), 'embeddings')
+    if os.path.exists(os.path.join(directory, f'embeddings_{EMBEDDING_DIM}.keys')):
+        store = EmbeddingStore(directory)
+        keyed = [(item.item_id, store.row_of[item.content_hash]) for item in closet_index.items.values()
+                 if item.content_hash in store.row_of]
+        if keyed:
+            ids, rows = zip(*keyed)
+            embedding_index = IVFIndex(EMBEDDING_DIM)
+            embedding_index.add_many(ids, store.matrix[list(rows)])
+        store.close()
+    return OutfitRecommender(closet_index, color_index, embedding_index)
+
+
+class SharedFeatures:
+    # 옷장 속성 배열을 공유 메모리 블록 하나에 이어 담음 -> 워커는 복사 없이 같은 메모리를 읽음
+    # spec = (블록 이름, [(배열 이름, 시작 바이트, shape, dtype)])는 작업마다 피클로 넘겨도 작음
+    def __init__(self, features):
+        layout, offset = [], 0
+        for name, array in features.items():
+            offset = -(-offset // SHARED_ALIGN) * SHARED_ALIGN
+            layout.append((name, offset, array.shape, array.dtype.str))
+            offset += array.nbytes
+        self.shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        for (name, start, shape, dtype), array in zip(layout, features.values()):
+            np.ndarray(shape, dtype, self.shm.buf, start)[...] = array
+        self.spec = (self.shm.name, layout)
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+
+# 워커 프로세스 상태: 공유 메모리 이름 -> (SharedMemory, 그 위의 추천기). 최근 CLOSETS_IN_FLIGHT개만 유지
+_attached = OrderedDict()
+
+
+def _recommender_for(spec):
+    name, layout = spec
+    entry = _attached.get(name)
+    if entry is None:
+        shm = shared_memory.SharedMemory(name=name)
+        features = {key: np.ndarray(shape, dtype, shm.buf, start) for key, start, shape, dtype in layout}
+        # 결과 항목은 행 번호 그대로 (경로/태그는 부모 프로세스가 붙임)
+        entry = _attached[name] = (shm, OutfitRecommender.from_features(features, range(len(features['slot']))))
+        while len(_attached) > CLOSETS_IN_FLIGHT:
+            old_shm, _ = _attached.popitem(last=False)[1]
+            # 추천기가 들고 있던 배열(공유 메모리를 가리킴)은 위에서 놓였으므로 닫을 수 있음
+            old_shm.close()
+    return entry[1]
+
+
+def recommend_day(task):
+    # (spec, 요청, 건너뛸 순위, 개수) -> [(점수, {슬롯: 행})]
+    # 조건이 같은 날끼리는 순위를 건너뛰어 매일 같은 코디가 나오지 않게 함 (후보가 모자라면 처음부터 다시)
+    spec, request, skip, count = task
+    outfits = _recommender_for(spec).recommend(replace(request, top_n=skip + count))
+    if not outfits:
+        return []
+    picked = [outfits[(skip + i) % len(outfits)] for i in range(min(count, len(outfits)))]
+    return [(outfit.score, {slot: int(row) for slot, row in outfit.items.items()}) for outfit in picked]
+
+
+def read_forecast(path):
+    # JSON Lines, 한 줄 = 하루 {"weather": "비", "temperature": 12, ...}. 줄 순서대로 날짜에 대응
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def day_requests(args):
+    # [(날짜, RecommendRequest, 건너뛸 순위)]. 예보가 있으면 그날의 날씨/기온/상황/스타일을 덮어씀
+    forecast = read_forecast(args.forecast) if args.forecast else []
+    base = RecommendRequest(situation=args.situation, style=args.style, weather=args.weather,
+                            temperature=args.temperature, like_lab=hex_to_lab(args.like),
+                            avoid_lab=hex_to_lab(args.avoid), priority=args.priority)
+    start = datetime.date.fromisoformat(args.start) if args.start else datetime.date.today()
+    seen = {}
+    days = []
+    for day in range(args.days):
+        override = forecast[day] if day < len(forecast) else {}
+        request = replace(base, **{key: override[key] for key in ('situation', 'style', 'weather', 'temperature')
+                                   if key in override})
+        condition = (request.situation, request.style, request.weather, float(request.temperature))
+        repeat = seen.get(condition, 0)
+        seen[condition] = repeat + 1
+        date = override.get('date') or (start + datetime.timedelta(days=day)).isoformat()
+        days.append((date, request, repeat * args.per_day))
+    return days
+
+
+def write_results(out, db_path, recommender, days, futures):
+    # 날짜 순으로 결과를 기다려 바로 흘려보냄 (한 줄 = 코디 하나)
+    written = 0
+    for (date, request, _), future in zip(days, futures):
+        for rank, (score, rows) in enumerate(future.result(), 1):
+            items = {}
+            for slot, row in rows.items():
+                item = recommender.items[row]
+                items[slot] = {'path': item.path, 'tags': item.tags, 'content_hash': item.content_hash}
+            record = {'closet': db_path, 'date': date, 'rank': rank, 'score': round(score, 4),
+                      'situation': request.situation, 'style': request.style,
+                      'weather': request.weather, 'temperature': request.temperature, 'items': items}
+            out.write(json.dumps(record, ensure_ascii=False) + '\n')
+            written += 1
+        out.flush()
+    return written
+
+
+def run(args, out):
+    days = day_requests(args)
+    written = 0
+    in_flight = deque()   # (DB 경로, 추천기, 공유 메모리, 날짜별 future)
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        try:
+            for db_path in args.closet:
+                recommender = load_recommender(db_path)
+                if not len(recommender):
+                    print(f"{db_path}: 옷장이 비어 있음", file=sys.stderr)
+                    continue
+                shared = SharedFeatures(recommender.features())
+                futures = [executor.submit(recommend_day, (shared.spec, request, skip, args.per_day))
+                           for _, request, skip in days]
+                in_flight.append((db_path, recommender, shared, futures))
+                # 다음 옷장을 읽는 동안 워커가 쉬지 않도록, 먼저 제출한 옷장의 결과만 기다려 씀
+                while len(in_flight) >= CLOSETS_IN_FLIGHT:
+                    db_path, recommender, shared, futures = in_flight.popleft()
+                    written += write_results(out, db_path, recommender, days, futures)
+                    shared.close()
+            while in_flight:
+                db_path, recommender, shared, futures = in_flight.popleft()
+                written += write_results(out, db_path, recommender, days, futures)
+                shared.close()
+        finally:
+            # 중간에 실패해도 공유 메모리는 지움 (남은 작업은 취소)
+            for _, _, shared, futures in in_flight:
+                for future in futures:
+                    future.cancel()
+                shared.close()
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m src.ai.recommend',
+                                     description="화면 없이 여러 날의 코디를 미리 추천 (JSON Lines 출력)")
+    parser.add_argument('--closet', nargs='+', default=None,
+                        help="옷장 DB 경로 (여러 개면 차례로 처리, 기본: 앱 데이터 폴더의 closet.db)")
+    parser.add_argument('--days', type=int, default=DEFAULT_DAYS, help="며칠치 코디를 만들지")
+    parser.add_argument('--start', default=None, help="첫날 (YYYY-MM-DD, 기본: 오늘)")
+    parser.add_argument('--per-day', type=int, default=1, help="하루에 몇 벌을 추천할지")
+    parser.add_argument('--situation', choices=SITUATIONS, default='일상')
+    parser.add_argument('--style', choices=STYLES, default='캐주얼')
+    parser.add_argument('--weather', choices=WEATHERS, default='맑음')
+    parser.add_argument('--temperature', type=float, default=20)
+    parser.add_argument('--priority', choices=['color', 'style'], default='color')
+    parser.add_argument('--like', nargs='*', default=[], help="선호 색 (#RRGGBB)")
+    parser.add_argument('--avoid', nargs='*', default=[], help="기피 색 (#RRGGBB)")
+    parser.add_argument('--forecast', default=None,
+                        help="날짜별 조건 JSON Lines (줄마다 weather/temperature/situation/style/date 중 일부)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="워커 프로세스 수")
+    parser.add_argument('--output', default='-', help="결과 JSON Lines 경로 (기본: 표준 출력)")
+    args = parser.parse_args(argv)
+    args.closet = args.closet or [os.path.join(app_data_dir(), 'closet.db')]
+    missing = [path for path in args.closet if not os.path.exists(path)]
+    if missing:
+        # ClosetDB는 없는 경로면 새 DB를 만들므로 미리 막음
+        parser.error(f"옷장 DB가 없습니다: {', '.join(missing)}")
+    if args.days < 1 or args.per_day < 1 or args.workers < 1:
+        parser.error("--days, --per-day, --workers는 1 이상이어야 합니다")
+
+    if args.output == '-':
+        written = run(args, sys.stdout)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as out:
+            written = run(args, out)
+    print(f"코디 {written}개 추천", file=sys.stderr)
+    return 0
@@ -0,0 +1,176 @@
+import numpy as np
+
+from src.utils import perf
+from src.utils.lazy import lazy_import
+
+# 이미지 모듈은 실제로 색을 추출할 때 불러옴 (앱 시작 시간에서 제외)
+Image = lazy_import('PIL.Image')
+ImageOps = lazy_import('PIL.ImageOps')
+cv2 = lazy_import('cv2')   # OpenCV가 없으면 NumPy k-means 사용
+
+ANALYSIS_SIZE = 64       # 색 분석용 축소 크기 (긴 변)
+NUM_COLORS = 3           # 옷 하나당 대표 색 수
+BORDER = 3               # 배경 추정에 쓰는 테두리 두께(px)
+BACKGROUND_DELTA_E = 12  # 테두리 대표색과 이 거리 이내면 배경으로 간주
+NEUTRAL_CHROMA = 15      # 채도가 이보다 낮으면 무채색(검정/흰색/회색/베이지 계열)으로 봄
+
+# 대표 색 이름 (검색/DB 인덱스용) -> sRGB
+NAMED_COLORS = {
+    "검정": (20, 20, 20),
+    "흰색": (245, 245, 245),
+    "회색": (128, 128, 128),
+    "빨강": (200, 30, 40),
+    "주황": (240, 130, 30),
+    "노랑": (245, 215, 50),
+    "초록": (40, 140, 60),
+    "카키": (110, 110, 60),
+    "하늘": (120, 180, 230),
+    "파랑": (30, 80, 190),
+    "남색": (25, 35, 90),
+    "보라": (120, 60, 160),
+    "분홍": (240, 150, 180),
+    "갈색": (110, 70, 40),
+    "베이지": (215, 195, 160),
+}
+
+
+def rgb_to_lab(rgb):
+    # (..., 3) sRGB 0~255 -> CIE Lab (D65), 벡터화
+    c = np.asarray(rgb, dtype=np.float32) / 255.0
+    c = np.where(c > 0.04045, ((c + 0.055) / 1.055) ** 2.4, c / 12.92)
+    m = np.array([[0.4124, 0.3576, 0.1805],
+                  [0.2126, 0.7152, 0.0722],
+                  [0.0193, 0.1192, 0.9505]], dtype=np.float32)
+    xyz = c @ m.T / np.array([0.95047, 1.0, 1.08883], dtype=np.float32)
+    f = np.where(xyz > 0.008856, np.cbrt(xyz), 7.787 * xyz + 16.0 / 116.0)
+    lab = np.empty_like(f)
+    lab[..., 0] = 116.0 * f[..., 1] - 16.0
+    lab[..., 1] = 500.0 * (f[..., 0] - f[..., 1])
+    lab[..., 2] = 200.0 * (f[..., 1] - f[..., 2])
+    return lab
+
+
+def hex_to_lab(hex_colors):
+    # ['#RRGGBB', ...] -> (N, 3) Lab
+    rgb = [[int(h[i:i + 2], 16) for i in (1, 3, 5)] for h in hex_colors]
+    return rgb_to_lab(np.array(rgb, dtype=np.float32).reshape(-1, 3))
+
+
+NAMED_LAB = rgb_to_lab(np.array(list(NAMED_COLORS.values()), dtype=np.float32))
+COLOR_NAMES = list(NAMED_COLORS)
+
+
+def color_harmony(lab_a, lab_b):
+    # (A, 3), (B, 3) Lab -> (A, B) 두 색의 어울림 0~1 (벡터화)
+    # 무채색은 어디에나 무난, 유채색끼리는 유사색 > 보색 > 그 외 순
+    lab_a = np.asarray(lab_a, dtype=np.float32).reshape(-1, 3)
+    lab_b = np.asarray(lab_b, dtype=np.float32).reshape(-1, 3)
+    chroma_a = np.hypot(lab_a[:, 1], lab_a[:, 2])
+    chroma_b = np.hypot(lab_b[:, 1], lab_b[:, 2])
+    hue_a = np.degrees(np.arctan2(lab_a[:, 2], lab_a[:, 1]))
+    hue_b = np.degrees(np.arctan2(lab_b[:, 2], lab_b[:, 1]))
+    # 색상 차이 (0~180도). 궁합 캐시가 (A, 옷장 전체) 단위로 부르므로 임시 배열 없이 제자리 연산
+    dh = np.subtract.outer(hue_a, hue_b)
+    np.abs(dh, out=dh)
+    np.minimum(dh, 360.0 - dh, out=dh)
+    out = np.full(dh.shape, 0.4, dtype=np.float32)
+    out[dh <= 30.0] = 0.9
+    out[dh >= 150.0] = 0.75
+    # 무채색은 행/열 단위로 덮어씀: 한쪽만 무채색이면 0.85,
+    # 무채색끼리는 명도 대비가 있을수록 좋게 (검정+흰색 > 회색+회색)
+    neutral_a = chroma_a < NEUTRAL_CHROMA
+    neutral_b = chroma_b < NEUTRAL_CHROMA
+    out[neutral_a] = 0.85
+    out[:, neutral_b] = 0.85
+    if neutral_a.any() and neutral_b.any():
+        dl = np.abs(np.subtract.outer(lab_a[neutral_a, 0], lab_b[neutral_b, 0]))
+        out[np.ix_(neutral_a, neutral_b)] = 0.65 + 0.25 * np.minimum(dl / 40.0, 1.0)
+    return out
+
+
+def load_small_rgb(path, size=ANALYSIS_SIZE):
+    with Image.open(path) as img:
+        img.draft('RGB', (size, size))
+        img = ImageOps.exif_transpose(img).convert('RGB')
+        img.thumbnail((size, size), Image.BILINEAR)
+        return np.asarray(img, dtype=np.uint8)
+
+
+def foreground_mask(lab):
+    # 테두리 픽셀의 중앙값을 배경색으로 보고, 그와 가까운 픽셀을 제외 (옷걸이/벽/침대 배경 대응)
+    border = np.concatenate([lab[:BORDER].reshape(-1, 3), lab[-BORDER:].reshape(-1, 3),
+                             lab[:, :BORDER].reshape(-1, 3), lab[:, -BORDER:].reshape(-1, 3)])
+    background = np.median(border, axis=0)
+    mask = np.linalg.norm(lab - background, axis=-1) > BACKGROUND_DELTA_E
+    # 전경이 너무 적으면(단색 옷 클로즈업 등) 전체를 사용
+    if mask.mean() < 0.05:
+        mask[:] = True
+    return mask
+
+
+def resize_mask(mask, shape):
+    # 최근접 이웃으로 (H, W) 크기에 맞춤 (같은 이미지를 다른 해상도로 읽었을 때)
+    h, w = mask.shape
+    rows = np.minimum((np.arange(shape[0]) + 0.5) * h / shape[0], h - 1).astype(np.int64)
+    cols = np.minimum((np.arange(shape[1]) + 0.5) * w / shape[1], w - 1).astype(np.int64)
+    return mask[np.ix_(rows, cols)]
+
+
+def _kmeans_numpy(points, k, iterations=10, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = points[rng.choice(len(points), size=k, replace=False)]
+    for _ in range(iterations):
+        labels = ((points[:, None, :] - centers[None]) ** 2).sum(axis=2).argmin(axis=1)
+        for j in range(k):
+            members = points[labels == j]
+            if len(members):
+                centers[j] = members.mean(axis=0)
+    return labels, centers
+
+
+def kmeans(points, k):
+    if cv2:
+        criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 10, 1.0)
+        _, labels, centers = cv2.kmeans(points, k, None, criteria, 1, cv2.KMEANS_PP_CENTERS)
+        return labels.ravel(), centers
+    return _kmeans_numpy(points, k)
+
+
+def dominant_colors(rgb, k=NUM_COLORS, mask=None):
+    # (H, W, 3) uint8 -> (k, 3) Lab 대표색, (k,) 비중 (비중 내림차순)
+    lab = rgb_to_lab(rgb)
+    if mask is None:
+        mask = foreground_mask(lab)
+    points = np.ascontiguousarray(lab[mask].reshape(-1, 3), dtype=np.float32)
+    k = min(k, len(points))
+    labels, centers = kmeans(points, k)
+    weights = np.bincount(labels, minlength=k).astype(np.float32) / len(labels)
+    order = np.argsort(-weights)
+    colors = np.zeros((NUM_COLORS, 3), dtype=np.float32)
+    out_weights = np.zeros(NUM_COLORS, dtype=np.float32)
+    colors[:k] = centers[order]
+    out_weights[:k] = weights[order]
+    return colors, out_weights
+
+
+@perf.traced('color.extract_colors', 'decode')
+def extract_colors(path, k=NUM_COLORS, mask=None):
+    # 파일 경로 -> (Lab 대표색, 비중). 디코딩 실패 시 None
+    # mask: 옷 영역 (segment.garment_mask, 해상도가 달라도 됨). 없으면 테두리 배경색 기준으로 추정
+    try:
+        rgb = load_small_rgb(path)
+    except (OSError, ValueError):
+        return None
+    if mask is not None and mask.shape != rgb.shape[:2]:
+        mask = resize_mask(mask, rgb.shape[:2])
+    return dominant_colors(rgb, k, mask)
+
+
+def pack_colors(colors, weights):
+    # DB 저장용 bytes: (NUM_COLORS, 4) float32 [L, a, b, w]
+    return np.hstack([colors, weights[:, None]]).astype(np.float32).tobytes()
+
+
+def unpack_colors(blob):
+    arr = np.frombuffer(blob, dtype=np.float32).reshape(-1, 4)
+    return arr[:, :3], arr[:, 3]
@@ -0,0 +1,494 @@
+import os
+import shutil
+import threading
+
+import numpy as np
+
+from src.ai.color import color_harmony
+from src.data.categories import STYLES, SUB_ITEM_STYLE
+from src.data.suitability import NEUTRAL_SUB, SUB_INDEX, SUB_ITEMS
+from src.utils import perf
+from src.utils.paths import app_data_dir
+
+# 코디 슬롯 순서 = OutfitResultWidget.show_outfit_result 인자 순서
+SLOTS = ['상의', '하의', '아우터', '신발', '액세서리']
+SLOT_INDEX = {slot: i for i, slot in enumerate(SLOTS)}
+
+UNKNOWN_COLOR_HARMONY = 0.6   # 색 분석이 안 된 옷과의 색 궁합
+EMBEDDING_WEIGHT = 0.2        # 두 옷 모두 임베딩이 있을 때 궁합에서 외형 유사도의 비중
+
+INITIAL_ROWS = 256            # 슬롯별 행 용량 (두 배씩 증가)
+PAIRS_PER_STEP = 120000       # index_pending 한 번에 계산하는 (옷, 상대 옷) 쌍 수 (약 10ms)
+RESOLVE_BATCH = 2000          # index_pending 한 번에 특징을 다시 확인하는 옷 수
+CACHE_VERSION = 2
+COLOR, VISUAL = range(2)      # 저장 성분 채널
+
+# 하위 항목 스타일 성향을 배열로 (마지막 행 = 표에 없는 항목용 중립값, 행 번호는 src.data.suitability와 같음)
+STYLE_VECTORS = np.array([SUB_ITEM_STYLE.get(sub, [0.5] * len(STYLES)) for sub in SUB_ITEMS]
+                         + [[0.5] * len(STYLES)], dtype=np.float32)
+STYLE_VECTORS /= np.linalg.norm(STYLE_VECTORS, axis=1, keepdims=True)
+# 하위 항목끼리의 스타일 일관성 (코사인 유사도) - 미리 계산해 두고 인덱싱만
+STYLE_SIMILARITY = STYLE_VECTORS @ STYLE_VECTORS.T
+
+
+def pair_components(lab_a, color_a, emb_a, lab_b, color_b, emb_b):
+    # (A, B, 2) 우선순위와 무관한 궁합 성분
+    #   COLOR: 대표색 어울림 (한쪽이라도 색 정보가 없으면 UNKNOWN_COLOR_HARMONY)
+    #   VISUAL: 외형 유사도 0~1 (한쪽이라도 임베딩이 없으면 NaN). emb_*는 없는 행이 NaN인 단위 벡터 또는 None
+    out = np.empty((len(lab_a), len(lab_b), 2), dtype=np.float32)
+    color = color_harmony(lab_a, lab_b)
+    color[~color_a[:, None] | ~color_b[None, :]] = UNKNOWN_COLOR_HARMONY
+    out[..., COLOR] = color
+    if emb_a is None or emb_b is None:
+        out[..., VISUAL] = np.nan
+    else:
+        out[..., VISUAL] = 0.5 + 0.5 * (emb_a @ emb_b.T)
+    return out
+
+
+def pair_score(components, style, color_w, style_w):
+    # 궁합 = 색 어울림 + 스타일 일관성, 외형 유사도가 있으면 일부 반영
+    pair = color_w * components[..., COLOR] + style_w * style
+    visual = components[..., VISUAL]
+    return np.where(np.isnan(visual), pair, (1.0 - EMBEDDING_WEIGHT) * pair + EMBEDDING_WEIGHT * visual)
+
+
+def _open_map(path, dtype, shape):
+    # 파일을 shape 크기 이상으로 늘리고(줄이지는 않음) memmap으로 엶
+    size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+    with open(path, 'a+b') as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() < size:
+            f.truncate(size)
+    return np.memmap(path, dtype=dtype, mode='r+', shape=shape)
+
+
+def _gather(values, rows, cols):
+    # values[rows][:, cols] -> (A, B, 2) float32. 한 칸의 두 성분(float16 2개)을 uint32 하나로 보고 모아 읽음
+    # (채널 축째로 팬시 인덱싱하면 칸마다 부분 배열을 복사해 몇 배 느림)
+    packed = values.view(np.ndarray).view(np.uint32)[..., 0]
+    return packed[rows[:, None], cols].view(np.float16).reshape(len(rows), len(cols), 2).astype(np.float32)
+
+
+def _remove_other_modes(directory, mode):
+    # 다른 모드(dense/ 또는 top<k>/)로 쓰던 캐시 폴더는 읽지 않으므로 지움 (옷장 크기가 기준을 넘나든 경우)
+    if not os.path.isdir(directory):
+        return
+    for name in os.listdir(directory):
+        if name != mode and (name == 'dense' or (name.startswith('top') and name[3:].isdigit())):
+            shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+
+
+class _SlotRows:
+    # 슬롯 하나의 행 -> 키/특징. 행 번호가 곧 값 행렬의 행(또는 열) 번호
+    def __init__(self, capacity):
+        self.keys = []                                           # 행 -> 키 ('' = 빈 행)
+        self.item_ids = np.full(capacity, -1, dtype=np.int64)    # 이번 실행의 item_id (-1 = 아직 못 봄)
+        self.labs = np.zeros((capacity, 3), dtype=np.float32)    # 대표색(첫 번째) Lab
+        self.has_color = np.zeros(capacity, dtype=bool)
+        self.has_emb = np.zeros(capacity, dtype=bool)
+        self.subs = np.full(capacity, NEUTRAL_SUB, dtype=np.int16)
+        self.clean = np.zeros(capacity, dtype=bool)              # 다른 슬롯의 clean 행과 값이 계산되어 있음
+        self.used = np.zeros(capacity, dtype=np.int64)           # 마지막으로 추천 후보로 조회된 시각 (top-k 모드)
+        self.gen = np.zeros(capacity, dtype=np.int64)            # 행을 비울 때마다 증가 (item_id -> 행 표의 지난 항목 구분)
+        self.free = []                                           # 다시 쓸 수 있는 행
+        self.released = []                                       # 비웠지만 저장 전이라 아직 다시 쓰지 않는 행
+        self.dirty = set()                                       # 값을 계산해야 하는 행
+        self.version = 0                                         # 행/특징이 바뀔 때마다 증가 (특징 캐시 무효화)
+
+    @property
+    def capacity(self):
+        return len(self.item_ids)
+
+    def grow(self, capacity):
+        for name, fill in (('item_ids', -1), ('labs', 0), ('has_color', False), ('has_emb', False),
+                           ('subs', NEUTRAL_SUB), ('clean', False), ('used', 0), ('gen', 0)):
+            old = getattr(self, name)
+            new = np.full((capacity,) + old.shape[1:], fill, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+
+class CompatibilityCache:
+    # 슬롯(상의/하의/...) 쌍마다 옷끼리의 궁합 성분(색 어울림, 외형 유사도)을 float16으로 보관
+    # 옷이 추가되거나 색/임베딩이 바뀌면 그 옷의 행(상대 슬롯 옷 전체와의 값)만 유휴 시간에 블록 단위로 계산
+    # 값은 슬롯 쌍마다 행렬 (위쪽 슬롯 = 행, 아래쪽 슬롯 = 열)
+    # top_k=None: 모든 옷에 행을 줌 (메모리가 옷 수의 제곱)
+    # top_k=k:    슬롯마다 최근 추천 후보로 뽑힌 옷 k개에만 행을 줌 -> 옷마다 상대 슬롯별 k개와의 값만 보관
+    #             (메모리 = 슬롯 쌍 수 × k²). 추천기의 슬롯별 후보(단독 점수 상위)가 조회에서 빠지면 유휴 시간에 행을 주고,
+    #             자리가 모자라면 가장 오래 조회되지 않은 행을 내보냄
+    # 디스크: <dir>/<모드>/ 아래 값 memmap 파일과 meta.npz(행 -> 키/특징). 키 = 내용 해시(없으면 경로)
+    # 조회(lookup)는 추천 작업 스레드에서, 갱신은 GUI 스레드에서 하므로 값/행 변경은 잠금 안에서
+    def __init__(self, closet_index, color_index, embedding_index=None, directory=None, top_k=None):
+        self.closet_index = closet_index
+        self.color_index = color_index
+        self.embedding_index = embedding_index
+        self.top_k = top_k
+        base = directory or app_data_dir('compatibility')
+        mode = 'dense' if top_k is None else f'top{top_k}'
+        _remove_other_modes(base, mode)
+        self.directory = os.path.join(base, mode)
+        os.makedirs(self.directory, exist_ok=True)
+        self.meta_path = os.path.join(self.directory, 'meta.npz')
+        self._lock = threading.Lock()
+        self._where = {}            # 키 -> (슬롯, 행)
+        self._key_of = {}           # item_id -> 키
+        # item_id -> (슬롯, 행, 행 세대). 조회 때 후보 수십 개의 행을 키 사전 대신 배열 인덱싱으로 찾음
+        self._item_slot = np.full(INITIAL_ROWS, -1, dtype=np.int8)
+        self._item_row = np.zeros(INITIAL_ROWS, dtype=np.int64)
+        self._item_gen = np.zeros(INITIAL_ROWS, dtype=np.int64)
+        self._wanted = [set() for _ in SLOTS]   # top-k 모드: 조회했지만 행이 없던 item_id (슬롯별)
+        self._clock = 0             # 조회 횟수 (행마다 마지막 조회 시각으로 남김)
+        self._touched = set()       # 특징을 다시 확인할 item_id
+        self._prune = False         # 이번 실행에서 보지 못한 행을 비울지 (옷장을 다 불러온 뒤)
+        self._unsaved = False
+        self._features = {}         # 슬롯 -> (version, clean 행, 특징) 상대 슬롯 특징 캐시
+        if not self._load():
+            self._reset()
+
+    # === 저장소 ===
+    def _reset(self):
+        capacity = INITIAL_ROWS if self.top_k is None else min(INITIAL_ROWS, self.top_k)
+        self.rows = [_SlotRows(capacity) for _ in SLOTS]
+        self._where.clear()
+        self._open_values()
+
+    def _open_values(self):
+        self._matrix = {(a, b): _open_map(os.path.join(self.directory, f'{a}_{b}.f16'), np.float16,
+                                          (self.rows[a].capacity, self.rows[b].capacity, 2))
+                        for a in range(len(SLOTS)) for b in range(a + 1, len(SLOTS))}
+
+    def _load(self):
+        if not os.path.exists(self.meta_path):
+            return False
+        try:
+            with np.load(self.meta_path) as meta:
+                if int(meta['version']) != CACHE_VERSION:
+                    return False
+                self.rows = []
+                for s in range(len(SLOTS)):
+                    keys = meta[f'keys_{s}'].tolist()
+                    rows = _SlotRows(int(meta[f'capacity_{s}']))
+                    rows.keys = keys
+                    n = len(keys)
+                    rows.labs[:n] = meta[f'labs_{s}']
+                    rows.has_color[:n] = meta[f'has_color_{s}']
+                    rows.has_emb[:n] = meta[f'has_emb_{s}']
+                    rows.subs[:n] = meta[f'subs_{s}']
+                    rows.clean[:n] = meta[f'clean_{s}']
+                    rows.used[:n] = meta[f'used_{s}']
+                    rows.free = [row for row, key in enumerate(keys) if not key]
+                    rows.dirty = {row for row, key in enumerate(keys) if key and not rows.clean[row]}
+                    self.rows.append(rows)
+                    self._where.update((key, (s, row)) for row, key in enumerate(keys) if key)
+                self._clock = max(int(rows.used.max()) for rows in self.rows)
+        except (OSError, KeyError, ValueError):
+            self._where.clear()
+            return False
+        self._open_values()
+        return True
+
+    def save(self):
+        # 값은 memmap을 flush, 행 정보는 meta.npz를 새로 써서 교체. 비운 행은 저장된 뒤부터 다시 씀
+        with self._lock:
+            arrays = {'version': np.array(CACHE_VERSION)}
+            for s, rows in enumerate(self.rows):
+                n = len(rows.keys)
+                arrays.update({
+                    f'capacity_{s}': np.array(rows.capacity), f'keys_{s}': np.array(rows.keys, dtype=str),
+                    f'labs_{s}': rows.labs[:n], f'has_color_{s}': rows.has_color[:n],
+                    f'has_emb_{s}': rows.has_emb[:n], f'subs_{s}': rows.subs[:n], f'clean_{s}': rows.clean[:n],
+                    f'used_{s}': rows.used[:n],
+                })
+            for values in self._matrix.values():
+                values.flush()
+            tmp = self.meta_path + '.tmp'
+            with open(tmp, 'wb') as f:
+                np.savez(f, **arrays)
+            os.replace(tmp, self.meta_path)
+            for rows in self.rows:
+                rows.free.extend(rows.released)
+                rows.released.clear()
+            self._unsaved = False
+
+    def close(self):
+        if self._unsaved:
+            self.save()
+        for values in self._matrix.values():
+            values.flush()
+
+    def _grow(self, slot):
+        # 행 용량을 두 배로: 행 방향으로만 늘어나는 파일은 그대로 늘리고, 열이 늘어나는 행렬은 새 파일로 옮김
+        rows = self.rows[slot]
+        capacity = rows.capacity * 2 if self.top_k is None else min(rows.capacity * 2, self.top_k)
+        rows.grow(capacity)
+        for (a, b), old in list(self._matrix.items()):
+            if slot not in (a, b):
+                continue
+            path = os.path.join(self.directory, f'{a}_{b}.f16')
+            shape = (self.rows[a].capacity, self.rows[b].capacity, 2)
+            old.flush()
+            if slot == a:
+                self._matrix[a, b] = _open_map(path, np.float16, shape)
+                continue
+            tmp = path + '.tmp'
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            new = _open_map(tmp, np.float16, shape)
+            new[:old.shape[0], :old.shape[1]] = old
+            new.flush()
+            del new
+            self._matrix[a, b] = None
+            del old
+            os.replace(tmp, path)
+            self._matrix[a, b] = _open_map(path, np.float16, shape)
+
+    # === 행 관리 ===
+    def _assign(self, slot, key):
+        rows = self.rows[slot]
+        if rows.free:
+            row = rows.free.pop()
+            rows.keys[row] = key
+        else:
+            row = len(rows.keys)
+            if row == rows.capacity:
+                self._grow(slot)
+            rows.keys.append(key)
+        self._where[key] = (slot, row)
+        self._invalidate(slot, row)
+        return row
+
+    def _release(self, key):
+        slot, row = self._where.pop(key)
+        rows = self.rows[slot]
+        rows.clean[row] = False
+        rows.keys[row] = ''
+        rows.item_ids[row] = -1
+        rows.used[row] = 0
+        rows.gen[row] += 1
+        rows.dirty.discard(row)
+        rows.released.append(row)
+        rows.version += 1
+        self._unsaved = True
+
+    def _invalidate(self, slot, row):
+        # 행 값을 다시 계산하도록 표시
+        rows = self.rows[slot]
+        rows.clean[row] = False
+        rows.dirty.add(row)
+        rows.version += 1
+        self._unsaved = True
+
+    # === 갱신 ===
+    def touch(self, item_ids):
+        # 옷이 추가되었거나 색/임베딩/해시가 바뀜 -> 유휴 시간에 특징을 확인해 바뀐 행만 다시 계산
+        self._touched.update(item_ids)
+
+    def remove(self, item_id):
+        # 행은 비워 두고, 저장한 뒤부터 새 옷에 다시 씀
+        self._touched.discard(item_id)
+        key = self._key_of.pop(item_id, None)
+        self._map_item(item_id)
+        where = self._where.get(key)
+        if where is not None and self.rows[where[0]].item_ids[where[1]] == item_id:
+            with self._lock:
+                self._release(key)
+
+    def prune_unseen(self):
+        # 옷장을 다 불러온 뒤 호출: 디스크에만 있고 이번 실행에서 보지 못한 행(삭제된 옷)을 비움
+        self._prune = True
+
+    @property
+    def has_pending(self):
+        return (bool(self._touched) or self._prune or any(self._wanted)
+                or any(rows.dirty for rows in self.rows))
+
+    @perf.traced('CompatibilityCache.index_pending', 'scoring')
+    def index_pending(self):
+        # 유휴 시간에 조금씩: 특징 확인 -> (불러오기 뒤) 안 보인 행 정리 -> (top-k) 후보에 행 주기 -> 바뀐 행 계산
+        # 다 끝나면 저장
+        if self._touched:
+            batch = [self._touched.pop() for _ in range(min(RESOLVE_BATCH, len(self._touched)))]
+            with self._lock:
+                for item_id in batch:
+                    self._resolve(item_id)
+        elif self._prune:
+            with self._lock:
+                for key in [key for key, (slot, row) in self._where.items() if self.rows[slot].item_ids[row] < 0]:
+                    self._release(key)
+            self._prune = False
+        elif any(self._wanted):
+            self._promote()
+        elif any(rows.dirty for rows in self.rows):
+            self._compute_step()
+        if not self.has_pending and self._unsaved:
+            self.save()
+        return self.has_pending
+
+    def _promote(self):
+        # top-k 모드: 추천 후보로 조회됐지만 행이 없던 옷에 행을 줌. 자리가 모자라면 가장 오래 조회되지 않은 행을 내보냄
+        # 내보낸 행은 저장한 뒤에야 다시 쓸 수 있으므로 (디스크의 meta.npz가 아직 그 행을 가리킴) 한 번 저장하고 채움
+        with self._lock:
+            wanted, self._wanted = self._wanted, [set() for _ in SLOTS]
+            batches = []
+            for slot, ids in enumerate(wanted):
+                rows = self.rows[slot]
+                ids = list(ids)[:self.top_k]
+                short = len(ids) - len(rows.free) - len(rows.released) - (self.top_k - len(rows.keys))
+                if short > 0:
+                    taken = np.flatnonzero([bool(key) for key in rows.keys])
+                    for row in taken[np.argsort(rows.used[taken], kind='stable')[:short]]:
+                        self._release(rows.keys[row])
+                batches.append(ids)
+        if any(rows.released for rows in self.rows):
+            self.save()
+        with self._lock:
+            for ids in batches:
+                for item_id in ids:
+                    self._resolve(item_id, promote=True)
+
+    def _resolve(self, item_id, promote=False):
+        item = self.closet_index.get(item_id)
+        if item is None:
+            return
+        key = item.content_hash or item.path
+        old = self._key_of.get(item_id)
+        if old is not None and old != key and old in self._where:
+            self._release(old)
+        slot = SLOT_INDEX.get(item.main_cat)
+        where = self._where.get(key)
+        if where is not None and where[0] != slot:
+            self._release(key)
+            where = None
+        if slot is None:
+            self._key_of.pop(item_id, None)
+            self._map_item(item_id)
+            return
+        self._key_of[item_id] = key
+        rows = self.rows[slot]
+        # top-k 모드에서는 추천 후보로 조회된 옷(_promote)에만, 자리가 있을 때 행을 줌
+        if where is None and self.top_k is not None and not (promote and (rows.free or len(rows.keys) < self.top_k)):
+            self._map_item(item_id)
+            return
+        colors = self.color_index.colors_of(item_id)
+        lab = colors[0][0] if colors is not None else np.zeros(3, dtype=np.float32)
+        has_emb = self.embedding_index is not None and item_id in self.embedding_index
+        sub = SUB_INDEX.get(item.sub_item, NEUTRAL_SUB)
+        if where is None:
+            row = self._assign(slot, key)
+            rows.used[row] = self._clock
+        else:
+            row = where[1]
+            same = (rows.has_color[row] == (colors is not None) and rows.has_emb[row] == has_emb
+                    and rows.subs[row] == sub and np.array_equal(rows.labs[row], lab))
+            if not same:
+                self._invalidate(slot, row)
+        rows.item_ids[row] = item_id
+        self._map_item(item_id, slot, row)
+        rows.labs[row] = lab
+        rows.has_color[row] = colors is not None
+        rows.has_emb[row] = has_emb
+        rows.subs[row] = sub
+
+    def _map_item(self, item_id, slot=-1, row=0):
+        # item_id -> 행 표 갱신 (slot=-1이면 행 없음)
+        if item_id >= len(self._item_slot):
+            if slot < 0:
+                return
+            size = max(item_id + 1, 2 * len(self._item_slot))
+            for name, fill in (('_item_slot', -1), ('_item_row', 0), ('_item_gen', 0)):
+                old = getattr(self, name)
+                new = np.full(size, fill, dtype=old.dtype)
+                new[:len(old)] = old
+                setattr(self, name, new)
+        self._item_slot[item_id] = slot
+        if slot >= 0:
+            self._item_row[item_id] = row
+            self._item_gen[item_id] = self.rows[slot].gen[row]
+
+    def _slot_features(self, slot, rows_idx):
+        # (Lab, 색 있음, 임베딩(없으면 NaN 행) 또는 None, 하위 항목) - 임베딩은 유사도 색인에서 item_id로 가져옴
+        rows = self.rows[slot]
+        emb = None
+        if self.embedding_index is not None and rows.has_emb[rows_idx].any():
+            index = self.embedding_index
+            source = np.array([index.row_of.get(int(i), -1) for i in rows.item_ids[rows_idx]], dtype=np.int64)
+            emb = np.full((len(rows_idx), index.dim), np.nan, dtype=np.float32)
+            emb[source >= 0] = index.vectors[source[source >= 0]]
+        return rows.labs[rows_idx], rows.has_color[rows_idx], emb, rows.subs[rows_idx]
+
+    def _partners(self, slot):
+        # 상대 슬롯의 clean 행과 특징 (그 슬롯이 바뀌기 전까지 재사용)
+        rows = self.rows[slot]
+        cached = self._features.get(slot)
+        if cached is None or cached[0] != rows.version:
+            clean = np.flatnonzero(rows.clean[:len(rows.keys)])
+            cached = self._features[slot] = (rows.version, clean, self._slot_features(slot, clean))
+        return cached[1], cached[2]
+
+    def _compute_step(self):
+        # 바뀐 행이 있는 슬롯 하나에서 PAIRS_PER_STEP 안의 행 몇 개를, 다른 슬롯의 clean 행 전부와 계산
+        # (둘 다 바뀐 쌍은 나중에 계산하는 쪽이 채우므로 한 번만 계산)
+        slot = next(s for s, rows in enumerate(self.rows) if rows.dirty)
+        rows = self.rows[slot]
+        partners = [(other, *self._partners(other)) for other in range(len(SLOTS)) if other != slot]
+        total = sum(len(clean) for _, clean, _ in partners)
+        count = max(1, min(len(rows.dirty), PAIRS_PER_STEP // max(total, 1)))
+        batch = np.array(sorted(rows.dirty)[:count], dtype=np.int64)
+        features = self._slot_features(slot, batch)
+        lab_a, color_a, emb_a, _ = features
+        results = [(other, clean, pair_components(lab_a, color_a, emb_a, lab_b, color_b, emb_b))
+                   for other, clean, (lab_b, color_b, emb_b, _) in partners if len(clean)]
+        with self._lock:
+            for other, clean, values in results:
+                self._store_dense(slot, batch, other, clean, values)
+            rows.clean[batch] = True
+            rows.dirty.difference_update(batch.tolist())
+            rows.version += 1
+            self._unsaved = True
+
+    def _store_dense(self, slot, batch, other, clean, values):
+        if slot < other:
+            self._matrix[slot, other][batch[:, None], clean] = values
+        else:
+            self._matrix[other, slot][clean[:, None], batch] = values.transpose(1, 0, 2)
+
+    # === 조회 ===
+    def _rows_for(self, slot, item_ids):
+        # item_id 배열 -> 행 (없거나 아직 계산 전이면 -1, item_id -1 = '없음' 후보)
+        # 행 세대가 다르면 그 사이 비운 행. top-k 모드면 찾은 행에 조회 시각을 남기고, 행이 없는 옷은 _promote로 넘김
+        rows = self.rows[slot]
+        item_ids = np.asarray(item_ids, dtype=np.int64)
+        known = (item_ids >= 0) & (item_ids < len(self._item_slot))
+        ids = np.where(known, item_ids, 0)
+        out = self._item_row[ids]
+        found = known & (self._item_slot[ids] == slot)
+        found[found] = self._item_gen[ids[found]] == rows.gen[out[found]]
+        if self.top_k is not None:
+            rows.used[out[found]] = self._clock
+            missed = item_ids[(item_ids >= 0) & ~found]
+            if len(missed):
+                self._wanted[slot].update(missed.tolist())
+        found[found] = rows.clean[out[found]]
+        out[~found] = -1
+        return out
+
+    def lookup(self, slot_a, ids_a, slot_b, ids_b):
+        # (A, B, 2) float32 궁합 성분. 캐시에 없는 쌍(새 옷, 아직 계산 전, top-k 밖)은 NaN -> 호출한 쪽에서 계산
+        # ids_*: item_id 배열 (-1 = '없음' 후보)
+        a, b = SLOT_INDEX.get(slot_a), SLOT_INDEX.get(slot_b)
+        if a is None or b is None or a == b:
+            return np.full((len(ids_a), len(ids_b), 2), np.nan, dtype=np.float32)
+        with self._lock:
+            self._clock += 1
+            ra, rb = self._rows_for(a, ids_a), self._rows_for(b, ids_b)
+            # 없는 행은 0행을 읽은 뒤 NaN으로 덮음 (후보 대부분이 캐시에 있으므로 한 번에 모아 읽음)
+            ia, ib = np.maximum(ra, 0), np.maximum(rb, 0)
+            if a < b:
+                out = _gather(self._matrix[a, b], ia, ib)
+            else:
+                out = _gather(self._matrix[b, a], ib, ia).transpose(1, 0, 2)
+        # '없음' 후보(-1) 칸은 호출한 쪽에서 중립값으로 덮으므로 그대로 둠
+        out[(ra < 0) & (np.asarray(ids_a) >= 0)] = np.nan
+        out[:, (rb < 0) & (np.asarray(ids_b) >= 0)] = np.nan
+        return out
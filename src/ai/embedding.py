@@ -0,0 +1,28 @@
+import numpy as np
+
+# 유사 옷 검색용 임베딩 차원: 분류 모델의 끝에서 두 번째 층 특징(MobileNetV2는 1280)을 줄여서 저장
+EMBEDDING_DIM = 128
+
+_projections = {}   # 원래 특징 차원 -> (특징 차원, EMBEDDING_DIM) 투영 행렬
+
+
+def _projection(features_dim, dim):
+    # 고정 시드 가우시안 랜덤 투영: 벡터 사이 코사인 거리를 근사적으로 보존 (모델이 같으면 항상 같은 행렬)
+    key = (features_dim, dim)
+    proj = _projections.get(key)
+    if proj is None:
+        rng = np.random.default_rng(features_dim)
+        proj = _projections[key] = (rng.standard_normal((features_dim, dim)) / np.sqrt(dim)).astype(np.float32)
+    return proj
+
+
+def compact_embeddings(features, dim=EMBEDDING_DIM):
+    # (B, F) 특징 -> (B, dim) float16 단위 벡터 (내적 = 코사인 유사도)
+    features = np.asarray(features, dtype=np.float32).reshape(len(features), -1)
+    if features.shape[1] > dim:
+        features = features @ _projection(features.shape[1], dim)
+    elif features.shape[1] < dim:
+        features = np.pad(features, ((0, 0), (0, dim - features.shape[1])))
+    norms = np.linalg.norm(features, axis=1, keepdims=True)
+    features = features / np.maximum(norms, 1e-12)
+    return features.astype(np.float16)
@@ -0,0 +1,201 @@
+import os
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
+
+from src.ai.preprocess import make_batch
+from src.ai.tagger import GarmentTagger, find_default_model
+from src.data.mask_store import default_mask_store
+from src.data.tensor_cache import default_tensor_cache
+from src.utils import perf
+
+BATCH_WINDOW_MS = 4        # 가장 오래 기다린 요청 기준으로 이 시간 안에 들어온 요청을 한 배치로 묶음
+MAX_BATCH = 32
+LATENCY_SAMPLES = 2048     # p50/p99 계산에 쓰는 최근 요청 수
+CORES_PER_SESSION = 4      # 코어 4개당 세션 1개
+MAX_SESSIONS = 4
+
+
+def pool_layout(cpu_count=None):
+    # (세션 수, 세션당 intra-op 스레드 수): 세션끼리 코어를 겹치지 않게 나눠 씀
+    cores = cpu_count or os.cpu_count() or 1
+    sessions = min(MAX_SESSIONS, max(1, cores // CORES_PER_SESSION))
+    return sessions, max(1, cores // sessions)
+
+
+class _Request:
+    __slots__ = ('path', 'key', 'future', 'submitted')
+
+    def __init__(self, path, key=None):
+        self.path = path
+        self.key = key
+        self.future = Future()
+        self.submitted = time.perf_counter()
+
+
+class InferenceService:
+    # 앱 전체가 공유하는 분류/임베딩 추론 서비스
+    # - 세션 풀: 세션마다 전용 작업 스레드 하나 (세션/입력 버퍼를 잠금 없이 사용)
+    # - 마이크로 배치: 첫 요청 후 window_ms 동안 들어온 요청(다른 호출자 것 포함)을 max_batch까지 묶어 한 번에 추론
+    # - 전처리: 공유 디코딩 스레드 풀이 세션의 미리 할당된 NCHW 버퍼에 바로 기록 (make_batch)
+    # - urgent 요청(대화상자 등)은 일괄 작업보다 먼저 처리
+    # - 내용 해시(keys)를 함께 주면 전처리 결과를 TensorCache에서 읽어 재태깅/재임베딩 때 JPEG를 다시 디코딩하지 않음
+    #   같은 키로 MaskStore의 옷 영역 마스크를 적용 (배경이 태그/임베딩에 섞이지 않게)
+    def __init__(self, model_path=None, sessions=None, intra_op_threads=None, max_batch=MAX_BATCH,
+                 window_ms=BATCH_WINDOW_MS, taggers=None, tensor_cache=None, mask_store=None):
+        if taggers is None:
+            model_path = model_path or find_default_model()
+            default_sessions, default_threads = pool_layout()
+            sessions = sessions or default_sessions
+            threads = intra_op_threads or default_threads
+            # 직렬 실행 그래프라 inter-op 스레드는 1개면 충분
+            taggers = [GarmentTagger(model_path, batch_size=max_batch, intra_op_threads=threads,
+                                     inter_op_threads=1, allow_spinning=sessions == 1)
+                       for _ in range(sessions)]
+        self.taggers = list(taggers)
+        self.max_batch = min([max_batch] + [t.batch_size for t in self.taggers])
+        self.window = window_ms / 1000.0
+        self.embedding_name = self.taggers[0].embedding_name
+        self.tensor_cache = tensor_cache if tensor_cache is not None else default_tensor_cache()
+        self.mask_store = mask_store if mask_store is not None else default_mask_store()
+        self._decoder = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix='inference-decode')
+        self._cond = threading.Condition()
+        self._urgent = deque()
+        self._normal = deque()
+        self._closed = False
+        # 지표
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)   # 요청 제출 -> 결과까지 (ms)
+        self.batch_sizes = Counter()                       # 배치 크기 -> 횟수
+        self.max_queue_depth = 0
+        self.requests = 0
+        self._workers = [threading.Thread(target=self._work, args=(tagger,), name=f'inference-{i}', daemon=True)
+                         for i, tagger in enumerate(self.taggers)]
+        for worker in self._workers:
+            worker.start()
+
+    @property
+    def batch_size(self):
+        # 호출자가 한 번에 넘기면 좋은 개수 (GarmentTagger와 같은 이름)
+        return self.max_batch
+
+    def queue_depth(self):
+        with self._cond:
+            return len(self._urgent) + len(self._normal)
+
+    def submit(self, paths, urgent=False, keys=None):
+        # 경로마다 Future (결과는 TagPrediction, 디코딩 실패면 None). keys: 경로별 내용 해시 (선택)
+        requests = [_Request(path, key) for path, key in zip(paths, keys or [None] * len(paths))]
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("추론 서비스가 종료되었습니다")
+            (self._urgent if urgent else self._normal).extend(requests)
+            self.requests += len(requests)
+            self.max_queue_depth = max(self.max_queue_depth, len(self._urgent) + len(self._normal))
+            self._cond.notify_all()
+        return [r.future for r in requests]
+
+    @perf.traced('InferenceService.predict_paths', 'inference')
+    def predict_paths(self, paths, executor=None, keys=None, urgent=False):
+        # GarmentTagger.predict_paths와 같은 형태 (디코딩은 executor 대신 서비스의 공유 스레드 풀에서)
+        return [future.result() for future in self.submit(list(paths), urgent, keys)]
+
+    def _next_batch(self):
+        # 요청이 올 때까지 기다린 뒤, 배치가 차거나 가장 오래된 요청의 대기 시간이 window를 넘으면 꺼냄
+        with self._cond:
+            while True:
+                while not (self._urgent or self._normal):
+                    if self._closed:
+                        return None
+                    self._cond.wait()
+                oldest = (self._urgent or self._normal)[0].submitted
+                while len(self._urgent) + len(self._normal) < self.max_batch and not self._closed:
+                    remaining = oldest + self.window - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = []
+                for queue in (self._urgent, self._normal):
+                    while queue and len(batch) < self.max_batch:
+                        batch.append(queue.popleft())
+                if batch:   # 기다리는 동안 다른 세션이 모두 가져갔으면 다시 대기
+                    return batch
+
+    def _work(self, tagger):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            try:
+                with perf.span('InferenceService.batch', 'inference', {'size': len(batch)}):
+                    arrays, ok = make_batch([r.path for r in batch], tagger.input_size, out=tagger._buffer,
+                                            executor=self._decoder, keys=[r.key for r in batch],
+                                            cache=self.tensor_cache, masks=self.mask_store)
+                    predictions = tagger.predict_arrays(arrays)
+            except Exception as e:  # 세션 오류는 요청한 쪽에서 받도록 전달하고 다음 배치 계속
+                for r in batch:
+                    r.future.set_exception(e)
+                continue
+            done = time.perf_counter()
+            with self._cond:
+                self.batch_sizes[len(batch)] += 1
+                self._latencies.extend((done - r.submitted) * 1000.0 for r in batch)
+            for r, prediction, good in zip(batch, predictions, ok):
+                r.future.set_result(prediction if good else None)
+
+    def warm_up(self):
+        for tagger in self.taggers:
+            tagger.warm_up()
+
+    def stats(self):
+        # 큐 깊이, 배치 크기 분포, 최근 요청 지연(ms) p50/p99, 전처리 캐시 적중률
+        with self._cond:
+            latencies = np.array(self._latencies) if self._latencies else None
+            return {
+                'sessions': len(self.taggers),
+                'queue_depth': len(self._urgent) + len(self._normal),
+                'max_queue_depth': self.max_queue_depth,
+                'requests': self.requests,
+                'batch_sizes': dict(sorted(self.batch_sizes.items())),
+                'p50_ms': float(np.percentile(latencies, 50)) if latencies is not None else None,
+                'p99_ms': float(np.percentile(latencies, 99)) if latencies is not None else None,
+                'tensor_cache': self.tensor_cache.stats(),
+            }
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._decoder.shutdown(wait=False)
+
+
+_default_service = None
+_default_lock = threading.Lock()
+
+
+def default_service():
+    # 프로세스당 서비스 하나를 만들어 공유. 모델/런타임이 없으면 None
+    global _default_service
+    if _default_service is None:
+        with _default_lock:
+            if _default_service is None:
+                try:
+                    _default_service = InferenceService()
+                except (RuntimeError, FileNotFoundError):
+                    _default_service = False
+    return _default_service or None
+
+
+def loaded_service():
+    # 이미 만든 서비스만 (성능 화면 등 조회용: 모델을 새로 불러오지 않음)
+    return _default_service or None
+
+
+def warm_up():
+    # 앱 시작 직후 백그라운드에서: 서비스(세션 풀) 생성 + 세션마다 한 번 추론
+    service = default_service()
+    if service is not None:
+        service.warm_up()
+    return service
@@ -0,0 +1,105 @@
+import numpy as np
+
+from src.ai.segment import center_crop_mask, garment_mask, mask_background
+from src.utils import perf
+from src.utils.lazy import lazy_import
+
+Image = lazy_import('PIL.Image')        # 실제로 이미지를 읽을 때 불러옴
+ImageOps = lazy_import('PIL.ImageOps')
+
+# ImageNet 학습 분포 기준 정규화 (MobileNetV2 / EfficientNet 공통)
+INPUT_SIZE = 224
+IMAGENET_MEAN = np.array([0.485, 0.456, 0.406], dtype=np.float32)
+IMAGENET_STD = np.array([0.229, 0.224, 0.225], dtype=np.float32)
+
+
+@perf.traced('preprocess.load_rgb', 'decode')
+def load_rgb(path, size=INPUT_SIZE):
+    # 짧은 변을 size*256/224로 맞춘 뒤 가운데 size x size 잘라냄 (torchvision 평가 전처리와 동일)
+    resize_to = size * 256 // 224
+    with Image.open(path) as img:
+        # JPEG는 draft 모드로 필요한 해상도 근처까지만 디코딩
+        img.draft('RGB', (resize_to, resize_to))
+        img = ImageOps.exif_transpose(img).convert('RGB')
+        w, h = img.size
+        scale = resize_to / min(w, h)
+        img = img.resize((max(size, round(w * scale)), max(size, round(h * scale))), Image.BILINEAR)
+        w, h = img.size
+        left, top = (w - size) // 2, (h - size) // 2
+        img = img.crop((left, top, left + size, top + size))
+        return np.asarray(img, dtype=np.uint8)
+
+
+def normalize_into(rgb, out):
+    # HWC uint8 -> CHW float32, 미리 할당된 out(3, H, W)에 바로 기록
+    for c in range(3):
+        np.multiply(rgb[:, :, c], 1.0 / (255.0 * IMAGENET_STD[c]), out=out[c], casting='unsafe')
+        out[c] -= IMAGENET_MEAN[c] / IMAGENET_STD[c]
+    return out
+
+
+@perf.traced('preprocess.make_batch', 'decode')
+def make_batch(paths, size=INPUT_SIZE, out=None, executor=None, keys=None, cache=None, masks=None):
+    # 경로 목록을 NCHW float32 배치로. 디코딩 실패한 항목은 ok=False
+    # executor(ThreadPoolExecutor)를 주면 이미지별 디코딩을 병렬로 (Pillow 디코딩은 GIL 해제)
+    # cache(TensorCache)와 keys(경로별 내용 해시)를 주면 잘라낸 224x224 RGB를 캐시에서 읽고, 없으면 디코딩 후 저장
+    # masks(MaskStore)와 keys를 주면 옷 영역 밖을 배경색으로 칠해서 넣음 (마스크가 없으면 이때 한 번 분할해 저장)
+    if out is None or out.shape[0] < len(paths):
+        out = np.empty((len(paths), 3, size, size), dtype=np.float32)
+    ok = np.ones(len(paths), dtype=bool)
+    if cache is not None and cache.size != size:
+        cache = None
+
+    def fill(i):
+        key = keys[i] if keys is not None else None
+        try:
+            rgb = cache.get(key) if key and cache is not None else None
+            if rgb is None:
+                rgb = load_rgb(paths[i], size)
+                if key and cache is not None:
+                    cache.put(key, rgb)
+            mask = garment_mask(paths[i], key, masks)
+            if mask is not None:
+                rgb = mask_background(rgb, center_crop_mask(mask, size, size * 256 // 224))
+            normalize_into(rgb, out[i])
+        except (OSError, ValueError):
+            out[i] = 0.0
+            ok[i] = False
+
+    if executor is None:
+        for i in range(len(paths)):
+            fill(i)
+    else:
+        list(executor.map(fill, range(len(paths))))
+    return out[:len(paths)], ok
+
+
+PHASH_SIZE = 32   # 32x32 흑백으로 줄인 뒤 DCT
+PHASH_BITS = 8    # 저주파 8x8 계수 -> 64비트
+PHASH_MIN_STD = 4.0   # 밝기 표준편차가 이보다 작은 (거의 단색인) 이미지는 pHash가 잡음뿐이라 계산하지 않음
+
+
+def _dct_matrix(n):
+    # 직교 DCT-II 행렬 (D @ x @ D.T = 2차원 DCT)
+    k = np.arange(n)[:, None]
+    m = np.cos(np.pi * (2 * np.arange(n)[None, :] + 1) * k / (2 * n)) * np.sqrt(2.0 / n)
+    m[0] /= np.sqrt(2.0)
+    return m
+
+
+_DCT = _dct_matrix(PHASH_SIZE)
+
+
+@perf.traced('preprocess.perceptual_hash', 'decode')
+def perceptual_hash(path):
+    # 64비트 pHash: 재압축/크기 변경/약한 보정에도 거의 같은 값 (해밍 거리로 유사 중복 판정). 단색이면 None
+    with Image.open(path) as img:
+        img.draft('L', (PHASH_SIZE * 2, PHASH_SIZE * 2))
+        img = ImageOps.exif_transpose(img).convert('L').resize((PHASH_SIZE, PHASH_SIZE), Image.BILINEAR)
+        pixels = np.asarray(img, dtype=np.float32)
+    if pixels.std() < PHASH_MIN_STD:
+        return None
+    low = (_DCT @ pixels @ _DCT.T)[:PHASH_BITS, :PHASH_BITS].ravel()
+    # 밝기 평균(DC 성분)은 중앙값 계산에서 제외
+    bits = low > np.median(low[1:])
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
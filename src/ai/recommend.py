@@ -0,0 +1,273 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from src.ai.color import NUM_COLORS
+from src.ai.compatibility import (
+    COLOR, SLOTS, STYLE_SIMILARITY, STYLE_VECTORS, pair_components, pair_score
+)
+from src.data.categories import SITUATION_STYLE, STYLES
+from src.data.color_index import avoid_mask, like_scores
+from src.data.suitability import NEUTRAL_SUB, SUB_INDEX, sub_item_suitability
+from src.utils import perf
+
+REQUIRED_SLOTS = {'상의', '하의'}
+OUTER_REQUIRED_BELOW = 12     # 이 기온 미만이면 아우터 필수
+OUTER_EXCLUDED_ABOVE = 25     # 이 기온 초과면 아우터 제외
+
+CANDIDATES_PER_SLOT = 40      # 슬롯마다 단독 점수 상위 몇 벌만 조합에 넣을지
+BEAM_WIDTH = 64               # 빔 탐색에서 슬롯마다 유지할 부분 코디 수
+PROGRESSIVE_WIDTHS = (4, 16, BEAM_WIDTH)   # iter_recommend가 차례로 시도하는 빔 폭
+DEFAULT_TOP_N = 5
+MAX_ITEM_REPEAT = 2           # 결과 N개 안에서 같은 옷이 반복될 수 있는 최대 횟수
+
+NEUTRAL_SCORE = 0.5           # 선택 슬롯을 비울 때(없음)의 단독/궁합 점수
+STYLE_TARGET_WEIGHT = 0.6     # 목표 스타일 = 선택 스타일 0.6 + 상황 0.4
+WARMTH_WEIGHT = 0.5           # 단독 점수에서 기온 적합도의 비중
+
+# 우선순위별 (색, 스타일) 가중치
+PRIORITY_WEIGHTS = {
+    'color': (0.7, 0.3),
+    'style': (0.3, 0.7),
+}
+
+# OutfitRecommender.features()/from_features()로 주고받는 옷장 속성 배열
+FEATURES = ('slot', 'sub_idx', 'labs', 'weights', 'has_color', 'embeddings')
+
+
+@dataclass
+class RecommendRequest:
+    situation: str = '일상'
+    style: str = '캐주얼'
+    weather: str = '맑음'
+    temperature: float = 20
+    like_lab: np.ndarray = field(default_factory=lambda: np.zeros((0, 3), dtype=np.float32))
+    avoid_lab: np.ndarray = field(default_factory=lambda: np.zeros((0, 3), dtype=np.float32))
+    priority: str = 'color'       # 'color' | 'style'
+    top_n: int = DEFAULT_TOP_N
+
+
+@dataclass
+class Outfit:
+    score: float                  # 0~1
+    items: dict                   # 슬롯 -> ClosetItem (비운 슬롯은 없음)
+
+    def path(self, slot):
+        item = self.items.get(slot)
+        return item.path if item is not None else None
+
+    def paths(self):
+        return [self.path(slot) for slot in SLOTS]
+
+
+def target_style(style, situation):
+    target = np.zeros(len(STYLES), dtype=np.float32)
+    if style in STYLES:
+        target[STYLES.index(style)] = STYLE_TARGET_WEIGHT
+    target += (1.0 - STYLE_TARGET_WEIGHT) * np.asarray(SITUATION_STYLE.get(situation, [0.5] * len(STYLES)))
+    return target / (np.linalg.norm(target) or 1.0)
+
+
+class OutfitRecommender:
+    # 옷장 스냅샷(속성 배열) 위에서 슬롯별 후보를 거르고, 궁합 행렬 + 빔 탐색으로 상위 코디를 찾음
+    # 옷장/색/임베딩 인덱스가 바뀌면 새로 만들어야 함. compatibility(CompatibilityCache)가 있으면 궁합 성분을 거기서 읽음
+    def __init__(self, closet_index, color_index, embedding_index=None, compatibility=None):
+        self.items = list(closet_index.items.values())
+        self.compatibility = compatibility
+        self.item_ids = np.array([item.item_id for item in self.items], dtype=np.int64)
+        n = len(self.items)
+        slot_of = {slot: i for i, slot in enumerate(SLOTS)}
+        self.slot = np.array([slot_of.get(item.main_cat, -1) for item in self.items], dtype=np.int64)
+        self.sub_idx = np.array([SUB_INDEX.get(item.sub_item, NEUTRAL_SUB) for item in self.items],
+                                dtype=np.int64)
+        self.labs = np.zeros((n, NUM_COLORS, 3), dtype=np.float32)
+        self.weights = np.zeros((n, NUM_COLORS), dtype=np.float32)
+        rows = np.array([color_index.row_of.get(item.item_id, -1) for item in self.items], dtype=np.int64)
+        self.has_color = rows >= 0
+        self.labs[self.has_color] = color_index.labs[rows[self.has_color]]
+        self.weights[self.has_color] = color_index.weights[rows[self.has_color]]
+        # 임베딩(단위 벡터)은 있는 옷만 (없는 행은 NaN). 없으면 궁합에서 외형 항을 빼고 계산
+        self.embeddings = None
+        if embedding_index is not None and len(embedding_index):
+            rows = np.array([embedding_index.row_of.get(item.item_id, -1) for item in self.items], dtype=np.int64)
+            has_embedding = rows >= 0
+            if has_embedding.any():
+                self.embeddings = np.full((n, embedding_index.dim), np.nan, dtype=np.float32)
+                self.embeddings[has_embedding] = embedding_index.vectors[rows[has_embedding]]
+        self._derive()
+
+    @classmethod
+    def from_features(cls, features, items):
+        # features()로 꺼낸 배열만으로 만든 추천기 (배치 추천 워커가 공유 메모리 배열 위에서 사용)
+        # items: 행 순서의 결과 항목 (Outfit.items 값으로 그대로 들어감). 궁합 캐시 없이 직접 계산
+        self = cls.__new__(cls)
+        self.items = items
+        self.compatibility = None
+        self.item_ids = None
+        for name in FEATURES:
+            setattr(self, name, features.get(name))
+        self._derive()
+        return self
+
+    def _derive(self):
+        self.primary_lab = self.labs[:, 0]
+        self.slot_rows = [np.flatnonzero(self.slot == i) for i in range(len(SLOTS))]
+
+    def features(self):
+        # 탐색에 쓰는 옷장 속성 배열 {이름: ndarray} (임베딩이 없으면 빠짐)
+        return {name: getattr(self, name) for name in FEATURES if getattr(self, name) is not None}
+
+    def __len__(self):
+        return len(self.items)
+
+    def item_scores(self, request):
+        # (단독 점수 0~1, 후보 가능 여부) - 날씨/기온/기피 색으로 여기서 미리 걸러냄
+        color_w, style_w = PRIORITY_WEIGHTS.get(request.priority, PRIORITY_WEIGHTS['color'])
+        style_fit = STYLE_VECTORS[self.sub_idx] @ target_style(request.style, request.situation)
+
+        # 기온/날씨 적합도는 하위 항목 표에서 계산한 뒤 옷마다 인덱싱만
+        sub_warmth, sub_keep = sub_item_suitability(request.temperature, request.weather)
+        warmth = sub_warmth[self.sub_idx]
+        keep = sub_keep[self.sub_idx]
+        if len(request.avoid_lab):
+            keep &= ~avoid_mask(self.labs, self.weights, request.avoid_lab)
+
+        scores = style_w * style_fit + WARMTH_WEIGHT * warmth
+        total_w = style_w + WARMTH_WEIGHT
+        if len(request.like_lab):
+            scores += color_w * like_scores(self.labs, self.weights, request.like_lab)
+            total_w += color_w
+        return scores / total_w, keep
+
+    def components(self, a, b):
+        # (A, B, 2) 궁합 성분 (색 어울림, 외형 유사도) 직접 계산
+        emb_a = self.embeddings[a] if self.embeddings is not None else None
+        emb_b = self.embeddings[b] if self.embeddings is not None else None
+        return pair_components(self.primary_lab[a], self.has_color[a], emb_a,
+                               self.primary_lab[b], self.has_color[b], emb_b)
+
+    def pair_scores(self, rows_a, rows_b, priority, slot_a=None, slot_b=None):
+        # (A, B) 두 슬롯 후보 사이의 궁합 = 색 어울림 + 스타일 일관성 (+ 외형). 행 -1(없음)은 중립값
+        # 궁합 캐시에 있는 쌍은 읽기만 하고, 없는 칸(새 옷)만 계산. '없음' 후보 칸은 아래에서 중립값으로 덮으므로 계산하지 않음
+        color_w, style_w = PRIORITY_WEIGHTS.get(priority, PRIORITY_WEIGHTS['color'])
+        a = np.maximum(rows_a, 0)
+        b = np.maximum(rows_b, 0)
+        if self.compatibility is not None and slot_a is not None:
+            # '없음' 후보(-1)는 조회하지 않음
+            ids_a = np.where(rows_a >= 0, self.item_ids[a], -1)
+            ids_b = np.where(rows_b >= 0, self.item_ids[b], -1)
+            components = self.compatibility.lookup(slot_a, ids_a, slot_b, ids_b)
+            missing = np.isnan(components[..., COLOR])
+            if missing.any():
+                # 빈 칸은 보통 새 옷(top-k 밖 옷)의 행이나 열 전체 -> 빈 행은 행 단위로, 나머지 빈 칸은 그 열만 계산
+                rows = missing.any(axis=1)
+                if rows.any():
+                    components[rows] = self.components(a[rows], b)
+                cols = missing[~rows].any(axis=0)
+                if cols.any():
+                    components[np.ix_(~rows, cols)] = self.components(a[~rows], b[cols])
+        else:
+            components = self.components(a, b)
+        pair = pair_score(components, STYLE_SIMILARITY[self.sub_idx[a]][:, self.sub_idx[b]], color_w, style_w)
+        pair[rows_a < 0, :] = NEUTRAL_SCORE
+        pair[:, rows_b < 0] = NEUTRAL_SCORE
+        return pair
+
+    def candidates(self, request, scores, keep):
+        # [(슬롯, 후보 행 배열, 단독 점수)] - 선택 슬롯은 끝에 '없음'(-1) 후보 추가. 필수 슬롯이 비면 None
+        t = float(request.temperature)
+        slots = []
+        for i, slot in enumerate(SLOTS):
+            if slot == '아우터' and t > OUTER_EXCLUDED_ABOVE:
+                continue
+            rows = self.slot_rows[i]
+            rows = rows[keep[rows]]
+            required = slot in REQUIRED_SLOTS or (slot == '아우터' and t < OUTER_REQUIRED_BELOW and len(rows))
+            if not len(rows):
+                if required:
+                    return None
+                continue
+            if len(rows) > CANDIDATES_PER_SLOT:
+                top = np.argpartition(-scores[rows], CANDIDATES_PER_SLOT - 1)[:CANDIDATES_PER_SLOT]
+                rows = rows[top]
+            unary = scores[rows]
+            if not required:
+                rows = np.append(rows, -1)
+                unary = np.append(unary, NEUTRAL_SCORE)
+            slots.append((slot, rows, unary))
+        return slots
+
+    @perf.traced('OutfitRecommender.prepare', 'scoring')
+    def prepare(self, request):
+        # 조합 탐색 전 단계: (슬롯 후보 목록, 슬롯 쌍 궁합 행렬). 필수 슬롯이 비면 None
+        scores, keep = self.item_scores(request)
+        slots = self.candidates(request, scores, keep)
+        if not slots:
+            return None
+        pairs = {(a, b): self.pair_scores(slots[a][1], slots[b][1], request.priority, slots[a][0], slots[b][0])
+                 for b in range(len(slots)) for a in range(b)}
+        return slots, pairs
+
+    @perf.traced('OutfitRecommender.search', 'scoring')
+    def search(self, slots, pairs, top_n=DEFAULT_TOP_N, beam_width=BEAM_WIDTH, should_stop=None):
+        # 빔 탐색: 슬롯을 하나씩 붙이며 (빔 × 후보) 점수 행렬에서 상위 beam_width개만 유지
+        # should_stop()이 참이 되면 슬롯 사이에서 중단하고 None
+        choices = np.zeros((1, 0), dtype=np.int64)
+        beam = np.zeros(1, dtype=np.float32)
+        for t, (_, rows, unary) in enumerate(slots):
+            if should_stop is not None and should_stop():
+                return None
+            total = beam[:, None] + unary[None, :]
+            for s in range(t):
+                total += pairs[s, t][choices[:, s]]
+            flat = total.ravel()
+            if len(flat) > beam_width:
+                top = np.argpartition(-flat, beam_width - 1)[:beam_width]
+            else:
+                top = np.arange(len(flat))
+            parent, pick = np.divmod(top, len(rows))
+            choices = np.column_stack([choices[parent], pick])
+            beam = flat[top]
+
+        # 항 개수(슬롯 + 쌍)로 나눠 0~1로. 같은 옷이 결과를 독차지하지 않게 반복 횟수 제한
+        terms = len(slots) + len(pairs)
+        outfits, overflow, used = [], [], {}
+        for k in np.argsort(-beam):
+            picked = [(slot, int(rows[c])) for (slot, rows, _), c in zip(slots, choices[k])]
+            picked = [(slot, row) for slot, row in picked if row >= 0]
+            outfit = Outfit(float(beam[k]) / terms, {slot: self.items[row] for slot, row in picked})
+            if all(used.get(row, 0) < MAX_ITEM_REPEAT for _, row in picked):
+                for _, row in picked:
+                    used[row] = used.get(row, 0) + 1
+                outfits.append(outfit)
+                if len(outfits) == top_n:
+                    break
+            else:
+                overflow.append(outfit)
+        return (outfits + overflow)[:top_n]
+
+    def recommend(self, request):
+        prepared = self.prepare(request)
+        if prepared is None:
+            return []
+        return self.search(*prepared, top_n=request.top_n)
+
+    def iter_recommend(self, request, widths=PROGRESSIVE_WIDTHS, should_stop=None):
+        # 빔 폭을 넓혀 가며 반복 탐색: 빠른 대략 결과를 먼저, 더 나은 결과를 이어서 내보냄
+        prepared = self.prepare(request)
+        if prepared is None:
+            yield []
+            return
+        for width in widths:
+            outfits = self.search(*prepared, top_n=request.top_n, beam_width=width, should_stop=should_stop)
+            if outfits is None:
+                return
+            yield outfits
+
+
+if __name__ == '__main__':
+    # 화면 없이 배치 추천: python -m src.ai.recommend --closet closet.db --days 30 ...
+    import sys
+
+    from src.ai.batch_recommend import main
+    sys.exit(main())
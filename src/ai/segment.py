@@ -0,0 +1,94 @@
+import numpy as np
+
+from src.ai.color import foreground_mask, load_small_rgb, rgb_to_lab
+from src.utils import perf
+from src.utils.lazy import lazy_import
+
+cv2 = lazy_import('cv2')   # OpenCV가 없으면 테두리 배경색 기준 마스크(color.foreground_mask)만 사용
+
+MASK_SIZE = 96             # 마스크 해상도 (긴 변). 색 분석/모델 입력/잘라낸 표시 이미지에 맞춰 늘이거나 줄여 씀
+GRABCUT_ITERATIONS = 2
+SEED_BORDER = 2            # GrabCut에서 확실한 배경으로 두는 테두리 두께(px)
+MIN_FOREGROUND = 0.05      # 옷 영역이 이 비율보다 작게 나오면 분할 실패로 보고 전체를 사용
+BACKGROUND_FILL = (124, 116, 104)   # 모델 입력에서 배경을 칠할 색 (ImageNet 평균 = 정규화 후 0)
+
+
+def encode_mask(mask):
+    # (H, W) bool -> run-length bytes: 배경부터 시작해 배경/옷 길이를 번갈아 uint16으로
+    flat = np.asarray(mask, dtype=np.int8).ravel()
+    bounds = np.concatenate([[0], np.flatnonzero(np.diff(flat)) + 1, [flat.size]])
+    runs = np.diff(bounds)
+    if flat.size and flat[0]:
+        runs = np.concatenate([[0], runs])
+    return runs.astype(np.uint16).tobytes()
+
+
+def decode_mask(blob, shape):
+    runs = np.frombuffer(blob, dtype=np.uint16)
+    return np.repeat(np.arange(len(runs)) % 2 == 1, runs).reshape(shape)
+
+
+def center_crop_mask(mask, size, resize_to):
+    # preprocess.load_rgb와 같은 기하: 짧은 변을 resize_to로 맞춘 뒤 가운데 size x size
+    h, w = mask.shape
+    side = min(h, w) * size / resize_to
+    top, left = (h - side) / 2, (w - side) / 2
+    steps = (np.arange(size) + 0.5) * side / size
+    rows = np.clip(top + steps, 0, h - 1).astype(np.int64)
+    cols = np.clip(left + steps, 0, w - 1).astype(np.int64)
+    return mask[np.ix_(rows, cols)]
+
+
+def _grabcut(rgb, seed):
+    # 테두리 배경색 기준 마스크를 '아마 옷/아마 배경' 초기값으로, 테두리는 확실한 배경으로 두고 GrabCut
+    labels = np.where(seed, cv2.GC_PR_FGD, cv2.GC_PR_BGD).astype(np.uint8)
+    labels[:SEED_BORDER] = labels[-SEED_BORDER:] = cv2.GC_BGD
+    labels[:, :SEED_BORDER] = labels[:, -SEED_BORDER:] = cv2.GC_BGD
+    background = np.zeros((1, 65), dtype=np.float64)
+    foreground = np.zeros((1, 65), dtype=np.float64)
+    cv2.setRNGSeed(0)   # GMM 초기화(k-means)를 고정해 같은 사진이면 항상 같은 마스크
+    cv2.grabCut(np.ascontiguousarray(rgb[:, :, ::-1]), labels, None, background, foreground,
+                GRABCUT_ITERATIONS, cv2.GC_INIT_WITH_MASK)
+    return (labels == cv2.GC_FGD) | (labels == cv2.GC_PR_FGD)
+
+
+def segment_rgb(rgb):
+    # (H, W, 3) uint8 -> (H, W) bool 옷 영역
+    seed = foreground_mask(rgb_to_lab(rgb))
+    if seed.all() or min(rgb.shape[:2]) <= 2 * SEED_BORDER or not cv2:
+        # 배경을 못 찾았으면(옷 클로즈업 등) GrabCut도 기준이 없음
+        return seed
+    try:
+        mask = _grabcut(rgb, seed)
+    except cv2.error:
+        return seed
+    return mask if mask.mean() >= MIN_FOREGROUND else np.ones_like(mask)
+
+
+@perf.traced('segment.segment_path', 'decode')
+def segment_path(path, size=MASK_SIZE):
+    # 파일 경로 -> 옷 영역 마스크. 디코딩 실패 시 None
+    try:
+        rgb = load_small_rgb(path, size)
+    except (OSError, ValueError):
+        return None
+    return segment_rgb(rgb)
+
+
+def garment_mask(path, key, store):
+    # 내용 해시별로 한 번만 분할하고 store(MaskStore)에 저장해 둔 마스크를 재사용. 해시가 없으면 None
+    if not key or store is None:
+        return None
+    mask = store.get(key)
+    if mask is None:
+        mask = segment_path(path)
+        if mask is not None:
+            store.put(key, mask)
+    return mask
+
+
+def mask_background(rgb, mask):
+    # 모델 입력 (H, W, 3) uint8에서 옷이 아닌 곳을 BACKGROUND_FILL로 (원본은 바꾸지 않음)
+    out = rgb.copy()
+    out[~mask] = BACKGROUND_FILL
+    return out
@@ -0,0 +1,226 @@
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from src.ai.embedding import compact_embeddings
+from src.ai.preprocess import INPUT_SIZE, make_batch
+from src.data.categories import CATEGORIES
+from src.utils import perf
+from src.utils.hashing import file_sha256
+from src.utils.lazy import lazy_import
+
+# 둘 다 import만 150ms 이상 걸려서 처음 세션을 만들 때 불러옴
+ort = lazy_import('onnxruntime')   # 없으면 자동 태깅 없이 기본값으로 동작
+onnx = lazy_import('onnx')         # 없으면 모델에 임베딩 출력이 따로 있을 때만 임베딩 계산
+
+MODELS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../models'))
+DEFAULT_BATCH_SIZE = 32
+EMBEDDING_OUTPUT = 'embedding'   # 내보낸 모델에 이 이름의 출력이 있으면 그대로 임베딩으로 사용
+
+# 옷장 분류 체계를 평탄화한 라벨 순서: 모델 출력이 이 길이면 그대로 사용
+LABELS = [(cat, sub) for cat, subs in CATEGORIES.items() for sub in subs]
+LABEL_INDEX = {label: i for i, label in enumerate(LABELS)}
+
+# ImageNet-1k 분류기(MobileNetV2 등)를 그대로 쓸 때: ImageNet 클래스 -> (카테고리, 하위 항목)
+IMAGENET_TO_TAXONOMY = {
+    610: ("상의", "티셔츠"),      # jersey, T-shirt
+    841: ("상의", "맨투맨"),      # sweatshirt
+    608: ("하의", "청바지"),      # jean
+    655: ("하의", "치마"),        # miniskirt
+    689: ("하의", "치마"),        # overskirt
+    601: ("하의", "치마"),        # hoopskirt
+    842: ("하의", "반바지"),      # swimming trunks
+    834: ("아우터", "재킷"),      # suit
+    652: ("아우터", "재킷"),      # military uniform
+    869: ("아우터", "코트"),      # trench coat
+    568: ("아우터", "코트"),      # fur coat
+    617: ("아우터", "코트"),      # lab coat
+    735: ("아우터", "코트"),      # poncho
+    501: ("아우터", "코트"),      # cloak
+    474: ("아우터", "가디건"),    # cardigan
+    465: ("아우터", "조끼"),      # bulletproof vest
+    770: ("신발", "운동화"),      # running shoe
+    630: ("신발", "구두"),        # Loafer
+    514: ("신발", "부츠"),        # cowboy boot
+    774: ("신발", "샌들"),        # sandal
+    502: ("신발", "슬리퍼"),      # clog
+    515: ("액세서리", "모자"),    # cowboy hat
+    808: ("액세서리", "모자"),    # sombrero
+    452: ("액세서리", "모자"),    # bonnet
+    414: ("액세서리", "가방"),    # backpack
+    748: ("액세서리", "가방"),    # purse
+    636: ("액세서리", "가방"),    # mailbag
+    464: ("액세서리", "벨트"),    # buckle
+    824: ("액세서리", "목도리"),  # stole
+}
+
+
+@dataclass
+class TagPrediction:
+    main_cat: str
+    sub_item: str
+    confidence: float
+    scores: np.ndarray = field(repr=False, default=None)  # LABELS 순서 확률
+    embedding: np.ndarray = field(repr=False, default=None)  # (EMBEDDING_DIM,) float16 단위 벡터
+
+    @property
+    def tags(self):
+        # ImageTagDialog.ai_tags 형식 {카테고리: 하위항목}
+        return {self.main_cat: self.sub_item}
+
+
+def find_default_model(models_dir=MODELS_DIR):
+    # models_info.json의 우선순위대로 실제로 존재하는 첫 ONNX 모델
+    info_path = os.path.join(models_dir, 'models_info.json')
+    candidates = []
+    if os.path.exists(info_path):
+        with open(info_path, encoding='utf-8') as f:
+            models = json.load(f).get('models', [])
+        candidates = sorted(models, key=lambda m: m.get('priority', 99))
+    for entry in candidates:
+        path = os.path.join(models_dir, entry['filename'])
+        if os.path.exists(path) and _matches_manifest(models_dir, entry, path):
+            return path
+    return None
+
+
+def _matches_manifest(models_dir, entry, path):
+    # export_model.py로 만든 모델은 매니페스트 체크섬이 맞을 때만 사용 (중단/손상된 파일은 건너뜀)
+    if not entry.get('manifest'):
+        return True
+    try:
+        with open(os.path.join(models_dir, entry['manifest']), encoding='utf-8') as f:
+            expected = json.load(f).get('sha256')
+    except (OSError, ValueError):
+        return False
+    return expected is None or file_sha256(path) == expected
+
+
+def _softmax(logits):
+    z = logits - logits.max(axis=1, keepdims=True)
+    np.exp(z, out=z)
+    z /= z.sum(axis=1, keepdims=True)
+    return z
+
+
+def _taxonomy_projection(num_classes):
+    # (num_classes, len(LABELS)) 0/1 행렬: 모델 확률 @ 행렬 = 분류 체계 확률
+    proj = np.zeros((num_classes, len(LABELS)), dtype=np.float32)
+    if num_classes == len(LABELS):
+        np.fill_diagonal(proj, 1.0)
+    else:
+        for cls, label in IMAGENET_TO_TAXONOMY.items():
+            if cls < num_classes:
+                proj[cls, LABEL_INDEX[label]] = 1.0
+    return proj
+
+
+def _expose_embedding(model_path):
+    # (세션에 넘길 모델, 로짓 출력 이름, 임베딩 출력 이름 또는 None)
+    # 임베딩 출력이 없으면 마지막 분류층(Gemm/MatMul)의 입력 = 끝에서 두 번째 층 특징을 그래프 출력으로 추가
+    if not onnx:
+        return model_path, None, None
+    model = onnx.load(model_path)
+    graph = model.graph
+    outputs = [o.name for o in graph.output]
+    if EMBEDDING_OUTPUT in outputs:
+        return model_path, next(name for name in outputs if name != EMBEDDING_OUTPUT), EMBEDDING_OUTPUT
+    producers = {out: node for node in graph.node for out in node.output}
+    node = producers.get(outputs[0])
+    # 분류층 뒤의 Add/Identity/Reshape 등은 거슬러 올라감
+    while node is not None and node.op_type not in ('Gemm', 'MatMul'):
+        node = producers.get(node.input[0]) if node.input else None
+    if node is None:
+        return model_path, outputs[0], None
+    graph.output.append(onnx.helper.make_tensor_value_info(node.input[0], onnx.TensorProto.FLOAT, None))
+    return model.SerializeToString(), outputs[0], node.input[0]
+
+
+class GarmentTagger:
+    # CPU ONNX Runtime 세션 하나를 재사용하며 이미지를 배치 단위로 분류
+    def __init__(self, model_path=None, batch_size=DEFAULT_BATCH_SIZE, intra_op_threads=0, inter_op_threads=0,
+                 allow_spinning=True, tensor_cache=None, mask_store=None):
+        # 모델 파일부터 확인: 모델이 없으면 onnxruntime을 불러올 필요도 없음
+        self.model_path = model_path or find_default_model()
+        if not self.model_path:
+            raise FileNotFoundError(f"{MODELS_DIR}에 분류 모델(.onnx)이 없습니다")
+        if not ort:
+            raise RuntimeError("onnxruntime이 설치되어 있지 않습니다")
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = intra_op_threads
+        options.inter_op_num_threads = inter_op_threads
+        if not allow_spinning:
+            # 세션 여러 개가 코어를 나눠 쓸 때 유휴 스레드가 바쁜 대기로 CPU를 잡아먹지 않도록
+            options.add_session_config_entry('session.intra_op.allow_spinning', '0')
+        model, self.output_name, self.embedding_name = _expose_embedding(self.model_path)
+        self.session = ort.InferenceSession(model, options, providers=['CPUExecutionProvider'])
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        if self.output_name is None:
+            self.output_name = self.session.get_outputs()[0].name
+        # 배치 차원이 고정(1)이면 한 장씩, 동적이면 batch_size씩
+        dynamic = not isinstance(model_input.shape[0], int)
+        self.batch_size = batch_size if dynamic else model_input.shape[0]
+        self.input_size = model_input.shape[2] if isinstance(model_input.shape[2], int) else INPUT_SIZE
+        self._binding = self.session.io_binding()
+        self._buffer = np.empty((self.batch_size, 3, self.input_size, self.input_size), dtype=np.float32)
+        self._projection = None
+        self.tensor_cache = tensor_cache   # TensorCache: predict_paths에 keys를 주면 전처리 결과를 재사용
+        self.mask_store = mask_store       # MaskStore: keys를 주면 옷 영역만 남기고 추론
+        # 바인딩/입력 버퍼를 공유하므로 GUI와 일괄 가져오기 스레드가 동시에 쓰지 않도록
+        self._lock = threading.RLock()
+
+    @perf.traced('GarmentTagger.run', 'inference')
+    def run(self, batch):
+        # (로짓, 끝에서 두 번째 층 특징 또는 None). IO binding으로 입력 버퍼를 복사 없이 넘기고 출력은 런타임이 할당
+        batch = np.ascontiguousarray(batch, dtype=np.float32)
+        self._binding.bind_cpu_input(self.input_name, batch)
+        self._binding.bind_output(self.output_name, 'cpu')
+        if self.embedding_name:
+            self._binding.bind_output(self.embedding_name, 'cpu')
+        self.session.run_with_iobinding(self._binding)
+        outputs = self._binding.copy_outputs_to_cpu()
+        self._binding.clear_binding_inputs()
+        self._binding.clear_binding_outputs()
+        features = outputs[1].reshape(len(batch), -1) if self.embedding_name else None
+        return outputs[0].reshape(len(batch), -1), features
+
+    def scores_from_logits(self, logits):
+        if self._projection is None or self._projection.shape[0] != logits.shape[1]:
+            self._projection = _taxonomy_projection(logits.shape[1])
+        scores = _softmax(logits.astype(np.float32)) @ self._projection
+        # 분류 체계에 해당하는 확률만 다시 정규화
+        total = scores.sum(axis=1, keepdims=True)
+        np.divide(scores, total, out=scores, where=total > 0)
+        return scores
+
+    def warm_up(self):
+        # 빈 이미지 한 장 추론: 첫 실제 추론에서 생기는 커널 선택/메모리 할당 지연을 미리 치름
+        with self._lock:
+            self.run(np.zeros((1, 3, self.input_size, self.input_size), dtype=np.float32))
+
+    def predict_arrays(self, batch):
+        with self._lock:
+            logits, features = self.run(batch)
+            scores = self.scores_from_logits(logits)
+        embeddings = compact_embeddings(features) if features is not None else [None] * len(scores)
+        best = scores.argmax(axis=1)
+        return [TagPrediction(*LABELS[b], float(s[b]), s, e) for b, s, e in zip(best, scores, embeddings)]
+
+    def predict_paths(self, paths, executor=None, keys=None):
+        # 경로 목록 전체를 batch_size 단위로 한 번씩만 추론. 디코딩 실패 항목은 None
+        # keys: 경로별 내용 해시 (tensor_cache가 있으면 JPEG 디코딩 없이 캐시에서 읽음)
+        results = []
+        with self._lock:
+            for start in range(0, len(paths), self.batch_size):
+                chunk = paths[start:start + self.batch_size]
+                chunk_keys = keys[start:start + self.batch_size] if keys is not None else None
+                batch, ok = make_batch(chunk, self.input_size, out=self._buffer, executor=executor,
+                                       keys=chunk_keys, cache=self.tensor_cache, masks=self.mask_store)
+                predictions = self.predict_arrays(batch)
+                results.extend(p if good else None for p, good in zip(predictions, ok))
+        return results
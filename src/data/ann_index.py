@@ -0,0 +1,152 @@
+import numpy as np
+
+INITIAL_CAPACITY = 1024
+BRUTE_FORCE_MAX = 4096        # 이 이하면 군집 없이 전체 내적 (그래도 1ms 미만)
+DEFAULT_NPROBE = 8            # 질의마다 탐색할 군집 수
+REBUILD_RATIO = 0.25          # 군집화 이후 추가/삭제된 행이 이 비율을 넘으면 다시 군집화
+KMEANS_ITERATIONS = 6
+KMEANS_SAMPLE_PER_LIST = 32   # 중심 학습에 쓰는 군집당 표본 수
+ASSIGN_CHUNK = 8192
+
+
+def spherical_kmeans(vectors, k, iterations=KMEANS_ITERATIONS, seed=0):
+    # 단위 벡터용 k-means (내적 최대 중심에 배정, 중심은 평균을 다시 정규화)
+    rng = np.random.default_rng(seed)
+    sample = vectors
+    if len(vectors) > k * KMEANS_SAMPLE_PER_LIST:
+        sample = vectors[rng.choice(len(vectors), k * KMEANS_SAMPLE_PER_LIST, replace=False)]
+    centroids = sample[rng.choice(len(sample), k, replace=False)].copy()
+    for _ in range(iterations):
+        assign = (sample @ centroids.T).argmax(axis=1)
+        order = np.argsort(assign, kind='stable')
+        starts = np.searchsorted(assign[order], np.arange(k))
+        counts = np.bincount(assign, minlength=k)
+        filled = counts > 0   # 빈 군집은 이전 중심 유지
+        # 구간 합은 비어 있지 않은 군집의 시작 위치로만 나눔 (빈 군집의 시작은 다음 군집과 겹치거나 끝을 넘어섬)
+        centroids[filled] = np.add.reduceat(sample[order], starts[filled], axis=0)
+        centroids /= np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+    return centroids
+
+
+def assign_to_centroids(vectors, centroids):
+    # (N, D) -> (N,) 가장 가까운 중심 번호 (메모리 사용을 묶어 두려고 청크 단위)
+    out = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), ASSIGN_CHUNK):
+        out[start:start + ASSIGN_CHUNK] = (vectors[start:start + ASSIGN_CHUNK] @ centroids.T).argmax(axis=1)
+    return out
+
+
+class IVFIndex:
+    # 단위 벡터의 코사인 k-NN (IVF: 역 파일 색인)
+    # 군집화할 때 행 자체를 군집 순서로 재배치해, 군집 c = vectors[offsets[c]:offsets[c+1]] 연속 구간이 됨
+    # 군집화 이후 추가된 행은 끝(tail)에 쌓이고 전체 내적으로 탐색, 삭제는 키를 -1로 표시만 함
+    def __init__(self, dim, nprobe=DEFAULT_NPROBE):
+        self.dim = dim
+        self.nprobe = nprobe
+        self.vectors = np.zeros((INITIAL_CAPACITY, dim), dtype=np.float32)
+        self.keys = np.full(INITIAL_CAPACITY, -1, dtype=np.int64)   # 행 -> 키 (지운 행은 -1)
+        self.row_of = {}                                            # 키 -> 행
+        self.size = 0              # 사용한 행 수 (지운 행 포함)
+        self.centroids = None      # (nlist, dim)
+        self.offsets = None        # (nlist + 1,)
+        self.indexed = 0           # 군집 구간에 포함된 행 수
+        self.removed = 0           # 지운 행 수 (다시 군집화하면 0)
+
+    def __len__(self):
+        return len(self.row_of)
+
+    def __contains__(self, key):
+        return key in self.row_of
+
+    def get(self, key):
+        row = self.row_of.get(key)
+        return None if row is None else self.vectors[row]
+
+    def _reserve(self, count):
+        if self.size + count <= len(self.keys):
+            return
+        capacity = max(len(self.keys) * 2, self.size + count)
+        vectors = np.zeros((capacity, self.dim), dtype=np.float32)
+        vectors[:self.size] = self.vectors[:self.size]
+        keys = np.full(capacity, -1, dtype=np.int64)
+        keys[:self.size] = self.keys[:self.size]
+        self.vectors, self.keys = vectors, keys
+
+    def add_many(self, keys, vectors):
+        # 같은 키가 이미 있으면 새 벡터로 교체
+        keys = [int(k) for k in keys]
+        for key in keys:
+            if key in self.row_of:
+                self.remove(key)
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(keys), self.dim)
+        self._reserve(len(keys))
+        start = self.size
+        self.vectors[start:start + len(keys)] = vectors
+        self.keys[start:start + len(keys)] = keys
+        for row, key in enumerate(keys, start):
+            self.row_of[key] = row
+        self.size += len(keys)
+
+    def add(self, key, vector):
+        self.add_many([key], [vector])
+
+    def remove(self, key):
+        row = self.row_of.pop(key, None)
+        if row is not None:
+            self.keys[row] = -1
+            self.removed += 1
+
+    def needs_rebuild(self):
+        changed = (self.size - self.indexed) + self.removed
+        if self.centroids is None:
+            return len(self) > BRUTE_FORCE_MAX or (self.removed > 0 and self.removed >= REBUILD_RATIO * self.size)
+        return changed > REBUILD_RATIO * max(self.indexed, 1)
+
+    def build(self):
+        # 살아 있는 행을 모아 (필요하면) 군집화하고 군집 순서로 재배치
+        live = np.flatnonzero(self.keys[:self.size] >= 0)
+        vectors = self.vectors[live]
+        keys = self.keys[live]
+        n = len(live)
+        if n > BRUTE_FORCE_MAX:
+            nlist = int(np.sqrt(n))
+            centroids = spherical_kmeans(vectors, nlist)
+            assign = assign_to_centroids(vectors, centroids)
+            order = np.argsort(assign, kind='stable')
+            vectors, keys = vectors[order], keys[order]
+            self.centroids = centroids
+            self.offsets = np.searchsorted(assign[order], np.arange(nlist + 1))
+            self.indexed = n
+        else:
+            self.centroids = self.offsets = None
+            self.indexed = 0
+        self.vectors[:n] = vectors
+        self.keys[:n] = keys
+        self.keys[n:self.size] = -1
+        self.size = n
+        self.removed = 0
+        self.row_of = dict(zip(keys.tolist(), range(n)))
+
+    def search(self, query, k=10, exclude=None):
+        # (키 배열, 코사인 유사도 배열) 유사도 내림차순. 탐색 전에 필요하면 다시 군집화
+        if self.needs_rebuild():
+            self.build()
+        q = np.asarray(query, dtype=np.float32).ravel()
+        q = q / max(float(np.linalg.norm(q)), 1e-12)
+        spans = [(self.indexed, self.size)]
+        if self.centroids is not None:
+            nprobe = min(self.nprobe, len(self.centroids))
+            probe = np.argpartition(-(self.centroids @ q), nprobe - 1)[:nprobe]
+            spans += [(self.offsets[c], self.offsets[c + 1]) for c in probe]
+        rows = np.concatenate([np.arange(start, stop) for start, stop in spans])
+        sims = np.concatenate([self.vectors[start:stop] @ q for start, stop in spans])
+        keys = self.keys[rows]
+        valid = keys >= 0
+        if exclude is not None:
+            valid &= keys != exclude
+        keys, sims = keys[valid], sims[valid]
+        if len(sims) > k:
+            top = np.argpartition(-sims, k - 1)[:k]
+            keys, sims = keys[top], sims[top]
+        order = np.argsort(-sims)
+        return keys[order], sims[order]
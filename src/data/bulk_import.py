@@ -0,0 +1,177 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from src.ai.color import extract_colors
+from src.ai.preprocess import perceptual_hash
+from src.ai.segment import garment_mask
+from src.data.categories import CATEGORIES
+from src.data.image_store import NearDuplicateIndex
+from src.utils import perf
+from src.utils.hashing import content_hash
+
+IMAGE_EXTS = ('.png', '.jpg', '.jpeg', '.bmp', '.gif')
+# 자동 태깅 확신도가 이보다 낮으면 일괄 검토 표로 보냄
+REVIEW_THRESHOLD = 0.5
+DEFAULT_CHUNK = 32
+
+
+@dataclass
+class ImportResult:
+    path: str
+    content_hash: str
+    tags: dict
+    confidence: float
+    colors: tuple = None   # (Lab 대표색, 비중) 또는 None
+    embedding: object = None   # (EMBEDDING_DIM,) float16 또는 None (태거가 없거나 모델에 특징 출력이 없을 때)
+    source_path: str = ''      # 가져온 원래 경로 (path는 이미지 저장소 경로)
+    phash: int = None          # 64비트 pHash (유사 중복 판정용)
+
+    @property
+    def display_path(self):
+        return self.source_path or self.path
+
+    @property
+    def needs_review(self):
+        return self.confidence < REVIEW_THRESHOLD
+
+
+def default_tags():
+    # 태거가 없을 때 쓰는 기본 태그 (ImageTagDialog 기본값과 동일하게 첫 항목)
+    cat, items = next(iter(CATEGORIES.items()))
+    return {cat: items[0]}
+
+
+def iter_image_files(paths):
+    # 드롭된 파일/폴더를 스트리밍으로 순회 (폴더는 os.scandir로 재귀, 전체 목록을 미리 만들지 않음)
+    stack = list(reversed(paths))
+    while stack:
+        path = stack.pop()
+        if os.path.isdir(path):
+            try:
+                with os.scandir(path) as it:
+                    entries = sorted(it, key=lambda e: e.name)
+            except OSError:
+                continue
+            stack.extend(reversed([e.path for e in entries if e.is_dir() or e.name.lower().endswith(IMAGE_EXTS)]))
+        elif path.lower().endswith(IMAGE_EXTS) and os.path.isfile(path):
+            yield os.path.abspath(path)
+
+
+class BulkImporter:
+    # 파일 순회 -> 중복 제거(내용 해시 + pHash 유사 중복) -> 저장소로 복사 -> 디코딩/자동 태깅을 청크 단위로 흘려보내는 파이프라인
+    def __init__(self, tagger=None, known_paths=(), known_hashes=(), chunk_size=None, workers=None,
+                 image_store=None, known_phashes=(), mask_store=None):
+        self.tagger = tagger
+        self.chunk_size = chunk_size or (tagger.batch_size if tagger else DEFAULT_CHUNK)
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self.known_paths = set(known_paths)
+        self.known_hashes = set(known_hashes)
+        self.image_store = image_store     # ImageStore (None이면 원래 경로를 그대로 사용)
+        self.mask_store = mask_store       # MaskStore (태깅 때 만든 옷 영역 마스크로 색 분석. None이면 테두리 기준 추정)
+        self.near_index = NearDuplicateIndex(known_phashes)
+        self.cancelled = threading.Event()
+        self.discovered = 0
+        self.processed = 0
+        self.skipped = 0
+        self.near_duplicates = 0   # skipped 중 pHash로 걸러낸 유사 중복
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def _fingerprint(self, path):
+        # (내용 해시, pHash). 읽을 수 없으면 (None, None), 이미지로 열리지 않으면 pHash만 None
+        try:
+            digest = content_hash(path)
+        except OSError:
+            return None, None
+        try:
+            return digest, perceptual_hash(path)
+        except (OSError, ValueError):
+            return digest, None
+
+    def _store(self, path, digest):
+        if self.image_store is None:
+            return path
+        try:
+            return self.image_store.ingest(path, digest)
+        except OSError:
+            return path
+
+    def _colors(self, path, digest):
+        return extract_colors(path, mask=garment_mask(path, digest, self.mask_store))
+
+    def import_tagged(self, path, tags, embedding=None):
+        # 태그 대화상자에서 확정한 파일 하나: 중복 검사 없이(같은 사진이면 태그만 바뀜) 해시/저장소 복사/색 분석
+        digest, phash = self._fingerprint(path)
+        if digest is None:
+            # 읽을 수 없으면 원래 경로로 등록 (색/마스크는 가능한 만큼)
+            return ImportResult(path, '', tags, 1.0, self._colors(path, ''), source_path=path)
+        stored = self._store(path, digest)
+        return ImportResult(stored, digest, tags, 1.0, self._colors(stored, digest), embedding, path, phash)
+
+    def _tag_chunk(self, paths, executor, keys=None):
+        if self.tagger is None:
+            return [None] * len(paths)
+        return self.tagger.predict_paths(paths, executor=executor, keys=keys)
+
+    def run(self, paths, on_results, on_progress=None):
+        # on_results(list[ImportResult])는 청크마다 호출됨. 취소되면 다음 청크부터 중단
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            pending = []
+            for path in iter_image_files(paths):
+                if self.cancelled.is_set():
+                    break
+                self.discovered += 1
+                if path in self.known_paths:
+                    self.skipped += 1
+                    continue
+                self.known_paths.add(path)
+                pending.append(path)
+                if len(pending) >= self.chunk_size:
+                    self._process_chunk(pending, executor, on_results, on_progress)
+                    pending = []
+            if pending and not self.cancelled.is_set():
+                self._process_chunk(pending, executor, on_results, on_progress)
+
+    @perf.traced('BulkImporter.chunk', 'import')
+    def _process_chunk(self, paths, executor, on_results, on_progress):
+        fingerprints = list(executor.map(self._fingerprint, paths))
+        unique = []
+        for path, (digest, phash) in zip(paths, fingerprints):
+            if digest is None or digest in self.known_hashes:
+                self.skipped += 1
+                continue
+            self.known_hashes.add(digest)
+            if phash is not None:
+                # 바이트는 다르지만 같은 사진 (다시 저장/크기 변경된 사본)
+                if self.near_index.find(phash) is not None:
+                    self.skipped += 1
+                    self.near_duplicates += 1
+                    continue
+                self.near_index.add(phash)
+            unique.append((path, digest, phash))
+        if unique and not self.cancelled.is_set():
+            unique_paths = [p for p, _, _ in unique]
+            keys = [digest for _, digest, _ in unique]
+            predictions = self._tag_chunk(unique_paths, executor, keys)
+            colors = list(executor.map(self._colors, unique_paths, keys))
+            results = []
+            for (path, digest, phash), prediction, color in zip(unique, predictions, colors):
+                if prediction is None and self.tagger is not None:
+                    # 디코딩 실패 (손상된 이미지)
+                    self.skipped += 1
+                    continue
+                stored = self._store(path, digest)
+                if prediction is None:
+                    results.append(ImportResult(stored, digest, default_tags(), 0.0, color, source_path=path,
+                                                phash=phash))
+                else:
+                    results.append(ImportResult(stored, digest, prediction.tags, prediction.confidence, color,
+                                                prediction.embedding, path, phash))
+            self.processed += len(results)
+            if results:
+                on_results(results)
+        if on_progress is not None:
+            on_progress(self.processed + self.skipped, self.discovered)
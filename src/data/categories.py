@@ -0,0 +1,61 @@
+# 옷장 분류 체계 {메인 카테고리: [하위 항목]}
+# UI(PySide6)에 의존하지 않는 모듈(src.ai, src.data)에서도 공유
+CATEGORIES = {
+    "상의": ["티셔츠", "셔츠", "블라우스", "후드티", "맨투맨"],
+    "하의": ["청바지", "슬랙스", "치마", "반바지", "레깅스"],
+    "아우터": ["재킷", "코트", "패딩", "가디건", "조끼"],
+    "신발": ["운동화", "구두", "부츠", "샌들", "슬리퍼"],
+    "액세서리": ["모자", "가방", "벨트", "목도리"]
+}
+
+
+def split_tags(tags):
+    # get_tags() 결과에서 (메인 카테고리, 하위 항목) 추출: 첫 번째 체크된 카테고리가 메인
+    main_cat = next(iter(tags.keys()), None)
+    return main_cat, tags.get(main_cat) if main_cat else None
+
+
+# === 추천용 하위 항목 속성 ===
+STYLES = ['캐주얼', '포멀', '스포티', '빈티지']
+SITUATIONS = ['업무', '데이트', '운동', '일상', '파티']
+WEATHERS = ['맑음', '흐림', '비', '눈']
+
+# 하위 항목별 스타일 성향 (STYLES 순서, 0~1)
+SUB_ITEM_STYLE = {
+    "티셔츠": [1.0, 0.1, 0.6, 0.4], "셔츠": [0.5, 1.0, 0.1, 0.5], "블라우스": [0.4, 0.9, 0.0, 0.6],
+    "후드티": [0.9, 0.0, 0.8, 0.3], "맨투맨": [1.0, 0.1, 0.6, 0.4],
+    "청바지": [1.0, 0.2, 0.3, 0.8], "슬랙스": [0.4, 1.0, 0.1, 0.4], "치마": [0.6, 0.7, 0.1, 0.7],
+    "반바지": [0.9, 0.0, 0.8, 0.3], "레깅스": [0.3, 0.0, 1.0, 0.1],
+    "재킷": [0.5, 0.9, 0.2, 0.6], "코트": [0.4, 1.0, 0.0, 0.6], "패딩": [0.8, 0.2, 0.6, 0.2],
+    "가디건": [0.8, 0.5, 0.1, 0.8], "조끼": [0.5, 0.6, 0.3, 0.8],
+    "운동화": [0.9, 0.1, 1.0, 0.3], "구두": [0.2, 1.0, 0.0, 0.6], "부츠": [0.6, 0.5, 0.1, 0.9],
+    "샌들": [0.8, 0.2, 0.3, 0.4], "슬리퍼": [0.7, 0.0, 0.4, 0.2],
+    "모자": [0.8, 0.1, 0.7, 0.6], "가방": [0.7, 0.7, 0.3, 0.6], "벨트": [0.5, 0.9, 0.1, 0.7],
+    "목도리": [0.7, 0.6, 0.1, 0.7],
+}
+
+# 상황별로 기대하는 스타일 성향 (STYLES 순서)
+SITUATION_STYLE = {
+    "업무": [0.2, 1.0, 0.0, 0.2],
+    "데이트": [0.8, 0.6, 0.0, 0.5],
+    "운동": [0.2, 0.0, 1.0, 0.0],
+    "일상": [1.0, 0.2, 0.4, 0.4],
+    "파티": [0.4, 0.9, 0.0, 0.6],
+}
+
+# 하위 항목별 적정 기온 범위(°C)
+TEMP_RANGE = {
+    "티셔츠": (18, 50), "셔츠": (10, 30), "블라우스": (12, 30), "후드티": (5, 22), "맨투맨": (5, 22),
+    "청바지": (-10, 28), "슬랙스": (-5, 30), "치마": (12, 40), "반바지": (20, 50), "레깅스": (-5, 28),
+    "재킷": (8, 20), "코트": (-10, 15), "패딩": (-30, 8), "가디건": (12, 22), "조끼": (10, 22),
+    "운동화": (-10, 40), "구두": (-10, 35), "부츠": (-30, 15), "샌들": (22, 50), "슬리퍼": (24, 50),
+    "모자": (-30, 50), "가방": (-30, 50), "벨트": (-30, 50), "목도리": (-30, 10),
+}
+
+# 날씨별로 피하는 하위 항목
+WEATHER_BLOCKED = {
+    "맑음": set(),
+    "흐림": set(),
+    "비": {"구두", "슬리퍼"},
+    "눈": {"샌들", "슬리퍼", "반바지", "치마"},
+}
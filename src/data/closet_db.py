@@ -0,0 +1,195 @@
+import json
+import os
+import sqlite3
+import time
+from collections import namedtuple
+
+from src.data.categories import split_tags
+from src.utils.paths import app_data_dir
+
+SCHEMA_VERSION = 6
+LOAD_BATCH = 5000
+
+StoredItem = namedtuple('StoredItem', 'path tags content_hash mtime_ns size thumbnail colors source_path phash')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    content_hash TEXT,
+    main_cat TEXT,
+    sub_item TEXT,
+    tags TEXT NOT NULL,
+    thumbnail TEXT,
+    colors BLOB,
+    source_path TEXT,
+    phash TEXT,
+    file_mtime_ns INTEGER,
+    file_size INTEGER,
+    added_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_items_category ON items(main_cat, sub_item);
+CREATE INDEX IF NOT EXISTS idx_items_sub_item ON items(sub_item);
+CREATE INDEX IF NOT EXISTS idx_items_hash ON items(content_hash);
+CREATE TABLE IF NOT EXISTS watched_folders (root TEXT PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS watched_files (
+    path TEXT PRIMARY KEY,
+    root TEXT NOT NULL,
+    file_mtime_ns INTEGER,
+    file_size INTEGER,
+    content_hash TEXT
+);
+"""
+
+# 이전 버전 DB를 올릴 때 적용할 변경 {도달 버전: SQL}
+MIGRATIONS = {
+    2: "ALTER TABLE items ADD COLUMN colors BLOB",
+    3: "ALTER TABLE items ADD COLUMN source_path TEXT",
+    4: "ALTER TABLE items ADD COLUMN phash TEXT",
+    5: "CREATE TABLE watched_folders (root TEXT PRIMARY KEY);"
+       "CREATE TABLE watched_files (path TEXT PRIMARY KEY, root TEXT NOT NULL, file_mtime_ns INTEGER,"
+       " file_size INTEGER, content_hash TEXT)",
+    # 읽는 곳이 없던 열 정리 (임베딩은 EmbeddingStore, 대표색은 colors 열에 있음)
+    6: "DROP INDEX IF EXISTS idx_items_color;"
+       "ALTER TABLE items DROP COLUMN dominant_color;"
+       "ALTER TABLE items DROP COLUMN embedding",
+}
+
+
+def _file_stat(path):
+    try:
+        st = os.stat(path)
+        return st.st_mtime_ns, st.st_size
+    except OSError:
+        return None, None
+
+
+class ClosetDB:
+    # SQLite(WAL) 옷장 저장소. 쓰기는 항상 여러 항목을 한 트랜잭션으로 묶어서 처리
+    def __init__(self, path=None):
+        self.path = path or os.path.join(app_data_dir(), 'closet.db')
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # WAL에서는 NORMAL이어도 커밋 단위 일관성은 유지됨 (전원 차단 시 마지막 커밋만 유실 가능)
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self._migrate()
+
+    def _migrate(self):
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
+        with self.conn:
+            if version == 0:
+                self.conn.executescript(SCHEMA)
+            else:
+                for target in range(version + 1, SCHEMA_VERSION + 1):
+                    for statement in MIGRATIONS[target].split(';'):
+                        self.conn.execute(statement)
+            self.conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def close(self):
+        self.conn.close()
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+    def upsert_items(self, entries):
+        # entries: [(경로, {카테고리: 하위항목}, 내용 해시)] -> 한 트랜잭션
+        now = time.time()
+        rows = []
+        for path, tags, content_hash in entries:
+            main_cat, sub_item = split_tags(tags)
+            mtime_ns, size = _file_stat(path)
+            rows.append((path, content_hash or None, main_cat, sub_item, json.dumps(tags, ensure_ascii=False),
+                         mtime_ns, size, now))
+        with self.conn:
+            self.conn.executemany(
+                """
+                INSERT INTO items (path, content_hash, main_cat, sub_item, tags, file_mtime_ns, file_size, added_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(path) DO UPDATE SET
+                    content_hash = COALESCE(excluded.content_hash, items.content_hash),
+                    main_cat = excluded.main_cat,
+                    sub_item = excluded.sub_item,
+                    tags = excluded.tags,
+                    file_mtime_ns = excluded.file_mtime_ns,
+                    file_size = excluded.file_size
+                """,
+                rows,
+            )
+
+    def delete_paths(self, paths):
+        with self.conn:
+            self.conn.executemany("DELETE FROM items WHERE path = ?", [(p,) for p in paths])
+
+    def set_thumbnails(self, updates):
+        # updates: [(경로, 썸네일 캐시 경로)]
+        with self.conn:
+            self.conn.executemany("UPDATE items SET thumbnail = ? WHERE path = ?", [(t, p) for p, t in updates])
+
+    def set_colors(self, updates):
+        # updates: [(경로, 대표색 blob)]
+        with self.conn:
+            self.conn.executemany("UPDATE items SET colors = ? WHERE path = ?", [(blob, p) for p, blob in updates])
+
+    def set_sources(self, updates):
+        # updates: [(저장소 경로, 가져온 원래 경로, pHash 16진 문자열)]
+        with self.conn:
+            self.conn.executemany("UPDATE items SET source_path = ?, phash = ? WHERE path = ?",
+                                  [(source, phash, p) for p, source, phash in updates])
+
+    def iter_items(self, batch=LOAD_BATCH):
+        # 시작 시 옷장 복원용: StoredItem을 batch개씩
+        # 커서 대신 id 구간으로 끊어 읽어, 읽는 도중 쓰기가 섞여도 안전하게 이어감
+        last_id = 0
+        while True:
+            rows = self.conn.execute(
+                "SELECT id, path, tags, content_hash, file_mtime_ns, file_size, thumbnail, colors, source_path, phash "
+                "FROM items "
+                "WHERE id > ? ORDER BY id LIMIT ?",
+                (last_id, batch),
+            ).fetchall()
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            yield [StoredItem(path, json.loads(tags), content_hash or '', mtime_ns, size, thumbnail, colors,
+                              source_path, phash)
+                   for _, path, tags, content_hash, mtime_ns, size, thumbnail, colors, source_path, phash in rows]
+
+    def paths_for(self, main_cat=None, sub_item=None):
+        clauses, params = [], []
+        for column, value in (('main_cat', main_cat), ('sub_item', sub_item)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return [row[0] for row in self.conn.execute(f"SELECT path FROM items{where}", params)]
+
+    def watched_roots(self):
+        return [row[0] for row in self.conn.execute("SELECT root FROM watched_folders ORDER BY root")]
+
+    def set_watched_roots(self, roots):
+        # 감시 폴더 목록을 통째로 바꿈 (빠진 폴더의 파일 기록도 지움)
+        with self.conn:
+            self.conn.execute("DELETE FROM watched_folders")
+            self.conn.executemany("INSERT INTO watched_folders (root) VALUES (?)", [(r,) for r in roots])
+            self.conn.execute(f"DELETE FROM watched_files WHERE root NOT IN ({','.join('?' * len(roots))})",
+                              list(roots))
+
+    def watched_files(self, root):
+        # 감시 폴더의 마지막 동기화 상태 {경로: (mtime_ns, 크기, 내용 해시 또는 None)} (쿼리 한 번)
+        rows = self.conn.execute("SELECT path, file_mtime_ns, file_size, content_hash FROM watched_files WHERE root = ?",
+                                 (root,))
+        return {path: (mtime_ns, size, digest) for path, mtime_ns, size, digest in rows}
+
+    def upsert_watched_files(self, root, rows):
+        # rows: [(경로, mtime_ns, 크기, 내용 해시 또는 None)]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO watched_files (path, root, file_mtime_ns, file_size, content_hash) "
+                "VALUES (?, ?, ?, ?, ?)", [(path, root, mtime_ns, size, digest) for path, mtime_ns, size, digest in rows])
+
+    def delete_watched_files(self, paths):
+        with self.conn:
+            self.conn.executemany("DELETE FROM watched_files WHERE path = ?", [(p,) for p in paths])
@@ -0,0 +1,85 @@
+from dataclasses import dataclass, field
+
+from src.data.categories import CATEGORIES, split_tags
+
+
+@dataclass
+class ClosetItem:
+    item_id: int
+    path: str
+    main_cat: str
+    sub_item: str
+    tags: dict = field(default_factory=dict)
+    content_hash: str = ''
+
+
+class ClosetIndex:
+    # 메인 카테고리 / (메인 카테고리, 하위 항목) -> 아이템 id 집합
+    # 집합은 미리 만들어 두고 제자리에서 갱신하므로, 필터는 같은 set 객체를 계속 참조할 수 있음
+    def __init__(self):
+        self.items = {}          # item_id -> ClosetItem
+        self.by_path = {}        # 경로 -> item_id
+        self.by_hash = {}        # 내용 해시 -> item_id (중복 이미지 판별)
+        self.by_category = {cat: set() for cat in CATEGORIES}
+        self.by_sub_item = {(cat, sub): set() for cat, subs in CATEGORIES.items() for sub in subs}
+        self.all_ids = set()
+        self._next_id = 0
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, path):
+        return path in self.by_path
+
+    def has_hash(self, content_hash):
+        return content_hash in self.by_hash
+
+    def add(self, path, tags, content_hash=''):
+        if path in self.by_path:
+            self.remove(path)
+        main_cat, sub_item = split_tags(tags)
+        item = ClosetItem(self._next_id, path, main_cat, sub_item, dict(tags), content_hash)
+        self._next_id += 1
+        self.items[item.item_id] = item
+        self.by_path[path] = item.item_id
+        if content_hash:
+            self.by_hash[content_hash] = item.item_id
+        self.all_ids.add(item.item_id)
+        if main_cat is not None:
+            self.by_category.setdefault(main_cat, set()).add(item.item_id)
+            self.by_sub_item.setdefault((main_cat, sub_item), set()).add(item.item_id)
+        return item
+
+    def remove(self, path):
+        item_id = self.by_path.pop(path, None)
+        if item_id is None:
+            return None
+        item = self.items.pop(item_id)
+        self.all_ids.discard(item_id)
+        if item.content_hash and self.by_hash.get(item.content_hash) == item_id:
+            del self.by_hash[item.content_hash]
+        if item.main_cat is not None:
+            self.by_category[item.main_cat].discard(item_id)
+            self.by_sub_item[(item.main_cat, item.sub_item)].discard(item_id)
+        return item
+
+    def set_content_hash(self, path, content_hash):
+        # 해시 없이 등록된 항목에 나중에 계산한 해시를 채움
+        item_id = self.by_path.get(path)
+        if item_id is None or not content_hash:
+            return None
+        item = self.items[item_id]
+        item.content_hash = content_hash
+        self.by_hash.setdefault(content_hash, item_id)
+        return item
+
+    def get(self, item_id):
+        return self.items.get(item_id)
+
+    def ids_for(self, main_cat=None, sub_item=None):
+        # 조건에 맞는 id 집합 (복사본이 아닌 인덱스가 가진 set 그대로)
+        if main_cat is None:
+            return self.all_ids
+        if sub_item is None:
+            return self.by_category.setdefault(main_cat, set())
+        return self.by_sub_item.setdefault((main_cat, sub_item), set())
@@ -0,0 +1,129 @@
+import numpy as np
+
+from src.ai.color import COLOR_NAMES, NAMED_LAB
+from src.ai.recommend import OUTER_REQUIRED_BELOW, REQUIRED_SLOTS
+from src.data.categories import CATEGORIES, STYLES, SUB_ITEM_STYLE, WEATHERS
+from src.data.suitability import NEUTRAL_SUB, NO_CATEGORY, SUB_INDEX, SUB_ITEMS, sub_item_suitability
+
+COLOR_UNITS = 1000   # 색 비중은 정수(1/1000 단위)로 더하고 빼서 추가/삭제를 반복해도 오차가 쌓이지 않게
+# 분석 화면의 기온 구간 (이름, 대표 기온 °C)
+TEMP_BANDS = [('한파', -8), ('추움', 3), ('쌀쌀', 10), ('선선', 16), ('따뜻', 22), ('더움', 28)]
+
+_CATEGORY_INDEX = {cat: i for i, cat in enumerate(CATEGORIES)}
+# 하위 항목별 스타일 구성비 (행 합 1, 표에 없는 항목은 0 -> 스타일 집계에서 빠짐)
+STYLE_SHARE = np.array([SUB_ITEM_STYLE.get(sub, [0.0] * len(STYLES)) for sub in SUB_ITEMS]
+                       + [[0.0] * len(STYLES)], dtype=np.float64)
+STYLE_SHARE /= np.maximum(STYLE_SHARE.sum(axis=1, keepdims=True), 1e-9)
+# (하위 항목, 기온 구간, 날씨) -> 착용 가능 여부. 구간 수 x 날씨 수만큼만 미리 계산
+BAND_WEARABLE = np.stack([np.stack([sub_item_suitability(t, weather)[1] for weather in WEATHERS], axis=1)
+                          for _, t in TEMP_BANDS], axis=1)
+
+
+def band_required(temperature):
+    # 그 기온에서 코디에 꼭 있어야 하는 메인 카테고리 (추천기와 같은 기준)
+    required = [cat for cat in CATEGORIES if cat in REQUIRED_SLOTS]
+    if temperature < OUTER_REQUIRED_BELOW:
+        required.append('아우터')
+    return required
+
+
+class ClosetStats:
+    # 옷장 분석용 집계. 옷 하나를 넣고 뺄 때 (카테고리, 하위 항목) 칸 하나와 색 이름 몇 칸만 더하고 빼므로 O(1)
+    # 카테고리/하위 항목/스타일/기온 구간별 분포는 이 표에서 분류 체계 크기만큼만 계산 (옷 수와 무관)
+    # versions는 집계가 바뀔 때마다 올라감 -> 화면은 버전이 바뀐 차트만 다시 그림
+    def __init__(self):
+        self.pair_counts = np.zeros((NO_CATEGORY + 1, NEUTRAL_SUB + 1), dtype=np.int64)
+        self.color_units = np.zeros(len(COLOR_NAMES), dtype=np.int64)
+        self.colored = 0                   # 색 분석이 끝난 옷 수
+        self.versions = {'items': 0, 'colors': 0}
+        self._items = {}                   # item_id -> (카테고리 번호, 하위 항목 번호)
+        self._colors = {}                  # item_id -> (색 이름 번호 배열, 비중 배열)
+
+    def __len__(self):
+        return len(self._items)
+
+    def add_many(self, items):
+        # items: ClosetItem 목록 (이미 있는 id는 옛 칸에서 빼고 다시 넣음)
+        if not items:
+            return
+        for item in items:
+            old = self._items.get(item.item_id)
+            if old is not None:
+                self.pair_counts[old] -= 1
+            key = (_CATEGORY_INDEX.get(item.main_cat, NO_CATEGORY), SUB_INDEX.get(item.sub_item, NEUTRAL_SUB))
+            self._items[item.item_id] = key
+            self.pair_counts[key] += 1
+        self.versions['items'] += 1
+
+    def remove(self, item_id):
+        key = self._items.pop(item_id, None)
+        if key is None:
+            return
+        self.pair_counts[key] -= 1
+        self.versions['items'] += 1
+        if self._drop_colors(item_id):
+            self.versions['colors'] += 1
+
+    def _drop_colors(self, item_id):
+        old = self._colors.pop(item_id, None)
+        if old is None:
+            return False
+        np.subtract.at(self.color_units, old[0], old[1])
+        self.colored -= 1
+        return True
+
+    def set_colors(self, updates):
+        # updates: [(item_id, Lab 대표색 (K, 3), 비중 (K,))] -> 가장 가까운 색 이름을 한 번에 찾음
+        updates = [(item_id, colors, weights) for item_id, colors, weights in updates
+                   if item_id in self._items and len(colors)]
+        if not updates:
+            return
+        labs = np.concatenate([np.asarray(colors, dtype=np.float32).reshape(-1, 3) for _, colors, _ in updates])
+        names = ((labs[:, None, :] - NAMED_LAB[None]) ** 2).sum(axis=2).argmin(axis=1)
+        start = 0
+        for item_id, colors, weights in updates:
+            end = start + len(colors)
+            units = np.rint(np.asarray(weights, dtype=np.float64) * COLOR_UNITS).astype(np.int64)
+            self._drop_colors(item_id)
+            self._colors[item_id] = (names[start:end], units)
+            np.add.at(self.color_units, names[start:end], units)
+            self.colored += 1
+            start = end
+        self.versions['colors'] += 1
+
+    def category_counts(self):
+        # {메인 카테고리: 옷 수} (CATEGORIES 순서) + 카테고리가 없는 옷 수
+        totals = self.pair_counts.sum(axis=1)
+        return {cat: int(totals[i]) for i, cat in enumerate(CATEGORIES)}, int(totals[NO_CATEGORY])
+
+    def sub_item_counts(self):
+        # [(메인 카테고리, 하위 항목, 옷 수)] - 옷이 있는 항목만
+        return [(cat, sub, int(self.pair_counts[i, SUB_INDEX[sub]]))
+                for i, (cat, subs) in enumerate(CATEGORIES.items()) for sub in subs
+                if self.pair_counts[i, SUB_INDEX[sub]]]
+
+    def color_distribution(self):
+        # {색 이름: 옷장 전체에서 차지하는 비중 합(옷 단위)} - 색 분석이 끝난 옷만
+        return {name: self.color_units[i] / COLOR_UNITS for i, name in enumerate(COLOR_NAMES)}
+
+    def style_mix(self):
+        # {스타일: 비율 0~1} - 하위 항목별 스타일 구성비를 옷 수만큼 가중 평균
+        mix = self.pair_counts.sum(axis=0) @ STYLE_SHARE
+        total = mix.sum()
+        return {style: float(mix[i] / total) if total else 0.0 for i, style in enumerate(STYLES)}
+
+    def coverage(self):
+        # (기온 구간, 날씨, 메인 카테고리) -> 그 조건에서 입을 수 있는 옷 수
+        return np.einsum('cs,sbw->bwc', self.pair_counts[:NO_CATEGORY], BAND_WEARABLE)
+
+    def gaps(self, coverage=None):
+        # [(구간 이름, 날씨, [없는 필수 카테고리])] - 옷장으로 코디를 못 만드는 기온/날씨 조합
+        coverage = self.coverage() if coverage is None else coverage
+        gaps = []
+        for b, (band, temperature) in enumerate(TEMP_BANDS):
+            required = band_required(temperature)
+            for w, weather in enumerate(WEATHERS):
+                missing = [cat for cat in required if not coverage[b, w, _CATEGORY_INDEX[cat]]]
+                if missing:
+                    gaps.append((band, weather, missing))
+        return gaps
@@ -0,0 +1,120 @@
+import numpy as np
+
+from src.ai.color import NUM_COLORS
+
+INITIAL_CAPACITY = 1024
+LIKE_SIGMA = 20.0         # 좋아하는 색과의 거리(ΔE)에 대한 감쇠 폭
+AVOID_DELTA_E = 18.0      # 피하는 색과 이 거리 이내면 제외
+AVOID_MIN_WEIGHT = 0.2    # 옷 면적의 이 비율 이상 차지하는 색만 제외 판정에 사용
+
+
+def nearest_sq(labs, palette_lab):
+    # (N, K, 3) 대표색 각각에서 가장 가까운 팔레트 색까지의 ΔE² (CIE76) -> (N, K)
+    # |x-p|² = |x|² - 2x·p + |p|² 로 풀어 (P, 3) @ (3, N*K) 행렬곱 한 번으로 계산
+    # (팔레트 축을 앞에 두어야 min 축소가 연속 메모리를 따라가 빠름)
+    n = len(labs)
+    flat = labs.reshape(-1, 3)
+    palette = np.asarray(palette_lab, dtype=np.float32).reshape(-1, 3)
+    d2 = (-2.0 * palette) @ flat.T
+    d2 += (palette * palette).sum(axis=1)[:, None]
+    nearest = d2.min(axis=0)
+    nearest += np.einsum('ij,ij->i', flat, flat)
+    np.maximum(nearest, 0.0, out=nearest)
+    return nearest.reshape(n, -1)
+
+
+def like_scores(labs, weights, like_lab):
+    # 0~1: 대표색들이 좋아하는 색에 얼마나 가까운지 (비중 가중 평균, 색 정보가 없으면 0)
+    if len(like_lab) == 0 or len(labs) == 0:
+        return np.zeros(len(labs), dtype=np.float32)
+    nearest = np.sqrt(nearest_sq(labs, like_lab))
+    nearest *= -1.0 / LIKE_SIGMA
+    np.exp(nearest, out=nearest)
+    return (weights * nearest).sum(axis=1)
+
+
+def avoid_mask(labs, weights, avoid_lab, delta_e=AVOID_DELTA_E, min_weight=AVOID_MIN_WEIGHT):
+    # True = 피하는 색이 충분한 면적으로 들어 있어 제외할 옷
+    if len(avoid_lab) == 0 or len(labs) == 0:
+        return np.zeros(len(labs), dtype=bool)
+    near = nearest_sq(labs, avoid_lab) < delta_e * delta_e
+    return (near & (weights >= min_weight)).any(axis=1)
+
+
+class ColorIndex:
+    # 옷장 전체의 대표색을 (N, K, 3) Lab 배열 하나로 보관 -> 선호/기피 팔레트 질의를 행렬 연산 한 번으로
+    def __init__(self, capacity=INITIAL_CAPACITY):
+        self.labs = np.zeros((capacity, NUM_COLORS, 3), dtype=np.float32)
+        self.weights = np.zeros((capacity, NUM_COLORS), dtype=np.float32)
+        self.ids = np.full(capacity, -1, dtype=np.int64)   # 행 -> item_id
+        self.row_of = {}                                    # item_id -> 행
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, item_id):
+        return item_id in self.row_of
+
+    def _grow(self):
+        capacity = len(self.ids) * 2
+        for name in ('labs', 'weights'):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+        ids = np.full(capacity, -1, dtype=np.int64)
+        ids[:self.size] = self.ids[:self.size]
+        self.ids = ids
+
+    def add(self, item_id, colors, weights):
+        row = self.row_of.get(item_id)
+        if row is None:
+            if self.size == len(self.ids):
+                self._grow()
+            row = self.size
+            self.size += 1
+            self.row_of[item_id] = row
+            self.ids[row] = item_id
+        self.labs[row] = colors
+        self.weights[row] = weights
+
+    def remove(self, item_id):
+        # 마지막 행을 빈자리로 옮겨 배열을 조밀하게 유지
+        row = self.row_of.pop(item_id, None)
+        if row is None:
+            return
+        last = self.size - 1
+        if row != last:
+            moved = int(self.ids[last])
+            self.labs[row] = self.labs[last]
+            self.weights[row] = self.weights[last]
+            self.ids[row] = moved
+            self.row_of[moved] = row
+        self.ids[last] = -1
+        self.weights[last] = 0
+        self.size = last
+
+    def colors_of(self, item_id):
+        row = self.row_of.get(item_id)
+        if row is None:
+            return None
+        return self.labs[row], self.weights[row]
+
+    def like_scores(self, like_lab):
+        return like_scores(self.labs[:self.size], self.weights[:self.size], like_lab)
+
+    def avoid_mask(self, avoid_lab, delta_e=AVOID_DELTA_E, min_weight=AVOID_MIN_WEIGHT):
+        return avoid_mask(self.labs[:self.size], self.weights[:self.size], avoid_lab, delta_e, min_weight)
+
+    def rank(self, like_lab, avoid_lab):
+        # (item_id 배열, 점수) 선호 점수 내림차순, 기피 색 옷은 제외
+        scores = self.like_scores(like_lab)
+        keep = ~self.avoid_mask(avoid_lab)
+        rows = np.flatnonzero(keep)
+        if len(like_lab):
+            rows = rows[np.argsort(-scores[rows])]
+        return self.ids[rows], scores[rows]
+
+    def excluded_ids(self, avoid_lab):
+        return set(self.ids[:self.size][self.avoid_mask(avoid_lab)].tolist())
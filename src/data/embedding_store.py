@@ -0,0 +1,83 @@
+import os
+
+import numpy as np
+
+from src.ai.embedding import EMBEDDING_DIM
+from src.utils.paths import app_data_dir
+
+INITIAL_ROWS = 1024
+
+
+class EmbeddingStore:
+    # 내용 해시 -> float16 임베딩 행
+    # <dir>/embeddings_<dim>.f16: (행, dim) 행렬을 memmap으로 열어 필요한 행만 페이지 단위로 읽음
+    # <dir>/embeddings_<dim>.keys: 행 순서대로 내용 해시 (추가만 함)
+    def __init__(self, directory=None, dim=EMBEDDING_DIM):
+        self.directory = directory or app_data_dir('embeddings')
+        self.dim = dim
+        self.matrix_path = os.path.join(self.directory, f'embeddings_{dim}.f16')
+        self.keys_path = os.path.join(self.directory, f'embeddings_{dim}.keys')
+        self.keys = []
+        if os.path.exists(self.keys_path):
+            with open(self.keys_path, encoding='ascii') as f:
+                self.keys = f.read().split()
+        row_bytes = dim * np.dtype(np.float16).itemsize
+        available = os.path.getsize(self.matrix_path) // row_bytes if os.path.exists(self.matrix_path) else 0
+        # 행렬은 키보다 먼저 쓰므로, 행이 없는 키(중간에 종료된 기록)는 버림
+        del self.keys[available:]
+        self.row_of = {key: row for row, key in enumerate(self.keys)}
+        self._matrix = None
+        self._map(max(available, INITIAL_ROWS))
+
+    def _map(self, rows):
+        # 파일 크기를 rows 행으로 늘리고 다시 매핑 (행렬 용량은 두 배씩 증가)
+        self._matrix = None
+        with open(self.matrix_path, 'a+b') as f:
+            size = rows * self.dim * np.dtype(np.float16).itemsize
+            f.seek(0, os.SEEK_END)
+            if f.tell() < size:
+                f.truncate(size)
+        self._matrix = np.memmap(self.matrix_path, dtype=np.float16, mode='r+', shape=(rows, self.dim))
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, key):
+        return key in self.row_of
+
+    @property
+    def matrix(self):
+        return self._matrix[:len(self.keys)]
+
+    def get(self, key):
+        row = self.row_of.get(key)
+        return None if row is None else self._matrix[row]
+
+    def rows_for(self, keys):
+        # 키 목록 -> 행 번호 배열 (없는 키는 -1)
+        return np.array([self.row_of.get(key, -1) for key in keys], dtype=np.int64)
+
+    def add_many(self, entries):
+        # entries: [(내용 해시, 임베딩)] -> 새 키만 한 번에 기록
+        new = {}
+        for key, vector in entries:
+            if key and vector is not None and key not in self.row_of:
+                new[key] = vector
+        if not new:
+            return
+        start = len(self.keys)
+        end = start + len(new)
+        if end > len(self._matrix):
+            self._map(max(end, len(self._matrix) * 2))
+        self._matrix[start:end] = np.stack(list(new.values()))
+        self._matrix.flush()
+        with open(self.keys_path, 'a', encoding='ascii') as f:
+            f.write(''.join(f"{key}\n" for key in new))
+        for row, key in enumerate(new, start):
+            self.keys.append(key)
+            self.row_of[key] = row
+
+    def close(self):
+        if self._matrix is not None:
+            self._matrix.flush()
+            self._matrix = None
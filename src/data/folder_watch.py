@@ -0,0 +1,337 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import stat
+import struct
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+
+from src.data.bulk_import import IMAGE_EXTS
+from src.utils import perf
+from src.utils.hashing import content_hash
+
+DEBOUNCE_S = 1.0          # 마지막 변경 뒤 이만큼 조용하면 모인 변경을 한 묶음으로 처리 (복사 중인 파일 대기)
+MAX_BATCH_DELAY_S = 10.0  # 변경이 계속 이어져도 첫 변경 뒤 이 시간이 지나면 처리
+POLL_INTERVAL_S = 3.0     # inotify를 못 쓸 때 폴더 전체를 다시 훑는 간격
+WAKE_S = 0.5              # 중지 요청을 확인하는 간격
+
+# inotify (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+              | IN_MOVE_SELF)
+_EVENT = struct.Struct('iIII')   # wd, mask, cookie, len (+ 이름 len 바이트)
+
+
+def is_image(path):
+    return path.lower().endswith(IMAGE_EXTS)
+
+
+def scan_folder(root):
+    # 폴더 아래 이미지 파일 전체 {경로: (mtime_ns, 크기)} - os.scandir 한 번의 순회로 (Windows는 stat도 목록에 포함)
+    # root는 절대 경로 (경로 키가 inotify 이벤트 경로와 같아야 함)
+    found = {}
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif is_image(entry.name) and entry.is_file():
+                            st = entry.stat()
+                            found[entry.path] = (st.st_mtime_ns, st.st_size)
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return found
+
+
+def stat_paths(paths):
+    # 바뀌었다고 알려진 경로만 stat (없어진 파일은 결과에서 빠짐)
+    found = {}
+    for path in paths:
+        if not is_image(path):
+            continue
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        if stat.S_ISREG(st.st_mode):
+            found[path] = (st.st_mtime_ns, st.st_size)
+    return found
+
+
+@dataclass
+class FolderChanges:
+    # 감시 폴더 한 묶음의 변경. 가져오기/삭제가 필요한 것만 담김
+    root: str
+    added: list = field(default_factory=list)       # [경로]
+    modified: list = field(default_factory=list)    # [(경로, 이전 내용 해시 또는 None)] - 내용이 실제로 바뀐 파일
+    removed: list = field(default_factory=list)     # [(경로, 이전 내용 해시 또는 None)]
+    stats: dict = field(default_factory=dict)       # 추가/수정 경로 -> (mtime_ns, 크기)
+    touched: list = field(default_factory=list)     # [(경로, mtime_ns, 크기, 해시)] - 시각만 바뀌고 내용은 같은 파일
+
+    def __bool__(self):
+        return bool(self.added or self.modified or self.removed or self.touched)
+
+
+class FolderSnapshot:
+    # 감시 폴더의 마지막 동기화 상태 {경로: (mtime_ns, 크기, 내용 해시 또는 None)}
+    # 감시 스레드가 변경을 찾는 즉시 갱신하므로 같은 변경을 두 번 보내지 않음 (DB 기록은 GUI 쪽이 가져오기를 마친 뒤)
+    def __init__(self, root, files=None):
+        self.root = os.path.abspath(root)
+        self.files = dict(files or {})
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.files)
+
+    def get(self, path):
+        with self._lock:
+            return self.files.get(path)
+
+    def set_hash(self, path, digest):
+        with self._lock:
+            entry = self.files.get(path)
+            if entry is not None:
+                self.files[path] = (entry[0], entry[1], digest)
+                return True
+        return False
+
+    @perf.traced('FolderSnapshot.diff', 'import')
+    def diff(self, found, scope=None):
+        # found: 이번에 본 {경로: (mtime_ns, 크기)}. scope가 없으면 폴더 전체를 본 것 (found에 없는 기존 파일 = 삭제)
+        # mtime/크기가 다르면 내용 해시를 다시 계산해, 해시가 같으면 수정으로 치지 않음
+        changes = FolderChanges(self.root)
+        with self._lock:
+            known = dict(self.files)
+        candidates = known.keys() if scope is None else [p for p in scope if p in known]
+        for path in candidates:
+            if path not in found:
+                changes.removed.append((path, known[path][2]))
+        for path, seen in found.items():
+            entry = known.get(path)
+            if entry is None:
+                changes.added.append(path)
+                changes.stats[path] = seen
+            elif (entry[0], entry[1]) != seen:
+                digest = entry[2]
+                if digest:
+                    try:
+                        if content_hash(path) == digest:
+                            changes.touched.append((path, *seen, digest))
+                            continue
+                    except OSError:
+                        continue
+                changes.modified.append((path, digest))
+                changes.stats[path] = seen
+        with self._lock:
+            for path, _ in changes.removed:
+                self.files.pop(path, None)
+            for path, seen in changes.stats.items():
+                self.files[path] = (*seen, None)
+            for path, mtime_ns, size, digest in changes.touched:
+                self.files[path] = (mtime_ns, size, digest)
+        return changes
+
+
+class ChangeBatcher:
+    # 바뀐 경로를 모아 두었다가 DEBOUNCE_S 동안 조용하거나 MAX_BATCH_DELAY_S가 지나면 한 번에 내보냄
+    def __init__(self, debounce=DEBOUNCE_S, max_delay=MAX_BATCH_DELAY_S):
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.paths = set()
+        self.rescan = False               # 이벤트 유실(큐 넘침 등) -> 다음 묶음은 폴더 전체를 다시 훑음
+        self._first = None
+        self._last = None
+
+    def add(self, paths, now):
+        self.paths.update(paths)
+        self._last = now
+        if self._first is None:
+            self._first = now
+
+    def request_rescan(self, now):
+        self.rescan = True
+        self.add((), now)
+
+    def timeout(self, now):
+        # 다음 묶음까지 남은 초 (모인 게 없으면 None)
+        if self._first is None:
+            return None
+        return max(0.0, min(self._last + self.debounce, self._first + self.max_delay) - now)
+
+    def take(self):
+        paths, rescan = self.paths, self.rescan
+        self.paths, self.rescan = set(), False
+        self._first = self._last = None
+        return paths, rescan
+
+
+class Inotify:
+    # ctypes로 쓰는 inotify (Linux). 하위 폴더마다 watch를 걸고, 새로 생긴 폴더에도 이어서 검
+    def __init__(self):
+        if not sys.platform.startswith('linux'):
+            raise OSError("inotify는 Linux에서만 사용할 수 있습니다")
+        self.libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 실패")
+        self.dirs = {}                    # watch 번호 -> 폴더 경로
+
+    def watch_tree(self, root):
+        # root와 그 아래 폴더 전체에 watch. 그 사이에 이미 생긴 이미지 경로를 돌려줌 (폴더가 통째로 들어온 경우)
+        found = []
+        for folder, subdirs, files in os.walk(root):
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(folder), WATCH_MASK)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch 실패: {folder}")
+            self.dirs[wd] = folder
+            found.extend(os.path.join(folder, name) for name in files if is_image(name))
+        return found
+
+    def read(self, timeout):
+        # (바뀐 경로 목록, 이벤트 유실 여부). timeout초 동안 이벤트가 없으면 빈 목록
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return [], False
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return [], False
+        paths, overflow = [], False
+        offset = 0
+        while offset + _EVENT.size <= len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            name = data[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b'\0')
+            offset += _EVENT.size + length
+            if mask & IN_Q_OVERFLOW:
+                overflow = True
+                continue
+            folder = self.dirs.get(wd)
+            if mask & IN_IGNORED:
+                self.dirs.pop(wd, None)
+                continue
+            if folder is None or not name:
+                continue
+            path = os.path.join(folder, os.fsdecode(name))
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    try:
+                        paths.extend(self.watch_tree(path))
+                    except OSError:
+                        overflow = True
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    # 폴더가 통째로 빠지면 그 안의 파일 이벤트는 오지 않으므로 전체를 다시 비교
+                    overflow = True
+            elif not mask & IN_CREATE:
+                # 새 파일은 쓰기가 끝난(IN_CLOSE_WRITE) 뒤에 처리
+                paths.append(path)
+        return paths, overflow
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class FolderWatcher:
+    # 감시 폴더 하나를 백그라운드 스레드에서 동기화
+    # 시작할 때 폴더를 한 번 훑어 저장된 상태와 비교(재조정)한 뒤, inotify(없으면 주기적 재검사)로 바뀐 경로만 모아
+    # 묶음 단위로 on_changes(FolderChanges)를 호출. on_changes는 감시 스레드에서 불림
+    def __init__(self, snapshot, on_changes, use_inotify=True, poll_interval=POLL_INTERVAL_S,
+                 debounce=DEBOUNCE_S, max_delay=MAX_BATCH_DELAY_S):
+        self.snapshot = snapshot
+        self.root = snapshot.root
+        self.on_changes = on_changes
+        self.use_inotify = use_inotify
+        self.poll_interval = poll_interval
+        self.batcher = ChangeBatcher(debounce, max_delay)
+        self.mode = None                  # 'inotify' | 'poll' (시작 후 정해짐)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='folder-watch', daemon=True)
+        self._thread.start()
+
+    def stop(self, wait=True):
+        self._stop.set()
+        if wait and self._thread is not None:
+            self._thread.join()
+
+    def reconcile(self):
+        # 폴더 전체 한 번 훑기 + 저장된 상태 전체와 비교
+        # 폴더 자체가 없으면(분리된 드라이브 등) 전부 삭제로 보지 않고 건너뜀
+        if not os.path.isdir(self.root):
+            return FolderChanges(self.root)
+        with perf.span('FolderWatcher.reconcile', 'import'):
+            return self.snapshot.diff(scan_folder(self.root))
+
+    def _emit(self, changes):
+        if changes and not self._stop.is_set():
+            self.on_changes(changes)
+
+    def _flush(self):
+        paths, rescan = self.batcher.take()
+        if rescan:
+            self._emit(self.reconcile())
+        elif paths:
+            self._emit(self.snapshot.diff(stat_paths(paths), paths))
+
+    def _run(self):
+        inotify = None
+        if self.use_inotify:
+            try:
+                inotify = Inotify()
+                inotify.watch_tree(self.root)
+            except OSError:
+                if inotify is not None:
+                    inotify.close()
+                inotify = None
+        self.mode = 'inotify' if inotify is not None else 'poll'
+        try:
+            # watch를 건 뒤에 재조정해야 그 사이의 변경도 놓치지 않음 (겹친 변경은 diff에서 걸러짐)
+            self._emit(self.reconcile())
+            next_poll = time.monotonic() + self.poll_interval
+            while not self._stop.is_set():
+                now = time.monotonic()
+                wait = self.batcher.timeout(now)
+                wait = WAKE_S if wait is None else min(wait, WAKE_S)
+                if inotify is not None:
+                    paths, overflow = inotify.read(wait)
+                    now = time.monotonic()
+                    if overflow:
+                        self.batcher.request_rescan(now)
+                    if paths:
+                        self.batcher.add(paths, now)
+                else:
+                    self._stop.wait(min(wait, max(0.0, next_poll - now)))
+                    now = time.monotonic()
+                    if now >= next_poll:
+                        # 폴링은 훑기 자체가 묶음이므로 바로 비교
+                        self.batcher.take()
+                        self._emit(self.reconcile())
+                        next_poll = time.monotonic() + self.poll_interval
+                        continue
+                if self.batcher.timeout(now) == 0.0:
+                    self._flush()
+        finally:
+            if inotify is not None:
+                inotify.close()
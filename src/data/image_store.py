@@ -0,0 +1,100 @@
+import os
+import shutil
+import sys
+
+import numpy as np
+
+if sys.platform.startswith('linux'):
+    import fcntl
+
+from src.utils.paths import app_data_dir
+
+NEAR_DUPLICATE_BITS = 4   # pHash 64비트 중 이 개수 이하만 다르면 같은 사진(재압축/크기 변경/약한 보정)으로 봄
+INITIAL_HASHES = 1024
+FICLONE = 0x40049409      # Linux ioctl: 블록을 공유하는 복사(reflink, btrfs/XFS 등). 한쪽을 고치면 그 블록만 갈라짐
+# 바이트별 1비트 개수 표 (np.bitwise_count는 NumPy 2.0 이상에만 있음)
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def copy_file(source, target):
+    # 원본과 독립된 복사본을 만듦. Linux에서 파일시스템이 reflink를 지원하면 디스크를 더 쓰지 않고, 아니면 보통 복사
+    if sys.platform.startswith('linux'):
+        try:
+            with open(source, 'rb') as src, open(target, 'wb') as dst:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            return
+        except OSError:
+            pass
+    shutil.copyfile(source, target)
+
+
+class ImageStore:
+    # 내용 해시 -> 이미지 원본(blob). <dir>/<해시 앞 2자리>/<해시><확장자>
+    # 옷장 항목은 원래 경로 대신 이 경로를 가리키므로, 원본을 옮기거나 지워도 항목이 깨지지 않고
+    # 같은 파일을 다른 곳에서 다시 넣어도 같은 경로(같은 항목)가 됨
+    def __init__(self, directory=None):
+        self.directory = directory or app_data_dir('images')
+
+    def path_for(self, digest, ext=''):
+        return os.path.join(self.directory, digest[:2], digest + ext)
+
+    def contains(self, path):
+        return os.path.dirname(os.path.dirname(os.path.abspath(path))) == os.path.abspath(self.directory)
+
+    def ingest(self, path, digest):
+        # 원본을 저장소로 복사해 저장소 경로를 반환 (이미 있으면 복사하지 않음)
+        # 하드 링크는 쓰지 않음: 원본을 제자리에서 고치면(편집기, 사진 동기화 도구) 해시 이름의 blob 내용도 바뀜
+        if self.contains(path):
+            return path
+        target = self.path_for(digest, os.path.splitext(path)[1].lower())
+        try:
+            # 예전 버전이 하드 링크로 만든 blob(링크 수 2 이상)은 원본과 함께 바뀌었을 수 있으므로 방금 해시한 파일로 교체
+            if os.stat(target).st_nlink == 1:
+                return target
+        except FileNotFoundError:
+            pass
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        temp = f"{target}.{os.getpid()}.tmp"
+        copy_file(path, temp)
+        os.replace(temp, target)
+        return target
+
+
+def hamming_distances(hashes, phash):
+    # uint64 배열의 각 값과 phash 사이의 다른 비트 수
+    diff = (hashes ^ np.uint64(phash)).view(np.uint8).reshape(-1, 8)
+    return _POPCOUNT[diff].sum(axis=1, dtype=np.int64)
+
+
+class NearDuplicateIndex:
+    # 이미 가진 사진들의 pHash(uint64) 배열. 새 사진과의 해밍 거리를 한 번에 계산해 유사 중복을 찾음
+    def __init__(self, phashes=(), max_bits=NEAR_DUPLICATE_BITS):
+        self.max_bits = max_bits
+        self._hashes = np.empty(INITIAL_HASHES, dtype=np.uint64)
+        self._count = 0
+        for phash in phashes:
+            self.add(phash)
+
+    def __len__(self):
+        return self._count
+
+    def add(self, phash):
+        if self._count == len(self._hashes):
+            self._hashes = np.concatenate([self._hashes, np.empty_like(self._hashes)])
+        self._hashes[self._count] = phash
+        self._count += 1
+
+    def find(self, phash):
+        # 가장 가까운 기존 pHash와의 거리가 max_bits 이하면 그 거리, 아니면 None
+        if not self._count:
+            return None
+        nearest = int(hamming_distances(self._hashes[:self._count], phash).min())
+        return nearest if nearest <= self.max_bits else None
+
+
+def phash_to_hex(phash):
+    return f"{phash:016x}" if phash is not None else None
+
+
+def phash_from_hex(text):
+    return int(text, 16) if text else None
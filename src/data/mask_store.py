@@ -0,0 +1,81 @@
+import os
+import threading
+
+from src.ai.segment import MASK_SIZE, decode_mask, encode_mask
+from src.utils.paths import app_data_dir
+
+
+class MaskStore:
+    # 내용 해시 -> 옷 영역 마스크 (긴 변 MASK_SIZE, run-length 부호. 96x96 한 장이 보통 수백 바이트)
+    # <dir>/masks_<size>.rle: 마스크 부호를 이어 붙인 파일 (추가만 함)
+    # <dir>/masks_<size>.keys: 줄마다 '해시 시작 길이 높이 너비'
+    # 일괄 가져오기/추론/추천 작업 스레드가 함께 쓰므로 잠금으로 보호
+    def __init__(self, directory=None, size=MASK_SIZE):
+        self.directory = directory or app_data_dir('masks')
+        self.size = size
+        base = os.path.join(self.directory, f'masks_{size}')
+        self.data_path, self.keys_path = base + '.rle', base + '.keys'
+        self._lock = threading.Lock()
+        self.entries = {}                  # 해시 -> (시작, 길이, (높이, 너비))
+        available = os.path.getsize(self.data_path) if os.path.exists(self.data_path) else 0
+        if os.path.exists(self.keys_path):
+            with open(self.keys_path, encoding='ascii') as f:
+                for line in f:
+                    parts = line.split()
+                    if len(parts) != 5:
+                        continue
+                    key, start, length, h, w = parts[0], *map(int, parts[1:])
+                    # 데이터를 키보다 먼저 쓰므로, 데이터가 다 없는 키(중간에 종료된 기록)는 버림
+                    if start + length <= available:
+                        self.entries[key] = (start, length, (h, w))
+        self._file = open(self.data_path, 'a+b')
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key):
+        # (높이, 너비) bool 마스크 또는 None
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None or self._file is None:
+                return None
+            start, length, shape = entry
+            self._file.seek(start)
+            blob = self._file.read(length)
+        return decode_mask(blob, shape)
+
+    def put(self, key, mask):
+        blob = encode_mask(mask)
+        with self._lock:
+            if key in self.entries or self._file is None:
+                return
+            self._file.seek(0, os.SEEK_END)
+            start = self._file.tell()
+            self._file.write(blob)
+            self._file.flush()
+            with open(self.keys_path, 'a', encoding='ascii') as f:
+                f.write(f"{key} {start} {len(blob)} {mask.shape[0]} {mask.shape[1]}\n")
+            self.entries[key] = (start, len(blob), mask.shape)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+_default_store = None
+_default_lock = threading.Lock()
+
+
+def default_mask_store():
+    # 같은 파일에 여러 객체가 이어 쓰면 위치가 엇갈리므로 프로세스당 하나만 사용
+    global _default_store
+    if _default_store is None:
+        with _default_lock:
+            if _default_store is None:
+                _default_store = MaskStore()
+    return _default_store
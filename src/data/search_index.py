@@ -0,0 +1,342 @@
+import os
+import re
+import unicodedata
+from collections import OrderedDict
+from itertools import chain, islice
+
+import numpy as np
+
+from src.ai.color import COLOR_NAMES, NAMED_LAB
+from src.data.categories import CATEGORIES
+
+INITIAL_ROWS = 1024
+CACHE_QUERIES = 64       # 최근 검색어(단어) -> 일치하는 용어 id 캐시
+MANY_TERMS = 64          # 일치 용어가 이보다 많으면(파일명 숫자 등) 용어별 배열 대신 행을 한 번에 모음
+COLOR_MIN_WEIGHT = 0.2   # 옷 면적의 이 비율 이상인 대표색만 색 이름으로 검색됨
+
+# 한글 음절 = 0xAC00 + (초성 * 21 + 중성) * 28 + 종성
+HANGUL_FIRST, HANGUL_LAST = 0xAC00, 0xD7A3
+CHOSEONG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+JUNGSEONG = ['ㅏ', 'ㅐ', 'ㅑ', 'ㅒ', 'ㅓ', 'ㅔ', 'ㅕ', 'ㅖ', 'ㅗ', 'ㅗㅏ', 'ㅗㅐ', 'ㅗㅣ', 'ㅛ', 'ㅜ', 'ㅜㅓ', 'ㅜㅔ',
+             'ㅜㅣ', 'ㅠ', 'ㅡ', 'ㅡㅣ', 'ㅣ']
+JONGSEONG = ['', 'ㄱ', 'ㄲ', 'ㄱㅅ', 'ㄴ', 'ㄴㅈ', 'ㄴㅎ', 'ㄷ', 'ㄹ', 'ㄹㄱ', 'ㄹㅁ', 'ㄹㅂ', 'ㄹㅅ', 'ㄹㅌ', 'ㄹㅍ', 'ㄹㅎ',
+             'ㅁ', 'ㅂ', 'ㅂㅅ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ']
+# 입력 중에 보이는 겹자모(호환 자모)도 낱자로 풀어 음절과 같은 형태로 비교
+COMPOUND_JAMO = {'ㄳ': 'ㄱㅅ', 'ㄵ': 'ㄴㅈ', 'ㄶ': 'ㄴㅎ', 'ㄺ': 'ㄹㄱ', 'ㄻ': 'ㄹㅁ', 'ㄼ': 'ㄹㅂ', 'ㄽ': 'ㄹㅅ', 'ㄾ': 'ㄹㅌ',
+                 'ㄿ': 'ㄹㅍ', 'ㅀ': 'ㄹㅎ', 'ㅄ': 'ㅂㅅ', 'ㅘ': 'ㅗㅏ', 'ㅙ': 'ㅗㅐ', 'ㅚ': 'ㅗㅣ', 'ㅝ': 'ㅜㅓ', 'ㅞ': 'ㅜㅔ',
+                 'ㅟ': 'ㅜㅣ', 'ㅢ': 'ㅡㅣ'}
+CONSONANTS = set(CHOSEONG)
+WORD_SPLIT = re.compile(r'[\s_\-.,/()\[\]]+')
+
+# 항목별 용어 필드 번호 (카테고리/태그, 색 이름, 파일명 단어)
+FIELD_TAGS, FIELD_COLOR, FIELD_FILE = range(3)
+
+
+def to_jamo(text):
+    # 소문자 + 한글 음절을 초/중/종성 낱자로: '셔츠' -> 'ㅅㅕㅊㅡ'. 입력 도중의 '셫'(ㅅㅕㅊ)도 부분 문자열로 일치
+    if text.isascii():
+        return text.lower()
+    out = []
+    for ch in unicodedata.normalize('NFC', text.lower()):
+        code = ord(ch)
+        if HANGUL_FIRST <= code <= HANGUL_LAST:
+            code -= HANGUL_FIRST
+            out.append(CHOSEONG[code // 588] + JUNGSEONG[(code % 588) // 28] + JONGSEONG[code % 28])
+        else:
+            out.append(COMPOUND_JAMO.get(ch, ch))
+    return ''.join(out)
+
+
+def to_choseong(text):
+    # 초성만: '셔츠' -> 'ㅅㅊ' (초성 검색용). 한글이 아닌 글자는 그대로
+    out = []
+    for ch in unicodedata.normalize('NFC', text.lower()):
+        code = ord(ch)
+        out.append(CHOSEONG[(code - HANGUL_FIRST) // 588] if HANGUL_FIRST <= code <= HANGUL_LAST else ch)
+    return ''.join(out)
+
+
+def split_words(text):
+    return [word for word in WORD_SPLIT.split(text.strip()) if word]
+
+
+def text_matches(query, text):
+    # 색인 없이 문자열 하나에 질의가 맞는지 (사이드바 카테고리 이름처럼 옷이 없는 항목용)
+    jamo, choseong = to_jamo(text), to_choseong(text)
+    for word in split_words(query.lower()):
+        if to_jamo(word) in jamo:
+            continue
+        if len(word) > 1 and all(ch in CONSONANTS for ch in word) and word in choseong:
+            continue
+        return False
+    return True
+
+
+def color_terms(updates, min_weight=COLOR_MIN_WEIGHT):
+    # [(Lab 대표색 (K, 3), 비중 (K,))] -> 항목별 색 이름 목록. 이름 찾기는 전체를 한 번에 벡터 연산
+    if not updates:
+        return []
+    labs = np.concatenate([np.asarray(colors, dtype=np.float32).reshape(-1, 3) for colors, _ in updates])
+    nearest = np.argmin(((labs[:, None, :] - NAMED_LAB[None]) ** 2).sum(axis=2), axis=1)
+    result, start = [], 0
+    for colors, weights in updates:
+        end = start + len(weights)
+        result.append([COLOR_NAMES[n] for n, w in zip(nearest[start:end], weights) if w >= min_weight])
+        start = end
+    return result
+
+
+def file_words(path):
+    # 파일명(확장자 제외)을 단어로: 'IMG_2041 blue shirt.jpg' -> IMG, 2041, blue, shirt
+    return split_words(os.path.splitext(os.path.basename(path))[0])
+
+
+def _grams(text):
+    # 용어 색인용 한 글자 + 연속 두 글자 (한 글자 질의는 1-gram, 그 이상은 2-gram 교집합으로 후보 용어를 좁힘)
+    return set(text) | {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+class ClosetSearchIndex:
+    # 옷장 검색: 용어(카테고리/하위 항목/태그/색 이름/파일명 단어) -> 항목 역색인
+    # 용어는 자모 문자열과 초성 문자열로 각각 1~2-gram 색인 -> 질의 단어를 부분 문자열로 가진 용어를 찾고
+    # 그 용어들의 항목을 NumPy 마스크로 합침 (단어가 여러 개면 AND)
+    # 지운 행은 id를 -1로 표시해 두고 다음에 색인하는 항목이 재사용 (태그를 고칠 때마다 행이 늘지 않음)
+    # 추가한 항목의 역색인/새 용어의 n-gram 색인은 미뤄 두었다가 index_pending(유휴 시간) 또는 첫 질의에서 채움
+    # (옷장을 불러올 때 항목마다 드는 파이썬 비용을 불러오기 경로에서 뺌)
+    def __init__(self):
+        self.term_id = {}            # 용어 -> id
+        self.term_jamo = []          # id -> 자모 문자열
+        self.term_choseong = []      # id -> 초성 문자열
+        self.postings = []           # id -> 항목 행 집합
+        self._posting_arrays = {}    # id -> 행 배열 (질의 때 만들고 항목이 바뀌면 버림)
+        self.jamo_grams = {}         # n-gram -> 용어 id 집합
+        self.choseong_grams = {}
+        self.ids = np.full(INITIAL_ROWS, -1, dtype=np.int64)     # 행 -> item_id (지운 행은 -1)
+        self.labels = np.full(INITIAL_ROWS, -1, dtype=np.int32)  # 행 -> (카테고리, 하위 항목) 번호
+        self.label_names = [(cat, sub) for cat, subs in CATEGORIES.items() for sub in subs]
+        self._label_of = {label: i for i, label in enumerate(self.label_names)}
+        self.row_of = {}             # item_id -> 행
+        self._free_rows = []         # 지운 항목이 비운 행 (재사용)
+        self.size = 0
+        # item_id -> 필드별 용어 id 튜플. 튜플만 써서 GC가 추적하는 객체 수를 늘리지 않음 (5만 개면 전체 수집이 눈에 띄게 느려짐)
+        self._item_terms = {}
+        self._pending_items = {}     # item_id -> [ClosetItem, (Lab, 비중) 또는 None, 경로] 아직 색인에 넣지 않은 항목
+        self._pending = []           # 아직 n-gram 색인에 넣지 않은 용어 id
+        self._word_cache = OrderedDict()
+
+    def __len__(self):
+        return len(self.row_of) + len(self._pending_items)
+
+    def _term(self, text):
+        term_id = self.term_id.get(text)
+        if term_id is not None:
+            return term_id
+        term = text.lower()
+        term_id = self.term_id.get(term)
+        if term_id is None:
+            term_id = len(self.term_jamo)
+            self.term_id[term] = term_id
+            self.term_jamo.append(to_jamo(term))
+            self.term_choseong.append(term if term.isascii() else to_choseong(term))
+            self.postings.append(set())
+            self._pending.append(term_id)
+        self.term_id[text] = term_id
+        return term_id
+
+    @property
+    def has_pending(self):
+        return bool(self._pending_items or self._pending)
+
+    def index_pending(self, limit=None):
+        # 미뤄 둔 항목/용어를 limit개씩 색인. 남은 게 있으면 True
+        if self._pending_items:
+            self._index_items(limit)
+        if self._pending:
+            self._index_terms(limit)
+        return self.has_pending
+
+    def _index_items(self, limit):
+        if limit is None or limit >= len(self._pending_items):
+            batch, self._pending_items = self._pending_items, {}
+        else:
+            batch = {item_id: self._pending_items.pop(item_id)
+                     for item_id in list(islice(self._pending_items, limit))}
+        # 비어 있는 행부터 채우고 모자라면 끝에 붙임
+        reused = min(len(batch), len(self._free_rows))
+        rows = self._free_rows[len(self._free_rows) - reused:]
+        del self._free_rows[len(self._free_rows) - reused:]
+        start = self.size
+        self.size += len(batch) - reused
+        rows.extend(range(start, self.size))
+        if self.size > len(self.ids):
+            grow = max(self.size, 2 * len(self.ids)) - len(self.ids)
+            self.ids = np.concatenate([self.ids, np.full(grow, -1, dtype=np.int64)])
+            self.labels = np.concatenate([self.labels, np.full(grow, -1, dtype=np.int32)])
+        self.ids[rows] = list(batch)
+        self.labels[rows] = [self._label(item.main_cat, item.sub_item) if item.main_cat is not None else -1
+                             for item, _, _ in batch.values()]
+        colored = [value for _, value, _ in batch.values() if value]
+        names = iter(color_terms(colored))
+        for row, (item_id, (item, colors, path)) in zip(rows, batch.items()):
+            self.row_of[item_id] = row
+            categories = [name for name in (item.main_cat, item.sub_item) if name]
+            tags = [word for key, value in item.tags.items() for word in (key, value)
+                    if word and word not in categories]
+            self._item_terms[item_id] = (self._link(categories + tags, row),
+                                         self._link(next(names) if colors else (), row),
+                                         self._link(file_words(path) if path else (), row))
+
+    def _index_terms(self, limit):
+        count = len(self._pending) if limit is None else limit
+        batch, self._pending = self._pending[:count], self._pending[count:]
+        jamo_grams, choseong_grams = self.jamo_grams, self.choseong_grams
+        for term_id in batch:
+            jamo = self.term_jamo[term_id]
+            for gram in _grams(jamo):
+                ids = jamo_grams.get(gram)
+                if ids is None:
+                    jamo_grams[gram] = {term_id}
+                else:
+                    ids.add(term_id)
+            # 한글이 없는 용어(영문 파일명 등)는 초성 질의에 걸릴 일이 없으므로 초성 색인 생략
+            choseong = self.term_choseong[term_id]
+            if choseong != jamo:
+                for gram in _grams(choseong):
+                    choseong_grams.setdefault(gram, set()).add(term_id)
+        self._word_cache.clear()
+
+    def _label(self, main_cat, sub_item):
+        label = (main_cat, sub_item)
+        index = self._label_of.get(label)
+        if index is None:
+            index = self._label_of[label] = len(self.label_names)
+            self.label_names.append(label)
+        return index
+
+    def add(self, item, colors=None, file_path=None):
+        # item: ClosetItem, colors: (Lab 대표색, 비중) 또는 None. 같은 id가 있으면 교체
+        self.remove(item.item_id)
+        self._pending_items[item.item_id] = [item, colors, file_path]
+
+    def remove(self, item_id):
+        if self._pending_items.pop(item_id, None) is not None:
+            return
+        row = self.row_of.pop(item_id, None)
+        if row is None:
+            return
+        for term_ids in self._item_terms.pop(item_id, ()):
+            self._unlink(term_ids, row)
+        self.ids[row] = -1
+        self.labels[row] = -1
+        self._free_rows.append(row)
+
+    def _unlink(self, term_ids, row):
+        for term_id in term_ids:
+            self.postings[term_id].discard(row)
+            self._posting_arrays.pop(term_id, None)
+
+    def _set_field(self, item_id, field, value, to_words):
+        # 항목의 한 필드를 교체 (색 분석 결과/원래 파일명이 나중에 도착하는 경우). 아직 색인 전이면 값만 바꿔 둠
+        pending = self._pending_items.get(item_id)
+        if pending is not None:
+            pending[field] = value
+            return
+        row = self.row_of.get(item_id)
+        if row is None:
+            return
+        fields = list(self._item_terms[item_id])
+        self._unlink(fields[field], row)
+        fields[field] = self._link(to_words(value), row)
+        self._item_terms[item_id] = tuple(fields)
+
+    def _link(self, words, row):
+        if not words:
+            return ()
+        term_ids = tuple(self._term(word) for word in dict.fromkeys(words) if word)
+        postings, arrays = self.postings, self._posting_arrays
+        for term_id in term_ids:
+            postings[term_id].add(row)
+            if term_id in arrays:
+                del arrays[term_id]
+        return term_ids
+
+    def set_colors(self, item_id, colors, weights):
+        self._set_field(item_id, FIELD_COLOR, (colors, weights), lambda value: color_terms([value])[0])
+
+    def set_file(self, item_id, path):
+        self._set_field(item_id, FIELD_FILE, path, file_words)
+
+    def _matching_terms(self, word):
+        # 자모 부분 문자열 일치 + (자음만 입력했으면) 초성 부분 문자열 일치인 용어 id 집합
+        cached = self._word_cache.get(word)
+        if cached is not None:
+            self._word_cache.move_to_end(word)
+            return cached
+        jamo = to_jamo(word)
+        matched = self._lookup(jamo, self.jamo_grams, self.term_jamo)
+        if len(word) > 1 and all(ch in CONSONANTS for ch in word):
+            matched = matched | self._lookup(word, self.choseong_grams, self.term_choseong)
+        self._word_cache[word] = matched
+        if len(self._word_cache) > CACHE_QUERIES:
+            self._word_cache.popitem(last=False)
+        return matched
+
+    def _lookup(self, text, grams, strings):
+        # 두 글자 이상이면 2-gram만 (1-gram은 2-gram에 이미 포함됨)
+        query_grams = {text[i:i + 2] for i in range(len(text) - 1)} or {text}
+        candidates = None
+        for gram in sorted(query_grams, key=lambda g: len(grams.get(g, ()))):
+            ids = grams.get(gram)
+            if not ids:
+                return frozenset()
+            candidates = set(ids) if candidates is None else candidates & ids
+            if len(candidates) <= 1:
+                break
+        if candidates is None:
+            return frozenset()
+        # 2-gram 교집합은 순서를 보장하지 않으므로 실제 부분 문자열인지 확인
+        return frozenset(t for t in candidates if text in strings[t])
+
+    def _rows_of(self, term_id):
+        rows = self._posting_arrays.get(term_id)
+        if rows is None:
+            rows = self._posting_arrays[term_id] = np.fromiter(self.postings[term_id], dtype=np.int64,
+                                                               count=len(self.postings[term_id]))
+        return rows
+
+    def match_mask(self, query):
+        # 질의 -> 행 불리언 마스크 (빈 질의면 None)
+        words = split_words(query)
+        if not words:
+            return None
+        # 미뤄 둔 항목을 먼저 색인해야 마스크 크기(self.size)가 확정됨
+        if self.has_pending:
+            self.index_pending()
+        mask = None
+        for word in words:
+            word_mask = np.zeros(self.size, dtype=bool)
+            term_ids = self._matching_terms(word.lower())
+            if len(term_ids) > MANY_TERMS:
+                postings = self.postings
+                word_mask[np.fromiter(chain.from_iterable(postings[t] for t in term_ids), dtype=np.int64)] = True
+            elif term_ids:
+                word_mask[np.concatenate([self._rows_of(t) for t in term_ids])] = True
+            mask = word_mask if mask is None else mask & word_mask
+            if not mask.any():
+                break
+        return mask
+
+    def search(self, query):
+        # 질의에 맞는 item_id 배열 (빈 질의면 None)
+        mask = self.match_mask(query)
+        return None if mask is None else self.ids_of(mask)
+
+    def ids_of(self, mask):
+        ids = self.ids[:self.size][mask]
+        return ids[ids >= 0]
+
+    def label_counts(self, mask):
+        # {(카테고리, 하위 항목): 일치 항목 수} (사이드바 트리 필터용)
+        labels = self.labels[:self.size][mask]
+        counts = np.bincount(labels[labels >= 0], minlength=len(self.label_names))
+        return {self.label_names[i]: int(c) for i, c in enumerate(counts) if c}
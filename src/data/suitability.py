@@ -0,0 +1,130 @@
+import numpy as np
+
+from src.data.categories import CATEGORIES, TEMP_RANGE, WEATHER_BLOCKED, WEATHERS
+
+INITIAL_CAPACITY = 1024
+TEMP_MARGIN = 3           # 적정 기온 범위를 벗어나도 이만큼(°C)은 감점만 하고 허용
+NO_CATEGORY = len(CATEGORIES)   # 카테고리 열에서 메인 카테고리가 없는 옷
+
+# 하위 항목 속성표를 배열로 (마지막 행 = 표에 없는 항목용 중립값)
+SUB_ITEMS = [sub for subs in CATEGORIES.values() for sub in subs]
+SUB_INDEX = {sub: i for i, sub in enumerate(SUB_ITEMS)}
+NEUTRAL_SUB = len(SUB_ITEMS)
+TEMP_LOW = np.array([TEMP_RANGE.get(sub, (-50, 50))[0] for sub in SUB_ITEMS] + [-50], dtype=np.float32)
+TEMP_HIGH = np.array([TEMP_RANGE.get(sub, (-50, 50))[1] for sub in SUB_ITEMS] + [50], dtype=np.float32)
+# 날씨별로 입을 수 있는 하위 항목을 비트 하나씩 (비트 i = WEATHERS[i])
+WEATHER_BITS = np.array([sum(1 << i for i, weather in enumerate(WEATHERS)
+                             if sub not in WEATHER_BLOCKED.get(weather, ()))
+                         for sub in SUB_ITEMS] + [(1 << len(WEATHERS)) - 1], dtype=np.uint8)
+
+_CATEGORY_INDEX = {cat: i for i, cat in enumerate(CATEGORIES)}
+
+
+def temperature_fit(low, high, temperature):
+    # (기온 적합도, 허용 여부): 적정 범위 안이면 1, 벗어난 만큼 깎이고 TEMP_MARGIN을 넘으면 제외
+    t = float(temperature)
+    distance = np.maximum(np.maximum(low - t, t - high), 0.0)
+    return 1.0 - distance / (TEMP_MARGIN + 1.0), distance <= TEMP_MARGIN
+
+
+def weather_bit(weather):
+    # 모르는 날씨면 0 (날씨로는 거르지 않음)
+    return 1 << WEATHERS.index(weather) if weather in WEATHERS else 0
+
+
+def sub_item_suitability(temperature, weather):
+    # 하위 항목 단위 (적합도, 착용 가능) - 항목 수만큼만 계산하고 옷마다는 하위 항목 번호로 인덱싱
+    fit, keep = temperature_fit(TEMP_LOW, TEMP_HIGH, temperature)
+    bit = weather_bit(weather)
+    if bit:
+        keep &= (WEATHER_BITS & bit) != 0
+    return fit, keep
+
+
+class SuitabilityIndex:
+    # 옷장 전체의 적정 기온 범위 / 날씨 비트 / 메인 카테고리를 열(배열)로 보관
+    # 기온·날씨 선택은 옷 수만큼의 벡터 비교 한 번 -> 슬라이더를 끄는 동안에도 매번 다시 셀 수 있음
+    def __init__(self, capacity=INITIAL_CAPACITY):
+        self.low = np.zeros(capacity, dtype=np.float32)
+        self.high = np.zeros(capacity, dtype=np.float32)
+        self.weather = np.zeros(capacity, dtype=np.uint8)
+        self.category = np.full(capacity, NO_CATEGORY, dtype=np.int8)
+        self.ids = np.full(capacity, -1, dtype=np.int64)   # 행 -> item_id
+        self.row_of = {}                                    # item_id -> 행
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, item_id):
+        return item_id in self.row_of
+
+    def _reserve(self, count):
+        if self.size + count <= len(self.ids):
+            return
+        capacity = len(self.ids)
+        while capacity < self.size + count:
+            capacity *= 2
+        for name, fill in (('low', 0), ('high', 0), ('weather', 0), ('category', NO_CATEGORY), ('ids', -1)):
+            old = getattr(self, name)
+            new = np.full(capacity, fill, dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+
+    def add_many(self, items):
+        # items: ClosetItem 목록. 이미 있는 id는 제자리 갱신, 새 id는 끝에 이어 붙임
+        rows = []
+        for item in items:
+            row = self.row_of.get(item.item_id)
+            if row is None:
+                self._reserve(1)
+                row = self.size
+                self.size += 1
+                self.row_of[item.item_id] = row
+                self.ids[row] = item.item_id
+            rows.append(row)
+        if not rows:
+            return
+        rows = np.array(rows, dtype=np.int64)
+        subs = np.array([SUB_INDEX.get(item.sub_item, NEUTRAL_SUB) for item in items], dtype=np.int64)
+        self.low[rows] = TEMP_LOW[subs]
+        self.high[rows] = TEMP_HIGH[subs]
+        self.weather[rows] = WEATHER_BITS[subs]
+        self.category[rows] = [_CATEGORY_INDEX.get(item.main_cat, NO_CATEGORY) for item in items]
+
+    def add(self, item):
+        self.add_many([item])
+
+    def remove(self, item_id):
+        # 마지막 행을 빈자리로 옮겨 배열을 조밀하게 유지
+        row = self.row_of.pop(item_id, None)
+        if row is None:
+            return
+        last = self.size - 1
+        if row != last:
+            moved = int(self.ids[last])
+            for column in (self.low, self.high, self.weather, self.category, self.ids):
+                column[row] = column[last]
+            self.row_of[moved] = row
+        self.ids[last] = -1
+        self.size = last
+
+    def scores(self, temperature, weather):
+        # (기온 적합도 0~1, 착용 가능 마스크) - 행 순서
+        n = self.size
+        fit, keep = temperature_fit(self.low[:n], self.high[:n], temperature)
+        bit = weather_bit(weather)
+        if bit:
+            keep &= (self.weather[:n] & bit) != 0
+        return fit, keep
+
+    def mask(self, temperature, weather):
+        return self.scores(temperature, weather)[1]
+
+    def ids_of(self, mask):
+        return self.ids[:self.size][mask]
+
+    def category_counts(self, mask):
+        # {메인 카테고리: 착용 가능한 옷 수} (CATEGORIES 순서)
+        counts = np.bincount(self.category[:self.size][mask], minlength=NO_CATEGORY + 1)
+        return {cat: int(counts[i]) for i, cat in enumerate(CATEGORIES)}
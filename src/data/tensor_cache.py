@@ -0,0 +1,130 @@
+import os
+import threading
+
+import numpy as np
+
+from src.ai.preprocess import INPUT_SIZE
+from src.utils.paths import app_data_dir
+
+DEFAULT_MAX_MB = 512     # 캐시 파일 최대 크기 (224x224x3 uint8 = 147KB/장 -> 약 3500장)
+KEY_BYTES = 32           # 내용 해시(blake2b-128) 16진 문자열 길이
+
+
+class TensorCache:
+    # 내용 해시 -> 전처리(리사이즈/가운데 자르기)까지 끝난 size x size RGB uint8
+    # <dir>/tensors_<size>.u8: (슬롯, size, size, 3) 배열을 memmap으로 (쓴 슬롯만 디스크를 차지하는 sparse 파일)
+    # <dir>/tensors_<size>.keys: 슬롯별 키, <dir>/tensors_<size>.tick: 슬롯별 마지막 사용 시점
+    # 슬롯이 다 차면 가장 오래 쓰지 않은 슬롯을 덮어씀. 정규화 전 uint8로 두어 float32보다 4배 작음
+    def __init__(self, directory=None, size=INPUT_SIZE, max_mb=DEFAULT_MAX_MB):
+        self.directory = directory or app_data_dir('tensors')
+        self.size = size
+        self.slot_bytes = size * size * 3
+        self.capacity = max(1, max_mb * 1024 * 1024 // self.slot_bytes)
+        base = os.path.join(self.directory, f'tensors_{size}')
+        self.data_path, self.keys_path, self.ticks_path = base + '.u8', base + '.keys', base + '.tick'
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._open()
+
+    def _open(self):
+        # 용량 설정이 바뀌었으면 (파일 크기가 다르면) 캐시를 비우고 새로 만듦
+        if os.path.exists(self.keys_path) and os.path.getsize(self.keys_path) != self.capacity * KEY_BYTES:
+            for path in (self.data_path, self.keys_path, self.ticks_path):
+                if os.path.exists(path):
+                    os.remove(path)
+        self.data = self._map(self.data_path, np.uint8, (self.capacity, self.size, self.size, 3))
+        self.keys = self._map(self.keys_path, f'S{KEY_BYTES}', (self.capacity,))
+        self.ticks = self._map(self.ticks_path, np.int64, (self.capacity,))
+        self.slot_of = {key.decode('ascii'): slot for slot, key in enumerate(self.keys) if key}
+        self._free = [slot for slot in range(self.capacity - 1, -1, -1) if not self.keys[slot]]
+        self._tick = int(self.ticks.max()) + 1 if len(self.slot_of) else 1
+
+    def _map(self, path, dtype, shape):
+        size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        with open(path, 'a+b') as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() < size:
+                f.truncate(size)
+        return np.memmap(path, dtype=dtype, mode='r+', shape=shape)
+
+    def __len__(self):
+        return len(self.slot_of)
+
+    def __contains__(self, key):
+        return key in self.slot_of
+
+    def _touch(self, slot):
+        self.ticks[slot] = self._tick
+        self._tick += 1
+
+    def get(self, key):
+        # 캐시에 있으면 (size, size, 3) uint8 복사본, 없으면 None
+        with self._lock:
+            slot = self.slot_of.get(key)
+            if slot is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._touch(slot)
+            return np.array(self.data[slot])
+
+    def put(self, key, rgb):
+        if rgb.shape != (self.size, self.size, 3) or len(key) > KEY_BYTES:
+            return
+        with self._lock:
+            slot = self.slot_of.get(key)
+            if slot is None:
+                if self._free:
+                    slot = self._free.pop()
+                else:
+                    slot = int(self.ticks.argmin())
+                    del self.slot_of[self.keys[slot].decode('ascii')]
+                    self.evictions += 1
+                # 데이터를 먼저 쓰고 키를 기록 (키가 있는 슬롯은 항상 완성된 데이터)
+                self.data[slot] = rgb
+                self.keys[slot] = key.encode('ascii')
+                self.slot_of[key] = slot
+            self._touch(slot)
+
+    def discard(self, key):
+        with self._lock:
+            slot = self.slot_of.pop(key, None)
+            if slot is not None:
+                self.keys[slot] = b''
+                self.ticks[slot] = 0
+                self._free.append(slot)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self.slot_of),
+                'capacity': self.capacity,
+                'bytes': len(self.slot_of) * self.slot_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+    def flush(self):
+        with self._lock:
+            for array in (self.data, self.keys, self.ticks):
+                array.flush()
+
+    def close(self):
+        self.flush()
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def default_tensor_cache():
+    # 같은 파일을 여러 객체가 열면 슬롯 배정이 엇갈리므로 프로세스당 하나만 사용
+    global _default_cache
+    if _default_cache is None:
+        with _default_lock:
+            if _default_cache is None:
+                _default_cache = TensorCache()
+    return _default_cache
@@ -0,0 +1,176 @@
+from PySide6.QtCore import Qt, QRectF, QTimer
+from PySide6.QtGui import QColor, QPainter, QPixmap
+from PySide6.QtWidgets import (
+    QAbstractItemView, QGridLayout, QGroupBox, QHeaderView, QLabel, QSizePolicy, QTableWidget, QTableWidgetItem,
+    QVBoxLayout, QWidget
+)
+
+from src.ai.color import NAMED_COLORS
+from src.data.categories import CATEGORIES, WEATHERS
+from src.data.closet_stats import TEMP_BANDS, band_required
+from src.utils import perf
+
+REFRESH_MS = 500          # 탭이 보이는 동안 집계 버전을 확인하는 간격 (바뀐 차트만 다시 그림)
+BAR_HEIGHT = 18           # 막대 한 줄 높이(px)
+LABEL_WIDTH = 90          # 막대 왼쪽 이름 칸 너비(px)
+VALUE_WIDTH = 64          # 막대 오른쪽 값 칸 너비(px)
+SUB_ITEM_BARS = 12        # 하위 항목 차트에 보여 줄 항목 수 (많은 순)
+
+
+class BarChart(QWidget):
+    # 가로 막대 차트. 그린 결과를 QPixmap에 캐시하고, 값/크기/테마가 바뀔 때만 다시 그림
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows = []                    # [(이름, 값, 막대 색 또는 None)]
+        self.value_format = '{:.0f}'
+        self.text_color = QColor('#E0E0E0')
+        self.bar_color = QColor('#6C63FF')
+        self._pixmap = None
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+
+    def set_rows(self, rows, value_format='{:.0f}'):
+        self.rows = rows
+        self.value_format = value_format
+        self.setFixedHeight(max(1, len(rows)) * BAR_HEIGHT + 4)
+        self._invalidate()
+
+    def set_colors(self, text_color, bar_color):
+        self.text_color, self.bar_color = QColor(text_color), QColor(bar_color)
+        self._invalidate()
+
+    def _invalidate(self):
+        self._pixmap = None
+        self.update()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._pixmap = None
+
+    def paintEvent(self, event):
+        if self._pixmap is None or self._pixmap.size() != self.size() * self.devicePixelRatioF():
+            self._pixmap = self._render()
+        QPainter(self).drawPixmap(0, 0, self._pixmap)
+
+    @perf.traced('BarChart.render', 'ui')
+    def _render(self):
+        ratio = self.devicePixelRatioF()
+        pixmap = QPixmap(self.size() * ratio)
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        peak = max((value for _, value, _ in self.rows), default=0) or 1
+        width = max(1, self.width() - LABEL_WIDTH - VALUE_WIDTH)
+        for i, (label, value, color) in enumerate(self.rows):
+            top = i * BAR_HEIGHT + 2
+            painter.setPen(self.text_color)
+            painter.drawText(QRectF(0, top, LABEL_WIDTH - 6, BAR_HEIGHT), Qt.AlignRight | Qt.AlignVCenter, label)
+            painter.drawText(QRectF(LABEL_WIDTH + width + 6, top, VALUE_WIDTH - 6, BAR_HEIGHT),
+                             Qt.AlignLeft | Qt.AlignVCenter, self.value_format.format(value))
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(color) if color else self.bar_color)
+            painter.drawRoundedRect(QRectF(LABEL_WIDTH, top + 3, width * value / peak, BAR_HEIGHT - 6), 3, 3)
+        painter.end()
+        return pixmap
+
+
+class AnalysisPage(QWidget):
+    # 스타일 분석 탭: ClosetStats 집계를 차트/표로. 옷장을 훑지 않고 집계만 읽으며, 집계 버전이 바뀐 부분만 다시 그림
+    def __init__(self, stats, theme, parent=None):
+        super().__init__(parent)
+        self.stats = stats
+        self._drawn = {}                  # 화면에 반영한 집계 버전
+        layout = QVBoxLayout(self)
+        self.summary_label = QLabel()
+        layout.addWidget(self.summary_label)
+
+        grid = QGridLayout()
+        self.category_chart = BarChart()
+        self.sub_item_chart = BarChart()
+        self.color_chart = BarChart()
+        self.style_chart = BarChart()
+        for i, (title, chart) in enumerate((('카테고리', self.category_chart),
+                                           (f'많은 하위 항목 {SUB_ITEM_BARS}', self.sub_item_chart),
+                                           ('색 분포 (옷 단위 비중)', self.color_chart),
+                                           ('스타일 구성', self.style_chart))):
+            box = QGroupBox(title)
+            QVBoxLayout(box).addWidget(chart)
+            grid.addWidget(box, i // 2, i % 2, Qt.AlignTop)
+        layout.addLayout(grid)
+
+        # 기온 구간 x 날씨: 필수 카테고리 중 가장 적은 옷 수 (0이면 그 조건의 코디를 만들 수 없음)
+        coverage_box = QGroupBox('기온·날씨별 입을 수 있는 옷 (필수 카테고리 중 최소)')
+        coverage_layout = QVBoxLayout(coverage_box)
+        self.coverage_table = QTableWidget(len(TEMP_BANDS), len(WEATHERS))
+        self.coverage_table.setHorizontalHeaderLabels(WEATHERS)
+        self.coverage_table.setVerticalHeaderLabels([f"{band} ({t}°C)" for band, t in TEMP_BANDS])
+        self.coverage_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.coverage_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.gap_label = QLabel()
+        self.gap_label.setWordWrap(True)
+        coverage_layout.addWidget(self.coverage_table)
+        coverage_layout.addWidget(self.gap_label)
+        layout.addWidget(coverage_box, 1)
+
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setInterval(REFRESH_MS)
+        self._refresh_timer.timeout.connect(self.refresh)
+        self.set_theme(theme)
+
+    def set_theme(self, theme):
+        for chart in (self.category_chart, self.sub_item_chart, self.color_chart, self.style_chart):
+            chart.set_colors(theme['TEXT_COLOR'], theme['ACCENT_PURPLE'])
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self._refresh_timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._refresh_timer.stop()
+
+    @perf.traced('AnalysisPage.refresh', 'ui')
+    def refresh(self):
+        versions = dict(self.stats.versions)
+        if versions == self._drawn:
+            return
+        if versions['items'] != self._drawn.get('items'):
+            self.refresh_items()
+        if versions['colors'] != self._drawn.get('colors'):
+            self.refresh_colors()
+        self._drawn = versions
+        self.summary_label.setText(f"옷 {len(self.stats)}벌 · 색 분석 {self.stats.colored}벌")
+
+    def refresh_items(self):
+        counts, untagged = self.stats.category_counts()
+        rows = [(cat, count, None) for cat, count in counts.items()]
+        if untagged:
+            rows.append(('미분류', untagged, None))
+        self.category_chart.set_rows(rows)
+        subs = sorted(self.stats.sub_item_counts(), key=lambda row: -row[2])[:SUB_ITEM_BARS]
+        self.sub_item_chart.set_rows([(sub, count, None) for _, sub, count in subs])
+        self.style_chart.set_rows([(style, share * 100, None) for style, share in self.stats.style_mix().items()],
+                                  '{:.0f}%')
+        self.refresh_coverage()
+
+    def refresh_colors(self):
+        rows = [(name, value, '#%02x%02x%02x' % NAMED_COLORS[name])
+                for name, value in self.stats.color_distribution().items() if value > 0]
+        rows.sort(key=lambda row: -row[1])
+        self.color_chart.set_rows(rows, '{:.1f}')
+
+    def refresh_coverage(self):
+        coverage = self.stats.coverage()
+        categories = list(CATEGORIES)
+        for b, (_, temperature) in enumerate(TEMP_BANDS):
+            required = [categories.index(cat) for cat in band_required(temperature)]
+            for w in range(len(WEATHERS)):
+                cell = QTableWidgetItem(str(int(coverage[b, w, required].min())))
+                cell.setTextAlignment(Qt.AlignCenter)
+                cell.setToolTip(' · '.join(f"{categories[c]} {int(coverage[b, w, c])}" for c in range(len(categories))))
+                self.coverage_table.setItem(b, w, cell)
+        gaps = self.stats.gaps(coverage)
+        self.gap_label.setText('부족한 조합: ' + ', '.join(f"{band}/{weather}({'·'.join(missing)})"
+                                                       for band, weather, missing in gaps)
+                               if gaps else '모든 기온·날씨 조합에 코디할 수 있어요.')
@@ -0,0 +1,144 @@
+import os
+
+from PySide6.QtCore import QObject, QThreadPool, Qt, Signal
+from PySide6.QtWidgets import (
+    QAbstractItemView, QComboBox, QDialog, QHBoxLayout, QHeaderView, QLabel, QPushButton, QStyledItemDelegate,
+    QTableWidget, QTableWidgetItem, QVBoxLayout
+)
+
+from src.data.bulk_import import BulkImporter
+from src.data.categories import CATEGORIES, split_tags
+
+
+class BulkImportJob(QObject):
+    # BulkImporter를 스레드 풀에서 실행하고 결과/진행률을 GUI 스레드로 전달
+    results_ready = Signal(list)          # list[ImportResult] (청크 단위)
+    progress = Signal(int, int)           # (처리 수, 발견한 파일 수)
+    finished = Signal(bool)               # 취소 여부
+
+    def __init__(self, paths, tagger=None, known_paths=(), known_hashes=(), image_store=None, known_phashes=(),
+                 mask_store=None, parent=None):
+        super().__init__(parent)
+        self.paths = list(paths)
+        self.importer = BulkImporter(tagger, known_paths, known_hashes, image_store=image_store,
+                                     known_phashes=known_phashes, mask_store=mask_store)
+        self.review_items = []            # 확신도가 낮아 검토가 필요한 결과 누적
+        self.imported = 0
+        self.results_ready.connect(self._collect_review_items)
+
+    def start(self):
+        QThreadPool.globalInstance().start(self._run)
+
+    def cancel(self):
+        self.importer.cancel()
+
+    def _run(self):
+        try:
+            self.importer.run(self.paths, self.results_ready.emit, self.progress.emit)
+        finally:
+            self.finished.emit(self.importer.cancelled.is_set())
+
+    def _collect_review_items(self, results):
+        self.imported += len(results)
+        self.review_items.extend(r for r in results if r.needs_review)
+
+
+class TaggedImportJob(QObject):
+    # 태그 대화상자에서 확정한 파일 하나를 스레드 풀에서 저장소로 가져오고 색을 분석
+    # (해시/pHash/GrabCut/색 추출은 각각 한 프레임 이상 걸릴 수 있어 GUI 스레드에서 하지 않음)
+    finished = Signal(object)             # ImportResult
+
+    def __init__(self, path, tags, embedding=None, image_store=None, mask_store=None, parent=None):
+        super().__init__(parent)
+        self.path, self.tags, self.embedding = path, tags, embedding
+        self.importer = BulkImporter(image_store=image_store, mask_store=mask_store)
+
+    def start(self):
+        QThreadPool.globalInstance().start(self._run)
+
+    def _run(self):
+        self.finished.emit(self.importer.import_tagged(self.path, self.tags, self.embedding))
+
+
+class _TagComboDelegate(QStyledItemDelegate):
+    # 편집할 때만 콤보박스를 만듦 (행마다 위젯을 붙이지 않아 수백 행도 즉시 열림)
+    def __init__(self, options_for, parent=None):
+        super().__init__(parent)
+        self.options_for = options_for   # (row) -> 선택지 목록
+
+    def createEditor(self, parent, option, index):
+        combo = QComboBox(parent)
+        combo.addItems(self.options_for(index.row()))
+        return combo
+
+    def setEditorData(self, editor, index):
+        editor.setCurrentText(index.data())
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.currentText())
+
+
+class ImportReviewDialog(QDialog):
+    # 확신도가 낮은 항목만 한 표에서 카테고리/하위 항목을 고쳐 확정
+    CAT_COL, SUB_COL = 1, 2
+
+    def __init__(self, results, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"태그 검토 ({len(results)}개)")
+        self.resize(640, 480)
+        self.results = results
+        self.setObjectName("ImportReviewDialog")   # 스타일은 메인 창 스타일시트(src/ui/theme.py)에서 적용
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel("자동 태깅 확신도가 낮은 이미지입니다. 태그를 확인해 주세요."))
+
+        self.table = QTableWidget(len(results), 4)
+        self.table.setHorizontalHeaderLabels(["파일", "카테고리", "하위 항목", "확신도"])
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.setSelectionMode(QAbstractItemView.NoSelection)
+        self.table.setEditTriggers(QAbstractItemView.AllEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setItemDelegateForColumn(self.CAT_COL, _TagComboDelegate(lambda row: list(CATEGORIES), self))
+        self.table.setItemDelegateForColumn(self.SUB_COL, _TagComboDelegate(self._sub_items_for_row, self))
+        for row, result in enumerate(results):
+            main_cat, sub_item = split_tags(result.tags)
+            name_item = QTableWidgetItem(os.path.basename(result.display_path))
+            name_item.setToolTip(result.display_path)
+            name_item.setFlags(name_item.flags() & ~Qt.ItemIsEditable)
+            self.table.setItem(row, 0, name_item)
+            self.table.setItem(row, self.CAT_COL, QTableWidgetItem(main_cat))
+            self.table.setItem(row, self.SUB_COL, QTableWidgetItem(sub_item))
+            conf_item = QTableWidgetItem(f"{result.confidence:.0%}")
+            conf_item.setFlags(conf_item.flags() & ~Qt.ItemIsEditable)
+            self.table.setItem(row, 3, conf_item)
+        self.table.itemChanged.connect(self._on_item_changed)
+        layout.addWidget(self.table)
+
+        buttons = QHBoxLayout()
+        buttons.addStretch(1)
+        cancel_btn = QPushButton("그대로 두기")
+        cancel_btn.clicked.connect(self.reject)
+        ok_btn = QPushButton("확정")
+        ok_btn.clicked.connect(self.accept)
+        buttons.addWidget(cancel_btn)
+        buttons.addWidget(ok_btn)
+        layout.addLayout(buttons)
+
+    def _sub_items_for_row(self, row):
+        return CATEGORIES.get(self.table.item(row, self.CAT_COL).text(), [])
+
+    def _on_item_changed(self, item):
+        # 카테고리가 바뀌면 하위 항목을 새 카테고리의 첫 항목으로
+        if item.column() == self.CAT_COL:
+            sub_items = CATEGORIES.get(item.text(), [])
+            sub = self.table.item(item.row(), self.SUB_COL)
+            if sub is not None and sub.text() not in sub_items and sub_items:
+                sub.setText(sub_items[0])
+
+    def corrected_tags(self):
+        # 사용자가 바꾼 항목만 [(경로, {카테고리: 하위항목})]
+        changed = []
+        for row, result in enumerate(self.results):
+            tags = {self.table.item(row, self.CAT_COL).text(): self.table.item(row, self.SUB_COL).text()}
+            if tags != result.tags:
+                changed.append((result.path, tags))
+        return changed
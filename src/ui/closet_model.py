@@ -0,0 +1,294 @@
+import numpy as np
+from PySide6.QtCore import QAbstractListModel, QAbstractProxyModel, QModelIndex, QSortFilterProxyModel, Qt
+from PySide6.QtGui import QColor, QPixmap
+
+from src.ui.pixmap_cache import default_pixmap_cache
+
+# Qt.UserRole은 기존 QListWidgetItem과 같이 메인 카테고리를 돌려줌
+ItemIdRole = Qt.UserRole + 1
+PathRole = Qt.UserRole + 2
+TagsRole = Qt.UserRole + 3
+# 한 번에 지우는 행이 이보다 많은 묶음으로 흩어져 있으면 행 제거 신호 대신 모델 리셋 (프록시/뷰 갱신이 한 번)
+MAX_REMOVE_RUNS = 8
+
+
+class ClosetListModel(QAbstractListModel):
+    def __init__(self, thumbnail_service, pixmap_cache=None, parent=None):
+        super().__init__(parent)
+        self.thumbnails = thumbnail_service
+        self.thumbnails.thumbnail_ready.connect(self._on_thumbnail_ready)
+        self._items = []         # row -> ClosetItem
+        self.item_ids = []       # row -> item_id (프록시 필터가 직접 참조)
+        self._row_of = {}        # item_id -> row
+        self._id_by_path = {}    # 경로 -> item_id
+        # 경로 -> 썸네일 QPixmap. 다른 목록/추천 결과와 함께 쓰는 캐시라 같은 옷은 한 번만 디코딩됨
+        # 화면 밖으로 밀려난 행의 픽스맵부터 제거됨
+        self.icon_cache = pixmap_cache or default_pixmap_cache()
+        self.icon_size = self.thumbnails.icon_size.width()
+        self._failed = set()     # 디코딩 실패 경로 (반복 요청 방지)
+        self._placeholder = QPixmap(self.thumbnails.icon_size)
+        self._placeholder.fill(QColor(128, 128, 128, 60))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._items)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        item = self._items[index.row()]
+        if role == Qt.DecorationRole:
+            # 뷰는 화면에 보이는 행만 그리므로, 여기서 요청하면 뷰포트 안의 썸네일만 디코딩됨
+            pixmap = self.icon_cache.get(item.path, self.icon_size)
+            if pixmap is None:
+                if item.path not in self._failed:
+                    self.thumbnails.request(item.path)
+                return self._placeholder
+            return pixmap
+        if role == Qt.ToolTipRole:
+            return f"{item.path}\n{item.tags}"
+        if role == Qt.UserRole:
+            return item.main_cat
+        if role == ItemIdRole:
+            return item.item_id
+        if role == PathRole:
+            return item.path
+        if role == TagsRole:
+            return item.tags
+        return None
+
+    def has_icon(self, path):
+        return self.icon_cache.contains(path, self.icon_size)
+
+    def item_id_at(self, row):
+        return self.item_ids[row]
+
+    def item_at(self, row):
+        return self._items[row]
+
+    def row_of(self, item_id):
+        return self._row_of.get(item_id)
+
+    def add_items(self, items):
+        if not items:
+            return
+        first = len(self._items)
+        self.beginInsertRows(QModelIndex(), first, first + len(items) - 1)
+        for offset, item in enumerate(items):
+            self._items.append(item)
+            self.item_ids.append(item.item_id)
+            self._row_of[item.item_id] = first + offset
+            self._id_by_path[item.path] = item.item_id
+        self.endInsertRows()
+
+    def set_items(self, items):
+        # 목록 전체 교체 (유사 옷 목록처럼 작은 모델용)
+        self.beginResetModel()
+        self._items = list(items)
+        self.item_ids[:] = [item.item_id for item in self._items]
+        self._row_of = {item.item_id: row for row, item in enumerate(self._items)}
+        self._id_by_path = {item.path: item.item_id for item in self._items}
+        self.endResetModel()
+
+    def remove_item(self, item_id):
+        self.remove_items([item_id])
+
+    def remove_items(self, item_ids):
+        # 여러 행을 한 번에 제거. 이어진 행 묶음마다 뒤에서부터 지우고 row 조회표는 마지막에 한 번만 다시 만듦
+        # 묶음이 많으면(흩어진 행) 행 제거 신호를 여러 번 보내는 대신 모델을 한 번 리셋함
+        rows = sorted({self._row_of[item_id] for item_id in item_ids if item_id in self._row_of})
+        if not rows:
+            return
+        runs = []
+        for row in rows:
+            if runs and runs[-1][1] == row - 1:
+                runs[-1][1] = row
+            else:
+                runs.append([row, row])
+        for row in rows:
+            self._id_by_path.pop(self._items[row].path, None)
+        if len(runs) > MAX_REMOVE_RUNS:
+            self.beginResetModel()
+            gone = set(rows)
+            self._items = [item for row, item in enumerate(self._items) if row not in gone]
+            self.item_ids[:] = [item.item_id for item in self._items]
+            self._row_of = {item.item_id: row for row, item in enumerate(self._items)}
+            self.endResetModel()
+            return
+        for first, last in reversed(runs):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._items[first:last + 1]
+            del self.item_ids[first:last + 1]
+            self.endRemoveRows()
+        self._row_of = {item.item_id: row for row, item in enumerate(self._items)}
+
+    def _on_thumbnail_ready(self, path, digest, image):
+        if image.isNull():
+            self._failed.add(path)
+            return
+        if path not in self._id_by_path:
+            return
+        self.icon_cache.put(path, self.icon_size, QPixmap.fromImage(image))
+        row = self._row_of.get(self._id_by_path.get(path))
+        if row is not None:
+            idx = self.index(row)
+            self.dataChanged.emit(idx, idx, [Qt.DecorationRole])
+
+
+class IdFilterModel(QAbstractProxyModel):
+    # id 집합(set 또는 NumPy 배열)에 든 행만 남기는 프록시. 보이는 원본 행 번호를 NumPy 배열로 들고 있어
+    # 필터 변경은 id -> 불리언 조회표 한 번으로 끝남 (행마다 파이썬 filterAcceptsRow를 부르면 5만 개에서 200ms 가까이 걸림)
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._visible_ids = None                    # None이면 전체 표시
+        self._ids = np.zeros(0, dtype=np.int64)     # 원본 행 -> item_id
+        self._rows = np.zeros(0, dtype=np.int64)    # 프록시 행 -> 원본 행
+        self._proxy_row = np.zeros(0, dtype=np.int64)  # 원본 행 -> 프록시 행 (숨긴 행은 -1)
+        self._pending_remove = False
+
+    def setSourceModel(self, model):
+        self.beginResetModel()
+        old = self.sourceModel()
+        if old is not None:
+            old.rowsInserted.disconnect(self._on_rows_inserted)
+            old.rowsAboutToBeRemoved.disconnect(self._on_rows_about_to_be_removed)
+            old.rowsRemoved.disconnect(self._on_rows_removed)
+            old.dataChanged.disconnect(self._on_data_changed)
+            old.modelAboutToBeReset.disconnect(self.beginResetModel)
+            old.modelReset.disconnect(self._on_model_reset)
+        super().setSourceModel(model)
+        model.rowsInserted.connect(self._on_rows_inserted)
+        model.rowsAboutToBeRemoved.connect(self._on_rows_about_to_be_removed)
+        model.rowsRemoved.connect(self._on_rows_removed)
+        model.dataChanged.connect(self._on_data_changed)
+        model.modelAboutToBeReset.connect(self.beginResetModel)
+        model.modelReset.connect(self._on_model_reset)
+        self._ids = np.array(model.item_ids, dtype=np.int64)
+        self._rows = self._filter_rows(self._visible_ids)
+        self._update_proxy_rows()
+        self.endResetModel()
+
+    def set_visible_ids(self, ids):
+        rows = self._filter_rows(ids)
+        self._visible_ids = ids
+        if np.array_equal(rows, self._rows):
+            return
+        self.beginResetModel()
+        self._rows = rows
+        self._update_proxy_rows()
+        self.endResetModel()
+
+    def _mask(self, ids, source_ids):
+        # id 집합 -> source_ids 각각이 보이는지 (id는 작은 정수라 조회표로 벡터화)
+        if not isinstance(ids, np.ndarray):
+            ids = np.fromiter(ids, dtype=np.int64, count=len(ids))
+        if not len(ids) or not len(source_ids):
+            return np.zeros(len(source_ids), dtype=bool)
+        size = int(max(ids.max(), source_ids.max())) + 1
+        lookup = np.zeros(size, dtype=bool)
+        lookup[ids] = True
+        return lookup[source_ids]
+
+    def _filter_rows(self, ids):
+        if ids is None:
+            return np.arange(len(self._ids), dtype=np.int64)
+        return np.flatnonzero(self._mask(ids, self._ids)).astype(np.int64)
+
+    def _update_proxy_rows(self):
+        self._proxy_row = np.full(len(self._ids), -1, dtype=np.int64)
+        self._proxy_row[self._rows] = np.arange(len(self._rows), dtype=np.int64)
+
+    def _on_rows_inserted(self, parent, first, last):
+        # 원본은 항상 뒤에 추가하므로 새로 보일 행도 프록시 끝에 붙음
+        new_ids = np.array(self.sourceModel().item_ids[first:last + 1], dtype=np.int64)
+        self._ids = np.concatenate([self._ids, new_ids])
+        new_rows = np.arange(first, last + 1, dtype=np.int64)
+        if self._visible_ids is not None:
+            new_rows = new_rows[self._mask(self._visible_ids, new_ids)]
+        if not len(new_rows):
+            self._update_proxy_rows()
+            return
+        start = len(self._rows)
+        self.beginInsertRows(QModelIndex(), start, start + len(new_rows) - 1)
+        self._rows = np.concatenate([self._rows, new_rows])
+        self._update_proxy_rows()
+        self.endInsertRows()
+
+    def _on_rows_about_to_be_removed(self, parent, first, last):
+        visible = self._proxy_row[first:last + 1]
+        visible = visible[visible >= 0]
+        self._pending_remove = bool(len(visible))
+        if self._pending_remove:
+            self.beginRemoveRows(QModelIndex(), int(visible.min()), int(visible.max()))
+
+    def _on_rows_removed(self, parent, first, last):
+        count = last - first + 1
+        self._ids = np.delete(self._ids, np.s_[first:last + 1])
+        rows = self._rows[(self._rows < first) | (self._rows > last)]
+        self._rows = np.where(rows > last, rows - count, rows)
+        self._update_proxy_rows()
+        if self._pending_remove:
+            self._pending_remove = False
+            self.endRemoveRows()
+
+    def _on_model_reset(self):
+        self._ids = np.array(self.sourceModel().item_ids, dtype=np.int64)
+        self._rows = self._filter_rows(self._visible_ids)
+        self._update_proxy_rows()
+        self.endResetModel()
+
+    def _on_data_changed(self, top_left, bottom_right, roles=()):
+        rows = self._proxy_row[top_left.row():bottom_right.row() + 1]
+        for row in rows[rows >= 0]:
+            idx = self.index(int(row), 0)
+            self.dataChanged.emit(idx, idx, roles)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 1
+
+    def index(self, row, column=0, parent=QModelIndex()):
+        if parent.isValid() or column != 0 or not 0 <= row < len(self._rows):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=None):
+        if index is None:
+            return super().parent()  # QObject 부모
+        return QModelIndex()
+
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid() or self.sourceModel() is None:
+            return QModelIndex()
+        return self.sourceModel().index(int(self._rows[proxy_index.row()]), 0)
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid() or source_index.row() >= len(self._proxy_row):
+            return QModelIndex()
+        row = self._proxy_row[source_index.row()]
+        return self.createIndex(int(row), 0) if row >= 0 else QModelIndex()
+
+
+class ClosetFilterProxyModel(QSortFilterProxyModel):
+    # ClosetIndex/검색 색인이 준 id 집합으로 행을 숨기거나 보임 (아이템 재생성 없음)
+    # 거르기는 안쪽 IdFilterModel이 하고, 바깥 QSortFilterProxyModel은 필터 없이 C++ 행 매핑만 맡음
+    # -> 뷰가 배치할 때 행마다 부르는 index()가 파이썬으로 넘어오지 않음 (파이썬 프록시만 쓰면 5만 행 배치에 0.5초)
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.id_filter = IdFilterModel(self)
+
+    def setSourceModel(self, model):
+        self.id_filter.setSourceModel(model)
+        super().setSourceModel(self.id_filter)
+
+    def set_visible_ids(self, ids):
+        self.id_filter.set_visible_ids(ids)
+
+    def index_of_id(self, item_id):
+        # 보이는 행이면 그 인덱스, 아니면 무효 인덱스
+        source = self.id_filter.sourceModel()
+        row = source.row_of(item_id) if source is not None else None
+        if row is None:
+            return QModelIndex()
+        return self.mapFromSource(self.id_filter.mapFromSource(source.index(row)))
@@ -0,0 +1,53 @@
+import threading
+
+from PySide6.QtCore import QObject, QThreadPool, Signal
+
+from src.ai.inference import default_service
+from src.utils.hashing import content_hash
+
+
+class EmbeddingJob(QObject):
+    # 임베딩이 없는 옷장 항목을 스레드 풀에서 배치 추론 (이전 버전에서 등록한 옷 채우기)
+    embeddings_ready = Signal(list)       # [(경로, 내용 해시, 임베딩)] (배치 단위)
+    finished = Signal(bool)               # 취소 여부
+
+    def __init__(self, entries, tagger=None, parent=None):
+        super().__init__(parent)
+        self.entries = list(entries)      # [(경로, 내용 해시 또는 '')]
+        self.tagger = tagger              # None이면 작업 스레드에서 공유 추론 서비스를 불러옴 (GUI 스레드에서 모델 로딩 안 함)
+        self.cancelled = threading.Event()
+
+    def start(self):
+        QThreadPool.globalInstance().start(self._run)
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def _resolve(self, chunk):
+        resolved = []
+        for path, digest in chunk:
+            try:
+                resolved.append((path, digest or content_hash(path)))
+            except OSError:
+                continue
+        return resolved
+
+    def _run(self):
+        try:
+            if self.tagger is None:
+                self.tagger = default_service()
+            if self.tagger is None or not self.tagger.embedding_name:
+                return
+            batch_size = self.tagger.batch_size
+            for start in range(0, len(self.entries), batch_size):
+                if self.cancelled.is_set():
+                    break
+                chunk = self._resolve(self.entries[start:start + batch_size])
+                predictions = self.tagger.predict_paths([path for path, _ in chunk],
+                                                        keys=[digest for _, digest in chunk])
+                results = [(path, digest, p.embedding) for (path, digest), p in zip(chunk, predictions)
+                           if p is not None and p.embedding is not None]
+                if results and not self.cancelled.is_set():
+                    self.embeddings_ready.emit(results)
+        finally:
+            self.finished.emit(self.cancelled.is_set())
@@ -0,0 +1,28 @@
+from PySide6.QtCore import QObject, Signal
+
+from src.data.folder_watch import FolderWatcher
+
+
+class FolderSyncJob(QObject):
+    # FolderWatcher(감시 스레드)의 변경 묶음을 GUI 스레드로 전달
+    changes_ready = Signal(object)        # FolderChanges
+
+    def __init__(self, snapshot, use_inotify=True, parent=None):
+        super().__init__(parent)
+        self.snapshot = snapshot
+        self.watcher = FolderWatcher(snapshot, self.changes_ready.emit, use_inotify=use_inotify)
+
+    @property
+    def root(self):
+        return self.snapshot.root
+
+    @property
+    def mode(self):
+        return self.watcher.mode
+
+    def start(self):
+        self.watcher.start()
+
+    def stop(self):
+        # 감시 스레드는 WAKE_S 안에 스스로 끝남 (창을 닫을 때 기다리지 않음)
+        self.watcher.stop(wait=False)
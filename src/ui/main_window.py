@@ -1,59 +1,52 @@
 from PySide6.QtWidgets import (
-    QMainWindow, QWidget, QHBoxLayout, QFrame, QApplication, QTabWidget, QVBoxLayout, QPushButton, QListWidget, QListWidgetItem, QFileDialog, QDialog, QLabel, QCheckBox, QLineEdit, QGridLayout, QGroupBox, QComboBox, QSpinBox, QRadioButton, QButtonGroup, QTreeWidget, QTreeWidgetItem, QSizePolicy, QSplitter, QToolButton, QColorDialog, QSlider
+    QMainWindow, QWidget, QHBoxLayout, QFrame, QApplication, QTabWidget, QVBoxLayout, QPushButton, QListView, QFileDialog, QDialog, QLabel, QCheckBox, QLineEdit, QGridLayout, QGroupBox, QComboBox, QSpinBox, QRadioButton, QButtonGroup, QTreeWidget, QTreeWidgetItem, QSizePolicy, QSplitter, QToolButton, QColorDialog, QSlider, QProgressBar
 )
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QPalette, QColor, QIcon, QPixmap
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtGui import QIcon, QPixmap
 import os
+import threading
+import numpy as np
 from src.ui.outfit_result_widget import OutfitResultWidget
+from src.ai.embedding import EMBEDDING_DIM
+from src.ai.color import hex_to_lab, pack_colors, unpack_colors
+from src.ai.compatibility import CompatibilityCache
+from src.ai.recommend import OutfitRecommender, RecommendRequest
+from src.ai.inference import default_service, warm_up
+from src.data.categories import CATEGORIES
+from src.data.ann_index import IVFIndex
+from src.data.closet_db import ClosetDB
+from src.data.closet_stats import ClosetStats
+from src.data.closet_index import ClosetIndex
+from src.data.color_index import ColorIndex
+from src.data.embedding_store import EmbeddingStore
+from src.data.folder_watch import FolderSnapshot
+from src.data.image_store import ImageStore, phash_from_hex, phash_to_hex
+from src.data.mask_store import default_mask_store
+from src.data.search_index import ClosetSearchIndex, text_matches
+from src.data.suitability import SuitabilityIndex
+from src.ui.analysis_page import AnalysisPage
+from src.ui.bulk_import import BulkImportJob, ImportReviewDialog, TaggedImportJob
+from src.ui.embedding_job import EmbeddingJob
+from src.ui.folder_sync import FolderSyncJob
+from src.ui.recommend_job import OutfitImageLoader, RecommendJob
+from src.ui.theme import THEMES, apply_stylesheet
+from src.ui.closet_model import ClosetListModel, ClosetFilterProxyModel, ItemIdRole, PathRole
+from src.ui.perf_page import PerfPage
+from src.utils import perf
+from src.utils.hashing import content_hash
+from src.utils.stall import StallDetector
+from src.utils.thumbnails import ThumbnailService, decode_thumbnail
 
-# === 테마 색상 정의 ===
-# 다크모드(현재)
-DARK_THEME = {
-    'DARK_BG': '#23243A',         # 전체 배경
-    'CARD_BG': '#282A36',         # 카드/프레임/그룹박스 배경
-    'ACCENT_PURPLE': '#6C63FF',   # 강조(테두리/버튼)
-    'ACCENT_BLUE': '#4F8CFF',     # 버튼/포커스
-    'ACCENT_YELLOW': '#FFE066',   # 포인트
-    'TEXT_COLOR': '#E0E0E0',      # 메인 텍스트
-    'BORDER_RADIUS': '12px',
-    'SIDEBAR_BG': '#23243A',      # 사이드바/입력창 배경
-    'SIDEBAR_TEXT': '#E0E0E0',    # 사이드바/라벨 텍스트
-    'SIDEBAR_BTN_BG': '#353570',  # 버튼 배경
-    'SIDEBAR_BTN_TEXT': '#E0E0E0',# 버튼 텍스트
-    'ITEM_BG': '#282A36',         # 아이템/리스트 배경
-    'INPUT_BG': '#2C2D3C',        # 입력창 배경
-    'INPUT_TEXT': '#E0E0E0',      # 입력창 텍스트
-    'INPUT_PLACEHOLDER': '#B0B0B0', # 입력창 placeholder
-    'INPUT_BORDER': '#6C63FF',    # 입력창 테두리
-}
-
-# 기본(라이트) 모드: 이미지 참고
-LIGHT_THEME = {
-    'DARK_BG': '#E3F3FC',      # 전체 배경 (가장 밝은 하늘색)
-    'CARD_BG': '#C7E4F5',      # 패널/박스 배경 (밝은 하늘색)
-    'ACCENT_PURPLE': '#0077B6',
-    'ACCENT_BLUE': '#0099CC',
-    'ACCENT_YELLOW': '#FFD600',
-    'TEXT_COLOR': '#222',
-    'BORDER_RADIUS': '12px',
-    'SIDEBAR_BG': '#B3DDF2',   # 사이드바/입력창 배경
-    'SIDEBAR_TEXT': '#003344',
-    'SIDEBAR_BTN_BG': '#0099CC',
-    'SIDEBAR_BTN_TEXT': '#FFF',
-    'ITEM_BG': '#E3F3FC',
-    'INPUT_BG': '#FFFFFF',
-    'INPUT_TEXT': '#222',
-    'INPUT_PLACEHOLDER': '#888',
-    'INPUT_BORDER': '#0099CC',
-}
-
-CATEGORIES = {
-    "상의": ["티셔츠", "셔츠", "블라우스", "후드티", "맨투맨"],
-    "하의": ["청바지", "슬랙스", "치마", "반바지", "레깅스"],
-    "아우터": ["재킷", "코트", "패딩", "가디건", "조끼"],
-    "신발": ["운동화", "구두", "부츠", "샌들", "슬리퍼"],
-    "액세서리": ["모자", "가방", "벨트", "목도리"]
-}
+SIMILAR_ITEM_COUNT = 8   # 선택한 옷과 비슷한 옷을 몇 벌 보여줄지
+RESULT_OUTFIT_COUNT = 50   # 추천 코디를 몇 개까지 받아 이전/다음으로 넘겨 볼 수 있게 할지
+SEARCH_DEBOUNCE_MS = 120 # 검색창 입력이 멈춘 뒤 이만큼 지나면 검색
+LAYOUT_BATCH = 200       # 옷장 격자를 한 번에 배치하는 행 수
+SEARCH_INDEX_IDLE_MS = 200  # 옷장 추가가 이만큼 멈추면 검색 색인을 채우기 시작
+SEARCH_INDEX_BATCH = 250    # 이벤트 루프 한 번에 검색 색인에 넣는 항목 수
+WEARABLE_FILTER_MS = 150    # 기온/날씨 조작이 이만큼 멈추면 '입을 수 있는 옷만' 격자 필터 갱신
+COMPAT_IDLE_MS = 500        # 옷장 변경이 이만큼 멈추면 궁합 캐시를 채우기 시작
+COMPAT_DENSE_MAX = 5000     # 옷장이 이 이하면 궁합 캐시를 전체 행렬로, 넘으면 슬롯마다 최근 추천 후보 COMPAT_TOP_K벌만
+COMPAT_TOP_K = 1024         # 슬롯 쌍 10개 × 1024² × 4바이트 = 약 40MB (전체 행렬 모드의 상한과 비슷)
 
 class ImageTagDialog(QDialog):
     def __init__(self, image_path, ai_tags=None, parent=None):
@@ -64,18 +57,18 @@ class ImageTagDialog(QDialog):
         self.image_path = image_path
         # ai_tags는 {카테고리: 하위항목} 형식
         self.ai_tags = ai_tags or {cat: items[0] for cat, items in CATEGORIES.items()}
+        self.setObjectName("ImageTagDialog")   # 스타일은 메인 창 스타일시트(src/ui/theme.py)에서 적용
         self.init_ui()
 
     def init_ui(self):
-        self.setStyleSheet(f"background: {self.parent().theme['CARD_BG']}; color: {self.parent().theme['TEXT_COLOR']}; border-radius: {self.parent().theme['BORDER_RADIUS']};")
         layout = QVBoxLayout(self)
         content_layout = QHBoxLayout()
 
         # 좌측: 이미지 미리보기
         image_label = QLabel()
-        pixmap = QPixmap(self.image_path)
-        image_label.setPixmap(pixmap.scaled(180, 180, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-        image_label.setStyleSheet(f'background: {self.parent().theme["DARK_BG"]}; border-radius: 8px; border: 1px solid #444;')
+        # 미리보기도 축소 디코딩 (원본 전체 디코딩 방지)
+        image_label.setPixmap(QPixmap.fromImage(decode_thumbnail(self.image_path, 180)))
+        image_label.setObjectName("tag_preview")
         content_layout.addWidget(image_label)
 
         # 우측: 카테고리별 QComboBox (분류 적용)
@@ -86,12 +79,11 @@ class ImageTagDialog(QDialog):
         self.comboboxes = {}
         for i, (category, items) in enumerate(CATEGORIES.items()):
             cb = QCheckBox(category)
-            cb.setChecked(True)
-            cb.setStyleSheet(f'color: {self.parent().theme["TEXT_COLOR"]};')
+            # AI 예측이 있으면 예측된 카테고리만 체크 (첫 번째 체크 항목이 메인 카테고리가 됨)
+            cb.setChecked(category in self.ai_tags)
             combo = QComboBox()
             combo.addItems(items)
             combo.setCurrentText(self.ai_tags.get(category, items[0]))
-            combo.setStyleSheet(f'padding: 4px; border-radius: 6px; border: 1px solid #444; background: {self.parent().theme["DARK_BG"]}; color: {self.parent().theme["TEXT_COLOR"]};')
             self.checkboxes[category] = cb
             self.comboboxes[category] = combo
             tag_layout.addWidget(cb, i, 0)
@@ -103,7 +95,7 @@ class ImageTagDialog(QDialog):
 
         # 하단: 등록 버튼
         self.register_btn = QPushButton('등록')
-        self.register_btn.setStyleSheet(f'padding: 10px 32px; background: {self.parent().theme["ACCENT_PURPLE"]}; color: white; border-radius: 8px; font-weight: bold;')
+        self.register_btn.setObjectName("register_btn")
         self.register_btn.clicked.connect(self.accept)
         layout.addWidget(self.register_btn, alignment=Qt.AlignRight)
 
@@ -111,11 +103,76 @@ class ImageTagDialog(QDialog):
         # 체크된 항목만 반환, {카테고리: 하위항목}
         return {cat: self.comboboxes[cat].currentText() for cat in CATEGORIES if self.checkboxes[cat].isChecked()}
 
-class DraggableImageList(QListWidget):
-    def __init__(self, parent=None):
+class DraggableImageList(QListView):
+    def __init__(self, parent=None, thumbnail_service=None):
         super().__init__(parent)
         self.setAcceptDrops(True)
         self.parent_window = parent
+        # 썸네일은 워커 풀에서 디코딩되어 도착하는 대로 아이콘 교체
+        self.thumbnails = thumbnail_service or ThumbnailService(parent=self)
+        # 모델은 한 번 만든 행을 유지하고, 카테고리 필터는 프록시에서 숨김/표시만 함
+        self.source_model = ClosetListModel(self.thumbnails, parent=self)
+        self.proxy_model = ClosetFilterProxyModel(self)
+        self.proxy_model.setSourceModel(self.source_model)
+        self.setModel(self.proxy_model)
+        # 모든 셀이 같은 크기라 레이아웃 계산을 행 수에 비례해 반복하지 않음
+        self.setUniformItemSizes(True)
+        # 필터를 바꾸면 행 배치를 LAYOUT_BATCH개씩 나눠 이벤트 루프 사이사이에 함 (첫 화면부터 바로 그림)
+        self.setLayoutMode(QListView.Batched)
+        self.setBatchSize(LAYOUT_BATCH)
+        # 스크롤이 멈추면 화면 밖으로 지나간 행의 대기 중 썸네일 요청을 취소
+        self._prune_timer = QTimer(self)
+        self._prune_timer.setSingleShot(True)
+        self._prune_timer.setInterval(80)
+        self._prune_timer.timeout.connect(self._prune_pending_thumbnails)
+        # 같은 썸네일 서비스를 쓰는 다른 뷰(유사 옷 목록)가 보여 주는 경로는 요청을 취소하지 않음
+        self.pinned_paths = set()
+
+    def add_items(self, items):
+        self.source_model.add_items(items)
+
+    def set_visible_ids(self, ids):
+        # 필터를 바꾸면 프록시가 리셋되므로, 선택한 옷이 계속 보이면 다시 선택
+        current = self.currentIndex()
+        item_id = current.data(ItemIdRole) if current.isValid() else None
+        self.proxy_model.set_visible_ids(ids)
+        if item_id is not None and not self.currentIndex().isValid():
+            restored = self.proxy_model.index_of_id(item_id)
+            if restored.isValid():
+                self.setCurrentIndex(restored)
+        self._prune_timer.start()
+
+    def scrollContentsBy(self, dx, dy):
+        super().scrollContentsBy(dx, dy)
+        self._prune_timer.start()
+
+    def visible_paths(self):
+        # 아이콘 격자는 행 순서대로 배치되므로 visualRect로 이분 탐색해 보이는 구간을 구함
+        proxy = self.proxy_model
+        count = proxy.rowCount()
+        height = self.viewport().height()
+        lo, hi = 0, count
+        # 배치 레이아웃 중에는 아직 배치되지 않은 뒤쪽 행의 사각형이 비어 있으므로 화면 아래로 취급
+        while lo < hi:
+            mid = (lo + hi) // 2
+            rect = self.visualRect(proxy.index(mid, 0))
+            if rect.isValid() and rect.bottom() < 0:
+                lo = mid + 1
+            else:
+                hi = mid
+        first = lo
+        lo, hi = first, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            rect = self.visualRect(proxy.index(mid, 0))
+            if rect.isValid() and rect.top() <= height:
+                lo = mid + 1
+            else:
+                hi = mid
+        return {proxy.index(row, 0).data(PathRole) for row in range(first, lo)}
+
+    def _prune_pending_thumbnails(self):
+        self.thumbnails.cancel_except(self.visible_paths() | self.pinned_paths)
 
     def dragEnterEvent(self, event):
         if event.mimeData().hasUrls():
@@ -123,6 +180,13 @@ class DraggableImageList(QListWidget):
         else:
             super().dragEnterEvent(event)
 
+    def dragMoveEvent(self, event):
+        # QListView 기본 구현은 모델의 mime 타입만 허용하므로 파일 URL은 직접 수락
+        if event.mimeData().hasUrls():
+            event.acceptProposedAction()
+        else:
+            super().dragMoveEvent(event)
+
     def dropEvent(self, event):
         if event.mimeData().hasUrls():
             file_paths = [url.toLocalFile() for url in event.mimeData().urls() if url.isLocalFile()]
@@ -142,13 +206,7 @@ class TemperatureGauge(QWidget):
 
         self.temp_label = QLabel("20°C")
         self.temp_label.setAlignment(Qt.AlignCenter)
-        self.temp_label.setStyleSheet(
-            f"""
-            font-size: 28px;
-            font-weight: bold;
-            color: {parent.theme['ACCENT_BLUE'] if parent else '#4F8CFF'};
-            """
-        )
+        self.temp_label.setObjectName("temp_label")
         layout.addWidget(self.temp_label)
 
         self.slider = QSlider(Qt.Horizontal)
@@ -156,24 +214,7 @@ class TemperatureGauge(QWidget):
         self.slider.setValue(20)
         self.slider.setTickInterval(10)
         self.slider.setTickPosition(QSlider.TicksBelow)
-        self.slider.setStyleSheet(
-            f"""
-            QSlider::groove:horizontal {{
-                border-radius: 8px;
-                height: 10px;
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 {parent.theme['ACCENT_PURPLE'] if parent else '#6C63FF'},
-                    stop:1 {parent.theme['ACCENT_BLUE'] if parent else '#4F8CFF'});
-            }}
-            QSlider::handle:horizontal {{
-                background: {parent.theme['ACCENT_YELLOW'] if parent else '#FFE066'};
-                border: 2px solid #fff;
-                width: 18px;
-                margin: -4px 0;
-                border-radius: 9px;
-            }}
-            """
-        )
+        self.slider.setObjectName("temp_slider")
         self.slider.valueChanged.connect(self.update_temp)
         layout.addWidget(self.slider)
 
@@ -184,232 +225,80 @@ class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.theme_mode = 'dark'
-        self.theme = DARK_THEME.copy()
+        self.theme = THEMES['dark']
         self.setWindowTitle("3-분할 전체화면 윈도우")
         self.setGeometry(100, 100, 1200, 800)
         self.image_category_map = {}
+        self.closet_index = ClosetIndex()
+        self.color_index = ColorIndex()
+        # 옷장 검색 색인 (카테고리/태그/색 이름/파일명). 격자는 카테고리 선택 ∩ 검색 결과만 보여 줌
+        self.search_index = ClosetSearchIndex()
+        self.category_filter_ids = None     # 사이드바에서 고른 카테고리의 id 집합 (None이면 전체)
+        self.search_ids = None              # 검색 결과 id 배열 (None이면 검색 안 함)
+        # 옷마다 적정 기온 범위/날씨 비트를 열로 보관 -> 기온·날씨 선택은 벡터 필터 한 번
+        self.suitability = SuitabilityIndex()
+        self.wearable_ids = None            # '입을 수 있는 옷만' 필터의 id 배열 (None이면 끔)
+        # 스타일 분석 탭용 집계 (옷 추가/삭제/색 분석 때 그 옷 몫만 더하고 뺌)
+        self.closet_stats = ClosetStats()
+        self.analysis_page = None           # 스타일 분석 탭을 열 때 생성
+        # 임베딩: 디스크는 내용 해시 -> float16 memmap, 메모리는 item_id -> 유사도 색인
+        self.embedding_store = EmbeddingStore()
+        self.embedding_index = IVFIndex(EMBEDDING_DIM)
+        self.embedding_job = None
+        self.color_ranked_ids, self.color_scores = [], []
+        self._recommender = None            # 옷장 스냅샷 기반 추천기 (옷장/색이 바뀌면 다시 만듦)
+        self.recommended_outfits = []
+        self.recommend_job = None
+        self._recommend_live = False        # 한 번 추천한 뒤부터는 조건이 바뀌면 자동으로 다시 추천
+        self.closet_db = ClosetDB()
+        # 슬롯 쌍별 궁합 성분 캐시 (디스크에 유지, 바뀐 옷의 행만 유휴 시간에 계산). 모드는 시작 시 옷장 크기로 정함
+        self.compatibility = CompatibilityCache(
+            self.closet_index, self.color_index, self.embedding_index,
+            top_k=None if self.closet_db.count() <= COMPAT_DENSE_MAX else COMPAT_TOP_K)
+        # 새로 등록하는 옷은 내용 해시 기반 저장소로 가져와 그 경로로 관리 (원본을 옮겨도 유지)
+        self.image_store = ImageStore()
+        self.item_sources = {}              # 저장소 경로 -> (가져온 원래 경로, pHash)
+        # 내용 해시별 옷 영역 마스크 (한 번 분할해 두고 색 분석/모델 입력/추천 결과 잘라내기에 재사용)
+        self.mask_store = default_mask_store()
+        self._pending_thumbnail_refs = {}   # 경로 -> 썸네일 캐시 경로 (모아서 한 번에 저장)
+        self._saved_thumbnail_refs = {}     # DB에 이미 기록된 썸네일 경로
+        self.import_job = None
+        self.import_queue = []
+        # 감시 폴더 동기화: 바뀐 파일만 일괄 가져오기로 보내고, 가져오기가 끝난 파일의 상태를 DB에 기록
+        self.folder_sync = None
+        self._watch_pending = {}            # 가져오기를 기다리는 감시 폴더 파일 -> (mtime_ns, 크기)
+        self.watch_label = None             # 설정 탭을 열 때 생성
+        self._tab_builders = {}             # 아직 만들지 않은 탭 페이지 -> 만드는 함수
+        self.theme_time_label = None        # 설정 탭을 열 때 생성
+        self.theme_time_text = ""
+        self.warmup_thread = None
         self.init_ui()
+        # 저장된 옷장은 첫 화면이 그려진 뒤 청크 단위로 불러옴
+        # GUI 스레드 멈춤 감지 (계측이 켜져 있을 때만 동작, 설정 > 성능에서 켜고 끔)
+        self.stall_detector = StallDetector(parent=self)
+        if perf.enabled():
+            self.stall_detector.start()
+        QTimer.singleShot(0, self.load_closet)
+        QTimer.singleShot(0, self.start_model_warmup)
 
-    def apply_theme(self):
-        t = self.theme
-        # 전체 배경
-        palette = self.centralWidget().palette()
-        palette.setColor(QPalette.Window, QColor(t['DARK_BG']))
-        self.centralWidget().setAutoFillBackground(True)
-        self.centralWidget().setPalette(palette)
-
-        # 중앙 배경 프레임 색상 적용 (중앙/우측 패널 모두 밝은 하늘색으로 통일)
-        self.center_bg_frame.setStyleSheet(f'background: {t["DARK_BG"]};')
-        self.center_frame.setStyleSheet(f'background: {t["CARD_BG"]}; border-radius: {t["BORDER_RADIUS"]};')
-        self.result_frame.setStyleSheet(f'background: {t["CARD_BG"]}; border-radius: {t["BORDER_RADIUS"]};')
-        self.right_frame.setStyleSheet(f'background: {t["CARD_BG"]}; border-radius: {t["BORDER_RADIUS"]};')
+    def start_model_warmup(self):
+        # 첫 화면이 그려진 뒤 추론 서비스의 세션 풀 생성(onnxruntime/onnx import 포함)과 첫 추론을 미리 해 둠
+        # 전역 스레드 풀은 썸네일 디코딩이 쓰므로, 오래 걸리는 예열은 별도 데몬 스레드에서
+        self.warmup_thread = threading.Thread(target=warm_up, name='model-warmup', daemon=True)
+        self.warmup_thread.start()
 
-        # 좌측 패널
-        self.left_frame.setStyleSheet(f'background: {t["CARD_BG"]}; border-radius: {t["BORDER_RADIUS"]};')
-        self.sidebar.setStyleSheet(f'background: {t["SIDEBAR_BG"]}; color: {t["SIDEBAR_TEXT"]}; border-radius: 8px; font-size: 15px; border: 2px solid {t["ACCENT_PURPLE"]};')
-        self.sidebar_search.setStyleSheet(
-            f'''
-            QLineEdit {{
-                padding: 6px 10px;
-                border-radius: 8px;
-                background: {t["INPUT_BG"]};
-                color: {t["INPUT_TEXT"]};
-                border: 2px solid {t["INPUT_BORDER"]};
-                font-size: 15px;
-            }}
-            QLineEdit:placeholder {{
-                color: {t["INPUT_PLACEHOLDER"]};
-            }}
-            '''
-        )
-        self.sidebar_toggle_btn.setStyleSheet(f'background: {t["SIDEBAR_BTN_BG"]}; color: {t["SIDEBAR_BTN_TEXT"]}; border-radius: 8px; font-size: 16px; padding: 4px 10px; font-weight: bold;')
-        self.upload_button.setStyleSheet(f'padding: 12px 0; background: {t["ACCENT_BLUE"]}; color: #fff; border-radius: 8px; font-weight: bold; font-size: 15px; border: none;')
-        self.image_list.setStyleSheet(f'background: {t["ITEM_BG"]}; border-radius: 10px; border: 2px solid {t["ACCENT_PURPLE"]}; color: {t["SIDEBAR_TEXT"]};')
-
-        # "나의 옷장" 라벨
-        self.closet_tab_label.setStyleSheet(
-            f"""
-            background: {t['CARD_BG']};
-            color: {t['ACCENT_PURPLE']};
-            border: 2px solid {t['ACCENT_PURPLE']};
-            border-radius: 8px;
-            font-size: 15px;
-            padding: 4px 14px;
-            margin-left: 8px;
-            margin-top: 2px;
-            font-weight: bold;
-            """
-        )
-
-        # 우측 패널 그룹박스/폼 스타일
-        for gb in self.right_frame.findChildren(QGroupBox):
-            if '색상' in gb.title():
-                gb.setStyleSheet(
-                    f"""
-                    QGroupBox {{
-                        margin: 10px 0 0 0;
-                        padding: 10px 16px 10px 16px;
-                        border-radius: 10px;
-                        border: 2px solid {t['ACCENT_YELLOW']};
-                        background: {t['CARD_BG']};
-                        color: #B8860B;
-                        font-size: 16px;
-                        font-weight: bold;
-                    }}
-                    QGroupBox:title {{
-                        subcontrol-origin: margin;
-                        subcontrol-position: top left;
-                        left: 12px;
-                        top: 6px;
-                        padding: 0 4px;
-                    }}
-                    """
-                )
-            elif '상황' in gb.title():
-                gb.setStyleSheet(
-                    f"""
-                    QGroupBox {{
-                        margin: 10px 0 0 0;
-                        padding: 10px 16px 10px 16px;
-                        border-radius: 10px;
-                        border: 2px solid {t['ACCENT_PURPLE']};
-                        background: {t['CARD_BG']};
-                        color: {t['ACCENT_PURPLE']};
-                        font-size: 16px;
-                        font-weight: bold;
-                    }}
-                    QGroupBox:title {{
-                        subcontrol-origin: margin;
-                        subcontrol-position: top left;
-                        left: 12px;
-                        top: 6px;
-                        padding: 0 4px;
-                    }}
-                    """
-                )
-            elif '날씨' in gb.title():
-                gb.setStyleSheet(
-                    f"""
-                    QGroupBox {{
-                        margin: 10px 0 0 0;
-                        padding: 10px 16px 10px 16px;
-                        border-radius: 10px;
-                        border: 2px solid {t['ACCENT_BLUE']};
-                        background: {t['CARD_BG']};
-                        color: {t['ACCENT_BLUE']};
-                        font-size: 16px;
-                        font-weight: bold;
-                    }}
-                    QGroupBox:title {{
-                        subcontrol-origin: margin;
-                        subcontrol-position: top left;
-                        left: 12px;
-                        top: 6px;
-                        padding: 0 4px;
-                    }}
-                    """
-                )
-            elif '스타일' in gb.title():
-                gb.setStyleSheet(
-                    f"""
-                    QGroupBox {{
-                        margin: 10px 0 0 0;
-                        padding: 10px 16px 10px 16px;
-                        border-radius: 10px;
-                        border: 2px solid {t['ACCENT_BLUE']};
-                        background: {t['CARD_BG']};
-                        color: {t['ACCENT_BLUE']};
-                        font-size: 16px;
-                        font-weight: bold;
-                    }}
-                    QGroupBox:title {{
-                        subcontrol-origin: margin;
-                        subcontrol-position: top left;
-                        left: 12px;
-                        top: 6px;
-                        padding: 0 4px;
-                    }}
-                    """
-                )
-            else:
-                gb.setStyleSheet(
-                    f"""
-                    QGroupBox {{
-                        margin: 10px 0 0 0;
-                        padding: 10px 16px 10px 16px;
-                        border-radius: 10px;
-                        border: 2px solid {t['ACCENT_PURPLE']};
-                        background: {t['CARD_BG']};
-                        color: {t['ACCENT_PURPLE']};
-                        font-size: 16px;
-                        font-weight: bold;
-                    }}
-                    QGroupBox:title {{
-                        subcontrol-origin: margin;
-                        subcontrol-position: top left;
-                        left: 12px;
-                        top: 6px;
-                        padding: 0 4px;
-                    }}
-                    """
-                )
-
-        # 색상 선호도 관련 라벨/버튼
-        label_widgets = self.right_frame.findChildren(QLabel)
-        button_widgets = self.right_frame.findChildren(QPushButton)
-        for widget in label_widgets + button_widgets:
-            widget.setStyleSheet(
-                f"""
-                color: {t['TEXT_COLOR']};
-                font-size: 15px;
-                font-weight: bold;
-                background: {t['CARD_BG']};
-                border: none;
-                """
-            )
-
-        # 콤보박스, 스핀박스, 라디오버튼 등
-        for cb in self.right_frame.findChildren(QComboBox):
-            cb.setStyleSheet(
-                f'''
-                QComboBox {{
-                    padding: 8px;
-                    border-radius: 6px;
-                    background: {t["INPUT_BG"]};
-                    color: {t["INPUT_TEXT"]};
-                    border: 2px solid {t["INPUT_BORDER"]};
-                    font-size: 15px;
-                }}
-                QComboBox QAbstractItemView {{
-                    background: {t["CARD_BG"]};
-                    color: {t["INPUT_TEXT"]};
-                    selection-background-color: {t["ACCENT_PURPLE"]};
-                }}
-                '''
-            )
-        for sp in self.right_frame.findChildren(QSpinBox):
-            sp.setStyleSheet(
-                f'''
-                QSpinBox {{
-                    padding: 8px;
-                    border-radius: 6px;
-                    background: {t["INPUT_BG"]};
-                    color: {t["INPUT_TEXT"]};
-                    border: 2px solid {t["INPUT_BORDER"]};
-                    font-size: 15px;
-                }}
-                '''
-            )
-        for rb in self.right_frame.findChildren(QRadioButton):
-            rb.setStyleSheet(f'color: {t["TEXT_COLOR"]}; font-size: 15px; background: {t["CARD_BG"]};')
-
-        # 우측 패널 하단 마진 추가
-        self.right_frame.layout().setContentsMargins(22, 22, 22, 32)
-        self.right_frame.layout().setSpacing(12)
+    @perf.traced('MainWindow.apply_theme', 'ui')
+    def apply_theme(self):
+        # 테마별로 한 번만 만든 스타일시트를 창 전체에 통째로 교체 (위젯별 setStyleSheet 없음)
+        elapsed, cached = apply_stylesheet(self, self.theme_mode)
+        self.theme_time_text = f"테마 전환: {elapsed:.1f}ms" + (" (캐시)" if cached else "")
+        if self.theme_time_label is not None:
+            self.theme_time_label.setText(self.theme_time_text)
 
     def init_ui(self):
         # 전체 배경색 설정
         central_widget = QWidget(self)
+        central_widget.setObjectName("central_widget")
         self.setCentralWidget(central_widget)
         main_layout = QVBoxLayout()
         main_layout.setContentsMargins(0, 0, 0, 0)
@@ -428,6 +317,7 @@ class MainWindow(QMainWindow):
 
         # 좌측 패널
         self.left_frame = QFrame()
+        self.left_frame.setObjectName("left_frame")
         self.left_frame.setFrameShape(QFrame.StyledPanel)
         self.left_frame.setMinimumWidth(0)
         left_layout = QVBoxLayout()
@@ -436,9 +326,24 @@ class MainWindow(QMainWindow):
 
         # 사이드바 및 이미지 리스트 패널
         self.sidebar_search = QLineEdit()
-        self.sidebar_search.setPlaceholderText('카테고리 검색...')
-        self.sidebar_search.textChanged.connect(self.filter_sidebar)
+        self.sidebar_search.setObjectName("sidebar_search")
+        self.sidebar_search.setPlaceholderText('옷장 검색 (카테고리, 색, 파일명)...')
+        # 입력할 때마다가 아니라 입력이 잠시 멈추면 한 번 검색
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self._search_timer.timeout.connect(lambda: self.filter_sidebar(self.sidebar_search.text()))
+        self.sidebar_search.textChanged.connect(self._search_timer.start)
+        self._search_index_timer = QTimer(self)
+        self._search_index_timer.setSingleShot(True)
+        self._search_index_timer.setInterval(SEARCH_INDEX_IDLE_MS)
+        self._search_index_timer.timeout.connect(self.index_search_pending)
+        self._compat_timer = QTimer(self)
+        self._compat_timer.setSingleShot(True)
+        self._compat_timer.setInterval(COMPAT_IDLE_MS)
+        self._compat_timer.timeout.connect(self.index_compatibility_pending)
         self.sidebar = QTreeWidget()
+        self.sidebar.setObjectName("sidebar")
         self.sidebar.setHeaderHidden(True)
         self.populate_sidebar()
         self.sidebar.expandAll()
@@ -450,6 +355,7 @@ class MainWindow(QMainWindow):
         # 토글버튼과 "나의 옷장" 라벨을 한 줄에 배치
         toggle_row = QHBoxLayout()
         self.sidebar_toggle_btn = QToolButton()
+        self.sidebar_toggle_btn.setObjectName("sidebar_toggle_btn")
         self.sidebar_toggle_btn.setText('⮜')
         self.sidebar_toggle_btn.setCheckable(True)
         self.sidebar_toggle_btn.setChecked(False)
@@ -457,6 +363,7 @@ class MainWindow(QMainWindow):
         toggle_row.addWidget(self.sidebar_toggle_btn, alignment=Qt.AlignLeft)
 
         self.closet_tab_label = QLabel("나의 옷장")
+        self.closet_tab_label.setObjectName("closet_tab_label")
         self.closet_tab_label.setAlignment(Qt.AlignVCenter)
         toggle_row.addWidget(self.closet_tab_label, alignment=Qt.AlignLeft)
         toggle_row.addStretch(1)
@@ -466,13 +373,55 @@ class MainWindow(QMainWindow):
         right_vbox.addLayout(toggle_row)
 
         self.image_list = DraggableImageList(self)
-        self.image_list.setViewMode(QListWidget.IconMode)
-        self.image_list.setIconSize(QPixmap(100, 100).size())
-        self.image_list.setResizeMode(QListWidget.Adjust)
+        self.image_list.setObjectName("image_list")
+        self._thumbnail_flush_timer = QTimer(self)
+        self._thumbnail_flush_timer.setSingleShot(True)
+        self._thumbnail_flush_timer.setInterval(1000)
+        self._thumbnail_flush_timer.timeout.connect(self.flush_thumbnail_refs)
+        self.image_list.thumbnails.thumbnail_ready.connect(self.on_thumbnail_ready)
+        self.image_list.setViewMode(QListView.IconMode)
+        self.image_list.setIconSize(self.image_list.thumbnails.icon_size)
+        self.image_list.setResizeMode(QListView.Adjust)
         self.image_list.setSpacing(16)
         right_vbox.addWidget(self.image_list, 1)
+        self.image_list.selectionModel().currentChanged.connect(self.on_closet_item_selected)
+
+        # 선택한 옷과 비슷한 옷 (임베딩 최근접 이웃, 결과가 있을 때만 표시)
+        self.similar_label = QLabel("비슷한 옷")
+        self.similar_label.setObjectName("similar_label")
+        self.similar_list = QListView()
+        self.similar_list.setObjectName("similar_list")
+        self.similar_model = ClosetListModel(self.image_list.thumbnails, parent=self.similar_list)
+        self.similar_list.setModel(self.similar_model)
+        self.similar_list.setViewMode(QListView.IconMode)
+        self.similar_list.setFlow(QListView.LeftToRight)
+        self.similar_list.setWrapping(False)
+        self.similar_list.setUniformItemSizes(True)
+        self.similar_list.setIconSize(self.image_list.thumbnails.icon_size)
+        self.similar_list.setFixedHeight(self.image_list.thumbnails.icon_size.height() + 36)
+        self.similar_label.hide()
+        self.similar_list.hide()
+        right_vbox.addWidget(self.similar_label)
+        right_vbox.addWidget(self.similar_list)
+
+        # 일괄 가져오기 진행률 / 취소 (가져오는 중에만 표시)
+        self.import_progress_widget = QWidget()
+        import_row = QHBoxLayout(self.import_progress_widget)
+        import_row.setContentsMargins(0, 0, 0, 0)
+        self.import_progress = QProgressBar()
+        self.import_progress.setTextVisible(False)
+        self.import_status_label = QLabel()
+        self.import_status_label.setObjectName("import_status_label")
+        self.import_cancel_btn = QPushButton("취소")
+        self.import_cancel_btn.clicked.connect(self.cancel_bulk_import)
+        import_row.addWidget(self.import_progress, 1)
+        import_row.addWidget(self.import_status_label)
+        import_row.addWidget(self.import_cancel_btn)
+        self.import_progress_widget.hide()
+        right_vbox.addWidget(self.import_progress_widget)
 
         self.upload_button = QPushButton("이미지 업로드")
+        self.upload_button.setObjectName("upload_button")
         self.upload_button.clicked.connect(self.upload_image)
         right_vbox.addWidget(self.upload_button, alignment=Qt.AlignBottom)
 
@@ -485,7 +434,7 @@ class MainWindow(QMainWindow):
         sidebar_widget.setLayout(sidebar_layout)
         sidebar_widget.setMaximumWidth(180)
         sidebar_widget.setMinimumWidth(0)
-        sidebar_widget.setStyleSheet('background: transparent;')
+        sidebar_widget.setObjectName("sidebar_panel")
         right_widget = QWidget()
         right_widget.setLayout(right_vbox)
         self.splitter = QSplitter()
@@ -499,6 +448,7 @@ class MainWindow(QMainWindow):
 
         # 중간 패널: OutfitResultWidget으로 교체
         self.center_frame = QFrame()
+        self.center_frame.setObjectName("center_frame")
         self.center_frame.setFrameShape(QFrame.StyledPanel)
         self.center_frame.setMinimumWidth(0)
         center_layout2 = QVBoxLayout()
@@ -507,52 +457,65 @@ class MainWindow(QMainWindow):
         center_layout2.setSpacing(32)
 
         # OutfitResultWidget 생성 및 배치
-        self.outfit_result_widget = OutfitResultWidget(self.center_frame)
+        self.outfit_result_widget = OutfitResultWidget(self.center_frame,
+                                                       loader=OutfitImageLoader(self.mask_store, parent=self))
         center_layout2.addWidget(self.outfit_result_widget)
         self.center_frame.setLayout(center_layout2)
 
         # 중앙 결과 프레임 (배경만)
         self.result_frame = QFrame()
+        self.result_frame.setObjectName("result_frame")
         self.result_frame.setFrameShape(QFrame.StyledPanel)
         self.result_frame.setMinimumWidth(0)
-        self.result_frame.setStyleSheet('border: none;')
         # 필요시 self.result_frame에 위젯 추가 가능
 
         # 우측 패널
         self.right_frame = QFrame()
+        self.right_frame.setObjectName("right_frame")
         self.right_frame.setFrameShape(QFrame.StyledPanel)
         self.right_frame.setMinimumWidth(0)
         right_layout = QVBoxLayout()
-        right_layout.setContentsMargins(22, 22, 22, 22)
-        right_layout.setSpacing(22)
+        right_layout.setContentsMargins(22, 22, 22, 32)
+        right_layout.setSpacing(12)
         # 상황
         situation_group = QGroupBox('상황')
-        situation_group.setStyleSheet(f'QGroupBox {{ color: {self.theme["ACCENT_PURPLE"]}; font-weight: bold; border: 1.5px solid {self.theme["ACCENT_PURPLE"]}; border-radius: 8px; margin-top: 8px;}}')
+        situation_group.setProperty("accent", "purple")
         situation_layout = QVBoxLayout()
         self.situation_combo = QComboBox()
         self.situation_combo.addItems(['업무', '데이트', '운동', '일상', '파티'])
-        self.situation_combo.setStyleSheet(f'padding: 8px; border-radius: 6px; background: {self.theme["SIDEBAR_BG"]}; color: {self.theme["SIDEBAR_TEXT"]};')
         situation_layout.addWidget(self.situation_combo)
         situation_group.setLayout(situation_layout)
         right_layout.addWidget(situation_group)
         # 날씨
         weather_group = QGroupBox('날씨')
-        weather_group.setStyleSheet(f'QGroupBox {{ color: {self.theme["ACCENT_BLUE"]}; font-weight: bold; border: 1.5px solid {self.theme["ACCENT_BLUE"]}; border-radius: 8px; margin-top: 8px;}}')
+        weather_group.setProperty("accent", "blue")
         weather_layout = QVBoxLayout()
         self.weather_combo = QComboBox()
         self.weather_combo.addItems(['맑음', '흐림', '비', '눈'])
-        self.weather_combo.setStyleSheet(f'padding: 8px; border-radius: 6px; background: {self.theme["SIDEBAR_BG"]}; color: {self.theme["SIDEBAR_TEXT"]};')
         weather_layout.addWidget(self.weather_combo)
 
         # 온도 게이지 추가
         self.temp_gauge = TemperatureGauge(self)
         weather_layout.addWidget(self.temp_gauge)
+        # 지금 기온/날씨에 입을 수 있는 옷 수 (슬라이더를 끄는 동안 바로 갱신)
+        self.wearable_label = QLabel('')
+        self.wearable_label.setWordWrap(True)
+        weather_layout.addWidget(self.wearable_label)
+        self.wearable_check = QCheckBox('입을 수 있는 옷만 보기')
+        self.wearable_check.toggled.connect(self.refresh_wearable)
+        weather_layout.addWidget(self.wearable_check)
+        self._wearable_timer = QTimer(self)
+        self._wearable_timer.setSingleShot(True)
+        self._wearable_timer.setInterval(WEARABLE_FILTER_MS)
+        self._wearable_timer.timeout.connect(self.refresh_wearable)
+        self.weather_combo.currentIndexChanged.connect(self.on_weather_changed)
+        self.temp_gauge.slider.valueChanged.connect(self.on_weather_changed)
 
         weather_group.setLayout(weather_layout)
         right_layout.addWidget(weather_group)
         # 색상 선호도
         color_group = QGroupBox('색상 선호도')
-        color_group.setStyleSheet(f'QGroupBox {{ color: {self.theme["ACCENT_YELLOW"]}; font-weight: bold; border: 1.5px solid {self.theme["ACCENT_YELLOW"]}; border-radius: 8px; margin-top: 8px;}}')
+        color_group.setProperty("accent", "yellow")
         color_layout = QGridLayout()
         # 좋아하는 색
         color_layout.addWidget(QLabel('좋아하는 색:'), 0, 0)
@@ -564,7 +527,6 @@ class MainWindow(QMainWindow):
         color_layout.addWidget(self.like_color_widget, 0, 1)
         self.like_color_add_btn = QPushButton('+')
         self.like_color_add_btn.setFixedWidth(28)
-        self.like_color_add_btn.setStyleSheet(f'background: {self.theme["ACCENT_YELLOW"]}; color: {self.theme["SIDEBAR_BG"]}; border-radius: 8px; font-weight: bold;')
         self.like_color_add_btn.clicked.connect(lambda: self.add_color('like'))
         color_layout.addWidget(self.like_color_add_btn, 0, 2)
         # 피하는 색
@@ -577,24 +539,25 @@ class MainWindow(QMainWindow):
         color_layout.addWidget(self.avoid_color_widget, 1, 1)
         self.avoid_color_add_btn = QPushButton('+')
         self.avoid_color_add_btn.setFixedWidth(28)
-        self.avoid_color_add_btn.setStyleSheet(f'background: {self.theme["ACCENT_PURPLE"]}; color: white; border-radius: 8px; font-weight: bold;')
         self.avoid_color_add_btn.clicked.connect(lambda: self.add_color('avoid'))
         color_layout.addWidget(self.avoid_color_add_btn, 1, 2)
+        # 옷장 전체에 대한 선호/기피 색 매칭 결과 요약
+        self.color_match_label = QLabel('')
+        color_layout.addWidget(self.color_match_label, 2, 0, 1, 3)
         color_group.setLayout(color_layout)
         right_layout.addWidget(color_group)
         # 스타일 선택
         style_group = QGroupBox('스타일 선택')
-        style_group.setStyleSheet(f'QGroupBox {{ color: {self.theme["ACCENT_BLUE"]}; font-weight: bold; border: 1.5px solid {self.theme["ACCENT_BLUE"]}; border-radius: 8px; margin-top: 8px;}}')
+        style_group.setProperty("accent", "blue")
         style_layout = QVBoxLayout()
         self.style_combo = QComboBox()
         self.style_combo.addItems(['캐주얼', '포멀', '스포티', '빈티지'])
-        self.style_combo.setStyleSheet(f'padding: 8px; border-radius: 6px; background: {self.theme["SIDEBAR_BG"]}; color: {self.theme["SIDEBAR_TEXT"]};')
         style_layout.addWidget(self.style_combo)
         style_group.setLayout(style_layout)
         right_layout.addWidget(style_group)
         # 추천 우선순위
         priority_group = QGroupBox('추천 우선순위')
-        priority_group.setStyleSheet(f'QGroupBox {{ color: {self.theme["ACCENT_PURPLE"]}; font-weight: bold; border: 1.5px solid {self.theme["ACCENT_PURPLE"]}; border-radius: 8px; margin-top: 8px;}}')
+        priority_group.setProperty("accent", "purple")
         priority_layout = QVBoxLayout()
         self.priority_color_radio = QRadioButton('색상 조합')
         self.priority_style_radio = QRadioButton('스타일 일관성')
@@ -602,16 +565,24 @@ class MainWindow(QMainWindow):
         self.priority_group = QButtonGroup()
         self.priority_group.addButton(self.priority_color_radio)
         self.priority_group.addButton(self.priority_style_radio)
-        self.priority_color_radio.setStyleSheet(f'color: {self.theme["SIDEBAR_TEXT"]};')
-        self.priority_style_radio.setStyleSheet(f'color: {self.theme["SIDEBAR_TEXT"]};')
         priority_layout.addWidget(self.priority_color_radio)
         priority_layout.addWidget(self.priority_style_radio)
         priority_group.setLayout(priority_layout)
         right_layout.addWidget(priority_group)
         # 하단: 코디 추천 버튼
         self.recommend_btn = QPushButton('코디 추천')
-        self.recommend_btn.setStyleSheet(f'padding: 14px 0; background: {self.theme["ACCENT_PURPLE"]}; color: white; border-radius: 10px; font-weight: bold; font-size: 17px;')
+        self.recommend_btn.setObjectName("recommend_btn")
+        self.recommend_btn.clicked.connect(self.on_recommend_clicked)
         right_layout.addWidget(self.recommend_btn)
+        # 조건 변경 -> 진행 중인 추천은 바로 취소, 슬라이더 드래그 등이 잦아들면 새로 추천
+        self._recommend_timer = QTimer(self)
+        self._recommend_timer.setSingleShot(True)
+        self._recommend_timer.setInterval(150)
+        self._recommend_timer.timeout.connect(self.refresh_recommendation)
+        for signal in (self.situation_combo.currentIndexChanged, self.weather_combo.currentIndexChanged,
+                       self.style_combo.currentIndexChanged, self.temp_gauge.slider.valueChanged,
+                       self.priority_color_radio.toggled):
+            signal.connect(self.on_preferences_changed)
         right_layout.addStretch(1)
         self.right_frame.setLayout(right_layout)
 
@@ -625,35 +596,73 @@ class MainWindow(QMainWindow):
         coordinator_layout.addWidget(self.right_frame, 25)
         coordinator_tab.setLayout(coordinator_layout)
 
-        # 탭 추가
-        style_analysis_tab = QWidget()
+        # 탭 추가: 첫 화면인 코디네이터만 바로 만들고, 나머지는 처음 열 때 만듦
         self.tab_widget.addTab(coordinator_tab, "코디네이터")
-        self.tab_widget.addTab(style_analysis_tab, "스타일 분석")
-        # 설정 탭 추가
-        settings_tab = QWidget()
-        vbox = QVBoxLayout(settings_tab)
+        self.add_lazy_tab("스타일 분석", self.build_style_analysis_tab)
+        self.add_lazy_tab('설정', self.build_settings_tab)
+        self.tab_widget.currentChanged.connect(self.ensure_tab_built)
+        main_layout.addWidget(self.tab_widget)
+        self.centralWidget().setLayout(main_layout)
+        self.apply_theme()
+
+    def add_lazy_tab(self, title, builder):
+        # 빈 페이지만 먼저 추가하고 builder(page)는 탭을 처음 열 때 호출
+        page = QWidget()
+        self._tab_builders[page] = builder
+        self.tab_widget.addTab(page, title)
+
+    def ensure_tab_built(self, index):
+        page = self.tab_widget.widget(index)
+        builder = self._tab_builders.pop(page, None)
+        if builder is not None:
+            builder(page)
+
+    def build_style_analysis_tab(self, page):
+        self.analysis_page = AnalysisPage(self.closet_stats, self.theme)
+        QVBoxLayout(page).addWidget(self.analysis_page)
+
+    def build_settings_tab(self, page):
+        # 설정 탭 안의 페이지: 일반(테마) / 성능(계측)
+        settings_tabs = QTabWidget()
+        QVBoxLayout(page).addWidget(settings_tabs)
+        general = QWidget()
+        settings_tabs.addTab(general, '일반')
+        settings_tabs.addTab(PerfPage(self.stall_detector), '성능')
+        vbox = QVBoxLayout(general)
         vbox.addStretch(1)
         theme_label = QLabel('테마 선택:')
         self.theme_combo = QComboBox()
         self.theme_combo.addItems(['기본 모드', '다크 모드'])
         self.theme_combo.setCurrentIndex(1 if self.theme_mode == 'dark' else 0)
         self.theme_combo.currentIndexChanged.connect(self.on_theme_changed)
+        self.theme_time_label = QLabel(self.theme_time_text)   # 마지막 테마 적용에 걸린 시간
         vbox.addWidget(theme_label)
         vbox.addWidget(self.theme_combo)
+        vbox.addWidget(self.theme_time_label)
+        # 감시 폴더: 폴더에 새로 생기거나 바뀐/지워진 사진만 옷장에 반영
+        watch_box = QGroupBox('감시 폴더')
+        watch_layout = QVBoxLayout(watch_box)
+        self.watch_label = QLabel()
+        self.watch_label.setWordWrap(True)
+        watch_buttons = QHBoxLayout()
+        choose_btn = QPushButton('폴더 선택...')
+        choose_btn.clicked.connect(self.choose_watch_folder)
+        stop_btn = QPushButton('감시 끄기')
+        stop_btn.clicked.connect(lambda: self.set_watch_folder(None))
+        watch_buttons.addWidget(choose_btn)
+        watch_buttons.addWidget(stop_btn)
+        watch_layout.addWidget(self.watch_label)
+        watch_layout.addLayout(watch_buttons)
+        vbox.addWidget(watch_box)
+        self.update_watch_label()
         vbox.addStretch(10)
-        self.tab_widget.addTab(settings_tab, '설정')
-        main_layout.addWidget(self.tab_widget)
-        self.centralWidget().setLayout(main_layout)
-        self.apply_theme()
 
     def on_theme_changed(self, idx):
-        if idx == 0:
-            self.theme_mode = 'light'
-            self.theme = LIGHT_THEME.copy()
-        else:
-            self.theme_mode = 'dark'
-            self.theme = DARK_THEME.copy()
+        self.theme_mode = 'light' if idx == 0 else 'dark'
+        self.theme = THEMES[self.theme_mode]
         self.apply_theme()
+        if self.analysis_page is not None:
+            self.analysis_page.set_theme(self.theme)
 
     def upload_image(self):
         file_dialog = QFileDialog(self)
@@ -667,35 +676,470 @@ class MainWindow(QMainWindow):
             if current_item:
                 self.filter_images_by_category(current_item, 0)
 
+    def predict_tags(self, file_names):
+        # 자동 태깅: 파일 전체를 배치 단위로 한 번에 추론. 모델이 없으면 빈 결과
+        # 대화상자를 띄우기 전에 기다리는 요청이라 일괄 가져오기/임베딩 작업보다 먼저 처리
+        service = default_service()
+        if service is None or not file_names:
+            return {}
+        keys = []
+        for path in file_names:
+            try:
+                keys.append(content_hash(path))
+            except OSError:
+                keys.append(None)
+        predictions = service.predict_paths(list(file_names), keys=keys, urgent=True)
+        return {path: p for path, p in zip(file_names, predictions) if p is not None}
+
+    @perf.traced('MainWindow.handle_image_files', 'ui')
     def handle_image_files(self, file_names):
+        # 파일 하나는 기존처럼 태그 대화상자, 여러 개나 폴더는 대화상자 없이 일괄 가져오기
+        if len(file_names) != 1 or os.path.isdir(file_names[0]):
+            self.start_bulk_import(file_names)
+            return
+        predictions = self.predict_tags(file_names)
         for file_path in file_names:
-            tag_dialog = ImageTagDialog(file_path, parent=self)
+            prediction = predictions.get(file_path)
+            ai_tags = prediction.tags if prediction else None
+            tag_dialog = ImageTagDialog(file_path, ai_tags=ai_tags, parent=self)
             if tag_dialog.exec() == QDialog.Accepted:
-                tags = tag_dialog.get_tags()  # {카테고리: 하위항목}
-                main_cat = next(iter(tags.keys()), None)
-                self.image_category_map[file_path] = main_cat
-                pixmap = QPixmap(file_path)
-                if not pixmap.isNull():
-                    icon = QIcon(pixmap.scaled(100, 100, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-                    item = QListWidgetItem(icon, "")
-                    item.setToolTip(f"{file_path}\n{tags}")
-                    item.setData(Qt.UserRole, main_cat)
-                    self.image_list.addItem(item)
+                # 저장소 복사/색 분석은 작업 스레드에서, 끝나면 일괄 가져오기 결과와 같은 경로로 옷장에 반영
+                embedding = prediction.embedding if prediction is not None else None
+                job = TaggedImportJob(file_path, tag_dialog.get_tags(), embedding, self.image_store, self.mask_store,
+                                      parent=self)
+                job.finished.connect(lambda result, job=job: self.on_tagged_import(job, result))
+                job.start()
+
+    def on_tagged_import(self, job, result):
+        self.on_import_results([result])
+        job.deleteLater()
+
+    @perf.traced('MainWindow.load_closet', 'ui')
+    def load_closet(self, chunks=None):
+        # DB에서 LOAD_BATCH개씩 읽어 이벤트 루프에 양보하며 옷장을 복원 (저장은 생략)
+        if chunks is None:
+            chunks = self.closet_db.iter_items()
+        chunk = next(chunks, None)
+        if chunk is None:
+            # 다 불러온 뒤: 유사도 색인 군집화, 임베딩이 없는 옷은 백그라운드에서 채움
+            # 궁합 캐시에서는 디스크에만 남은(그 사이 지운) 옷의 행을 비움
+            if self.embedding_index.needs_rebuild():
+                self.embedding_index.build()
+            self.start_embedding_backfill()
+            self.compatibility.prune_unseen()
+            self._compat_timer.start()
+            # 감시 폴더는 옷장을 다 불러온 뒤 재조정 (가져온 원래 경로와 비교해야 하므로)
+            roots = self.closet_db.watched_roots()
+            if roots:
+                self.start_folder_sync(roots[0])
+            return
+        cache = self.image_list.thumbnails.cache
+        entries = []
+        colors = []
+        for stored in chunk:
+            if stored.content_hash and stored.mtime_ns is not None:
+                cache.remember(stored.path, stored.mtime_ns, stored.size, stored.content_hash)
+            if stored.thumbnail:
+                self._saved_thumbnail_refs[stored.path] = stored.thumbnail
+            if stored.colors:
+                colors.append((stored.path, *unpack_colors(stored.colors)))
+            if stored.source_path:
+                self.item_sources[stored.path] = (stored.source_path, phash_from_hex(stored.phash))
+            entries.append((stored.path, stored.tags, stored.content_hash))
+        self.add_closet_items(entries, persist=False)
+        self.set_item_colors(colors, persist=False)
+        # 다음 청크가 바로 이어지므로 검색 색인/궁합 캐시는 불러오기가 끝난 뒤부터 채움
+        self._search_index_timer.start()
+        self._compat_timer.start()
+        QTimer.singleShot(0, lambda: self.load_closet(chunks))
 
+    @perf.traced('MainWindow.add_closet_items', 'ui')
+    def add_closet_items(self, entries, persist=True):
+        # entries: [(경로, {카테고리: 하위항목}[, 내용 해시])]. 인덱스를 먼저 갱신해야 프록시가 새 행을 바로 판정함
+        # 같은 경로가 두 번 오면 마지막 태그만 씀 (기존 항목은 아래에서 한 번만 빼므로)
+        entries = list({entry[0]: entry for entry in entries}.values())
+        items, carried = [], []
+        # 태그만 바뀐 재등록이면 이미 분석한 색/내용 해시는 새 id로 옮김. 기존 항목은 묶어서 한 번에 뺌
+        previous = {}
+        for file_path, *_ in entries:
+            item_id = self.closet_index.by_path.get(file_path)
+            if item_id is not None:
+                colors = self.color_index.colors_of(item_id)
+                if colors is not None:
+                    colors = (colors[0].copy(), colors[1].copy())
+                previous[file_path] = (self.closet_index.get(item_id).content_hash, colors)
+        self.remove_closet_items(list(previous))
+        for file_path, tags, *extra in entries:
+            digest = extra[0] if extra else ''
+            old_digest, carried_colors = previous.get(file_path, ('', None))
+            digest = digest or old_digest
+            item = self.closet_index.add(file_path, tags, digest)
+            if carried_colors is not None:
+                self.color_index.add(item.item_id, *carried_colors)
+                carried.append((item.item_id, *carried_colors))
+            source = self.item_sources.get(file_path)
+            self.search_index.add(item, carried_colors, source[0] if source else file_path)
+            self.image_category_map[file_path] = item.main_cat
+            items.append(item)
+        self._recommender = None
+        self.suitability.add_many(items)
+        self.closet_stats.add_many(items)
+        self.closet_stats.set_colors(carried)
+        self.image_list.add_items(items)
+        if items:
+            # 입을 수 있는 옷 수/필터는 옷장 추가가 잠잠해지면 한 번에
+            self._wearable_timer.start()
+            # 검색 색인/궁합 캐시는 옷장 추가가 잠잠해지면 조금씩 채움. 검색 결과는 스냅샷이라 검색 중이면 다시 찾음
+            self._search_index_timer.start()
+            self.touch_compatibility(item.item_id for item in items)
+            if self.search_ids is not None:
+                self._search_timer.start()
+        self.index_embeddings(items)
+        if persist and items:
+            # 가져오기 청크 하나 = DB 트랜잭션 하나
+            self.closet_db.upsert_items([(item.path, item.tags, item.content_hash) for item in items])
+        return items
+
+    def remove_closet_item(self, file_path, persist=False):
+        return self.remove_closet_items([file_path], persist)[0]
+
+    @perf.traced('MainWindow.remove_closet_items', 'ui')
+    def remove_closet_items(self, file_paths, persist=False):
+        # 여러 옷을 한 번에 뺌: 인덱스는 항목별로, 목록 모델/DB는 묶음 한 번 -> [ClosetItem 또는 None]
+        removed = []
+        for file_path in file_paths:
+            item = self.closet_index.remove(file_path)
+            self.image_category_map.pop(file_path, None)
+            removed.append(item)
+            if item is None:
+                continue
+            self.color_index.remove(item.item_id)
+            self.search_index.remove(item.item_id)
+            self.suitability.remove(item.item_id)
+            self.closet_stats.remove(item.item_id)
+            self.compatibility.remove(item.item_id)
+            self.embedding_index.remove(item.item_id)
+        ids = [item.item_id for item in removed if item is not None]
+        if ids:
+            self._recommender = None
+            self._wearable_timer.start()
+            self._compat_timer.start()
+            self.image_list.source_model.remove_items(ids)
+            self.similar_model.remove_items(ids)
+            if persist:
+                self.closet_db.delete_paths([item.path for item in removed if item is not None])
+        return removed
+
+    def set_item_sources(self, updates):
+        # updates: [(저장소 경로, 원래 경로, pHash 또는 None)]
+        for path, source_path, phash in updates:
+            self.item_sources[path] = (source_path, phash)
+            item_id = self.closet_index.by_path.get(path)
+            if item_id is not None and source_path:
+                self.search_index.set_file(item_id, source_path)
+        self.closet_db.set_sources([(path, source_path, phash_to_hex(phash)) for path, source_path, phash in updates])
+
+    def set_item_colors(self, updates, persist=True):
+        # updates: [(경로, Lab 대표색, 비중)] -> 색 인덱스 갱신 + DB 한 트랜잭션
+        rows, analyzed = [], []
+        for path, colors, weights in updates:
+            item_id = self.closet_index.by_path.get(path)
+            if item_id is None:
+                continue
+            self.color_index.add(item_id, colors, weights)
+            analyzed.append((item_id, colors, weights))
+            self.search_index.set_colors(item_id, colors, weights)
+            self.touch_compatibility((item_id,))
+            self._recommender = None
+            if persist:
+                rows.append((path, pack_colors(colors, weights)))
+        self.closet_stats.set_colors(analyzed)
+        if persist and rows:
+            self.closet_db.set_colors(rows)
+
+    def index_embeddings(self, items):
+        # 저장소에 임베딩이 있는 항목만 유사도 색인에 추가 (내용 해시로 연결)
+        keyed = [(item.item_id, self.embedding_store.row_of.get(item.content_hash)) for item in items
+                 if item.content_hash]
+        keyed = [(item_id, row) for item_id, row in keyed if row is not None]
+        if keyed:
+            ids, rows = zip(*keyed)
+            self.embedding_index.add_many(ids, self.embedding_store.matrix[list(rows)])
+            self.touch_compatibility(ids)
+            self._recommender = None
+
+    def set_item_embeddings(self, updates):
+        # updates: [(경로, 내용 해시, 임베딩)] -> 저장소에 기록하고 색인 갱신
+        self.embedding_store.add_many([(digest, vector) for _, digest, vector in updates])
+        items, hashed = [], []
+        for path, digest, _ in updates:
+            item_id = self.closet_index.by_path.get(path)
+            if item_id is None:
+                continue
+            item = self.closet_index.get(item_id)
+            if not item.content_hash:
+                self.closet_index.set_content_hash(path, digest)
+                hashed.append((path, item.tags, digest))
+            items.append(item)
+        if hashed:
+            self.closet_db.upsert_items(hashed)
+        self.index_embeddings(items)
+
+    def start_embedding_backfill(self):
+        if self.embedding_job is not None:
+            return
+        missing = [(item.path, item.content_hash) for item in self.closet_index.items.values()
+                   if item.item_id not in self.embedding_index]
+        if not missing:
+            return
+        job = EmbeddingJob(missing, parent=self)
+        job.embeddings_ready.connect(self.set_item_embeddings)
+        job.finished.connect(self.on_embedding_backfill_finished)
+        self.embedding_job = job
+        job.start()
+
+    def on_embedding_backfill_finished(self, cancelled):
+        self.embedding_job = None
+
+    def on_closet_item_selected(self, current, previous):
+        # 선택한 옷의 임베딩으로 최근접 이웃을 찾아 '비슷한 옷' 목록에 표시
+        item_id = current.data(ItemIdRole) if current.isValid() else None
+        vector = self.embedding_index.get(item_id) if item_id is not None else None
+        items = []
+        if vector is not None:
+            keys, _ = self.embedding_index.search(vector, SIMILAR_ITEM_COUNT, exclude=item_id)
+            items = [item for item in (self.closet_index.get(int(key)) for key in keys) if item is not None]
+        self.similar_model.set_items(items)
+        self.image_list.pinned_paths = {item.path for item in items}
+        self.similar_label.setVisible(bool(items))
+        self.similar_list.setVisible(bool(items))
+
+    def on_thumbnail_ready(self, path, digest, image):
+        # 썸네일 캐시 위치를 DB에 기록 (잦은 쓰기를 피하려고 모아서 저장)
+        if digest and not image.isNull() and path in self.closet_index:
+            ref = self.image_list.thumbnails.cache.path_for(digest)
+            if self._saved_thumbnail_refs.get(path) == ref:
+                return
+            self._pending_thumbnail_refs[path] = ref
+            if not self._thumbnail_flush_timer.isActive():
+                self._thumbnail_flush_timer.start()
+
+    def flush_thumbnail_refs(self):
+        updates, self._pending_thumbnail_refs = list(self._pending_thumbnail_refs.items()), {}
+        if updates:
+            self.closet_db.set_thumbnails(updates)
+            self._saved_thumbnail_refs.update(updates)
+
+    def closeEvent(self, event):
+        self.stall_detector.stop()
+        self.cancel_bulk_import()
+        self.cancel_recommendation()
+        if self.embedding_job is not None:
+            self.embedding_job.cancel()
+        self.flush_thumbnail_refs()
+        self.compatibility.close()
+        if self.folder_sync is not None:
+            self.folder_sync.stop()
+        super().closeEvent(event)
+
+    def start_bulk_import(self, paths):
+        # 가져오기는 한 번에 하나씩, 진행 중에 들어온 요청은 대기열에 보관
+        if self.import_job is not None:
+            self.import_queue.append(paths)
+            return
+        # 예전에 가져온 원래 경로도 알려 주어, 같은 파일을 다시 넣으면 해시 계산 없이 건너뜀
+        sources = self.item_sources.values()
+        job = BulkImportJob(paths, default_service(),
+                            [*self.closet_index.by_path.keys(), *(source for source, _ in sources)],
+                            self.closet_index.by_hash.keys(), self.image_store,
+                            [phash for _, phash in sources if phash is not None], self.mask_store, parent=self)
+        job.results_ready.connect(self.on_import_results)
+        job.progress.connect(self.on_import_progress)
+        job.finished.connect(self.on_import_finished)
+        self.import_job = job
+        self.import_progress.setRange(0, 0)
+        self.import_status_label.setText("가져오는 중...")
+        self.import_cancel_btn.setEnabled(True)
+        self.import_progress_widget.show()
+        job.start()
+
+    def cancel_bulk_import(self):
+        # 취소된 감시 폴더 파일은 기록하지 않음 -> 다음 시작 때 재조정에서 다시 가져옴
+        self._watch_pending.clear()
+        self.import_queue.clear()
+        if self.import_job is not None:
+            self.import_job.cancel()
+            self.import_cancel_btn.setEnabled(False)
+
+    def on_import_results(self, results):
+        # 결과는 청크마다 바로 옷장에 반영 (검토가 필요한 항목도 예측 태그로 우선 등록)
+        self.add_closet_items([(r.path, r.tags, r.content_hash) for r in results])
+        self.set_item_colors([(r.path, *r.colors) for r in results if r.colors is not None])
+        self.set_item_embeddings([(r.path, r.content_hash, r.embedding) for r in results if r.embedding is not None])
+        self.set_item_sources([(r.path, r.source_path, r.phash) for r in results if r.source_path != r.path])
+        if self._watch_pending:
+            self.record_watched_files([(r.display_path, r.content_hash) for r in results
+                                       if r.display_path in self._watch_pending])
+
+    def on_import_progress(self, done, discovered):
+        self.import_progress.setRange(0, max(discovered, 1))
+        self.import_progress.setValue(done)
+        review = len(self.import_job.review_items) if self.import_job else 0
+        near = self.import_job.importer.near_duplicates if self.import_job else 0
+        self.import_status_label.setText(f"{done}/{discovered} · 검토 {review} · 중복 {near}")
+
+    def on_import_finished(self, cancelled):
+        job, self.import_job = self.import_job, None
+        self.import_progress_widget.hide()
+        if job is not None and job.review_items and not cancelled:
+            dialog = ImportReviewDialog(job.review_items, parent=self)
+            if dialog.exec() == QDialog.Accepted:
+                self.add_closet_items(dialog.corrected_tags())
+        if self.import_queue:
+            self.start_bulk_import(self.import_queue.pop(0))
+        elif self._watch_pending and not cancelled:
+            # 결과가 없던 파일(중복/손상)도 처리는 끝났으므로 기록해 다시 가져오지 않음
+            self.record_watched_files([(path, None) for path in list(self._watch_pending)])
+
+    def choose_watch_folder(self):
+        folder = QFileDialog.getExistingDirectory(self, '감시할 폴더 선택')
+        if folder:
+            self.set_watch_folder(folder)
+
+    def set_watch_folder(self, root):
+        # 감시 폴더를 바꾸거나(root) 끔(None). 이전 폴더의 동기화 기록은 지움 (옷장에 들어온 옷은 그대로)
+        if self.folder_sync is not None:
+            self.folder_sync.stop()
+            self.folder_sync = None
+        self._watch_pending.clear()
+        root = os.path.abspath(root) if root else None
+        self.closet_db.set_watched_roots([root] if root else [])
+        if root:
+            self.start_folder_sync(root)
+        self.update_watch_label()
+
+    def start_folder_sync(self, root):
+        snapshot = FolderSnapshot(root, self.closet_db.watched_files(root))
+        job = FolderSyncJob(snapshot, parent=self)
+        job.changes_ready.connect(self.on_folder_changes)
+        self.folder_sync = job
+        job.start()
+
+    def update_watch_label(self, changes=None):
+        if self.watch_label is None:
+            return
+        job = self.folder_sync
+        if job is None:
+            self.watch_label.setText('감시 중인 폴더 없음')
+            return
+        mode = {'inotify': '변경 알림', 'poll': '주기적 확인'}.get(job.mode, '시작 중')
+        text = f"{job.root} ({mode}) · 파일 {len(job.snapshot)}개"
+        if changes is not None:
+            text += (f"\n마지막 변경: 추가 {len(changes.added)} · 수정 {len(changes.modified)}"
+                     f" · 삭제 {len(changes.removed)}")
+        self.watch_label.setText(text)
+
+    @perf.traced('MainWindow.on_folder_changes', 'import')
+    def on_folder_changes(self, changes):
+        # 감시 스레드의 변경 묶음: 지워지거나 내용이 바뀐 파일의 옷은 빼고, 새 파일/바뀐 파일만 일괄 가져오기로
+        job = self.folder_sync
+        if job is None or changes.root != job.root:
+            return
+        stored_for = {source: stored for stored, (source, _) in self.item_sources.items()}
+        gone = [stored_for.get(path, path) for path, _ in changes.removed + changes.modified]
+        gone = [stored for stored in gone if stored in self.closet_index]
+        for stored in gone:
+            self.item_sources.pop(stored, None)
+        # 하위 폴더를 통째로 지운 경우에도 모델 갱신/DB 트랜잭션은 한 번
+        self.remove_closet_items(gone, persist=True)
+        removed = [path for path, _ in changes.removed]
+        for path in removed:
+            self._watch_pending.pop(path, None)
+        if removed:
+            self.closet_db.delete_watched_files(removed)
+        if changes.touched:
+            self.closet_db.upsert_watched_files(job.root, changes.touched)
+        # 이미 옷장에 있는 파일(예전에 직접 가져온 사진)은 가져오지 않고 상태만 기록
+        known, imports = [], []
+        for path in changes.added:
+            stored = stored_for.get(path, path)
+            item_id = self.closet_index.by_path.get(stored)
+            if item_id is not None:
+                known.append((path, self.closet_index.get(item_id).content_hash or None))
+            else:
+                imports.append(path)
+        imports.extend(path for path, _ in changes.modified)
+        for path in imports:
+            self._watch_pending[path] = changes.stats[path]
+        if known:
+            self._watch_pending.update((path, changes.stats[path]) for path, _ in known)
+            self.record_watched_files(known)
+        if imports:
+            self.start_bulk_import(imports)
+        self.update_watch_label(changes)
+
+    def record_watched_files(self, entries):
+        # entries: [(감시 폴더 경로, 내용 해시 또는 None)] -> 가져오기가 끝난 파일의 상태를 DB에 기록
+        job = self.folder_sync
+        rows = []
+        for path, digest in entries:
+            stat = self._watch_pending.pop(path, None)
+            if stat is None:
+                continue
+            rows.append((path, *stat, digest))
+            if job is not None and digest:
+                job.snapshot.set_hash(path, digest)
+        if rows and job is not None:
+            self.closet_db.upsert_watched_files(job.root, rows)
+
+    @perf.traced('MainWindow.filter_images_by_category', 'ui')
     def filter_images_by_category(self, item, column):
-        selected_cat = item.text(0)
-        cats = [selected_cat]
-        if item.childCount() > 0:
-            cats = [item.child(i).text(0) for i in range(item.childCount())]
-        self.image_list.clear()
-        for path, cat in self.image_category_map.items():
-            if cat in cats or selected_cat == cat:
-                pixmap = QPixmap(path)
-                if not pixmap.isNull():
-                    icon = QIcon(pixmap.scaled(100, 100, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-                    item = QListWidgetItem(icon, "")
-                    item.setToolTip(path)
-                    self.image_list.addItem(item)
+        # 인덱스의 id 집합으로 기존 행을 숨기거나 보이기만 함 (아이템/아이콘 재생성 없음)
+        parent = item.parent()
+        if parent is None:
+            ids = self.closet_index.ids_for(item.text(0))
+        else:
+            ids = self.closet_index.ids_for(parent.text(0), item.text(0))
+        self.category_filter_ids = ids
+        self.apply_closet_filter()
+
+    def apply_closet_filter(self):
+        # 카테고리 선택(라이브 집합)과 검색 결과, 입을 수 있는 옷(배열)의 교집합만 격자에 표시
+        ids = self.category_filter_ids
+        for subset in (self.search_ids, self.wearable_ids):
+            if subset is None:
+                continue
+            if ids is not None:
+                subset = subset[np.isin(subset, ids if isinstance(ids, np.ndarray) else list(ids))]
+            ids = subset
+        self.image_list.set_visible_ids(ids)
+
+    def wearable_mask(self):
+        return self.suitability.mask(self.temp_gauge.slider.value(), self.weather_combo.currentText())
+
+    def on_weather_changed(self, *args):
+        # 벌 수는 드래그 중에도 바로 (옷장 크기만큼의 비교 한 번), 격자 필터는 조작이 멈추면
+        self.update_wearable_label(self.wearable_mask())
+        if self.wearable_check.isChecked():
+            self._wearable_timer.start()
+
+    def update_wearable_label(self, mask):
+        if not len(self.suitability):
+            self.wearable_label.setText('')
+            return
+        counts = self.suitability.category_counts(mask)
+        detail = ' · '.join(f"{cat} {count}" for cat, count in counts.items() if count)
+        self.wearable_label.setText(f"지금 입을 수 있는 옷 {int(mask.sum())}벌" + (f"\n{detail}" if detail else ''))
+
+    @perf.traced('MainWindow.refresh_wearable', 'ui')
+    def refresh_wearable(self, *args):
+        mask = self.wearable_mask()
+        self.update_wearable_label(mask)
+        ids = self.suitability.ids_of(mask) if self.wearable_check.isChecked() else None
+        if ids is None and self.wearable_ids is None:
+            return
+        self.wearable_ids = ids
+        self.apply_closet_filter()
 
     def show_sample_outfit(self):
         base_dir = os.path.join(os.path.dirname(__file__), '../../images')
@@ -760,6 +1204,19 @@ class MainWindow(QMainWindow):
                 lbl.setToolTip(c)
                 lbl.mousePressEvent = lambda e, color=c: self.remove_color('avoid', color)
                 self.avoid_color_box.addWidget(lbl)
+        self.update_color_match()
+        self.on_preferences_changed()
+
+    def update_color_match(self):
+        # 옷장 전체를 선호/기피 팔레트와 한 번의 행렬 연산으로 비교
+        like_lab = hex_to_lab(self.like_colors)
+        avoid_lab = hex_to_lab(self.avoid_colors)
+        self.color_ranked_ids, self.color_scores = self.color_index.rank(like_lab, avoid_lab)
+        excluded = len(self.color_index) - len(self.color_ranked_ids)
+        if not (self.like_colors or self.avoid_colors):
+            self.color_match_label.setText('')
+        else:
+            self.color_match_label.setText(f"분석된 옷 {len(self.color_index)}벌 · 기피 색 제외 {excluded}벌")
 
     def remove_color(self, mode, color):
         if mode == 'like':
@@ -769,38 +1226,123 @@ class MainWindow(QMainWindow):
             self.avoid_colors = [c for c in self.avoid_colors if c != color]
             self.update_color_preview('avoid') 
 
-    def populate_sidebar(self, filter_text=""):
+    def index_search_pending(self):
+        # 유휴 시간에 검색 색인을 조금씩 채움 (그 전에 검색하면 남은 것을 한 번에 채움)
+        if self.search_index.index_pending(SEARCH_INDEX_BATCH):
+            QTimer.singleShot(0, self.index_search_pending)
+
+    def touch_compatibility(self, item_ids):
+        self.compatibility.touch(item_ids)
+        self._compat_timer.start()
+
+    def index_compatibility_pending(self):
+        # 유휴 시간에 궁합 캐시의 바뀐 행을 블록 단위로 계산 (추천은 캐시에 없는 쌍만 직접 계산하므로 기다리지 않음)
+        if self.compatibility.index_pending():
+            QTimer.singleShot(0, self.index_compatibility_pending)
+
+    def populate_sidebar(self):
+        # 트리는 한 번만 만들고 검색은 항목을 숨기거나 보이기만 함
         self.sidebar.clear()
-        filter_text = filter_text.lower()
         for cat, items in CATEGORIES.items():
-            if filter_text and filter_text not in cat.lower() and not any(filter_text in sub.lower() for sub in items):
-                continue
             cat_item = QTreeWidgetItem([cat])
             for sub in items:
-                if filter_text and filter_text not in sub.lower() and filter_text not in cat.lower():
-                    continue
-                sub_item = QTreeWidgetItem([sub])
-                cat_item.addChild(sub_item)
+                cat_item.addChild(QTreeWidgetItem([sub]))
             self.sidebar.addTopLevelItem(cat_item)
 
+    @perf.traced('MainWindow.filter_sidebar', 'ui')
     def filter_sidebar(self, text):
-        self.populate_sidebar(text)
+        # 색인 검색 -> 격자는 일치하는 옷만, 트리는 이름이 맞거나 일치하는 옷이 있는 카테고리만
+        mask = self.search_index.match_mask(text)
+        if mask is None:
+            self.search_ids = None
+            counts = None
+        else:
+            self.search_ids = self.search_index.ids_of(mask)
+            counts = self.search_index.label_counts(mask)
+        self.sidebar.setUpdatesEnabled(False)
+        for i in range(self.sidebar.topLevelItemCount()):
+            cat_item = self.sidebar.topLevelItem(i)
+            cat = cat_item.text(0)
+            cat_match = counts is None or text_matches(text, cat)
+            any_child = False
+            for j in range(cat_item.childCount()):
+                sub_item = cat_item.child(j)
+                sub = sub_item.text(0)
+                visible = cat_match or (cat, sub) in counts or text_matches(text, sub)
+                sub_item.setHidden(not visible)
+                any_child = any_child or visible
+            cat_item.setHidden(not (cat_match or any_child))
+        self.sidebar.setUpdatesEnabled(True)
         self.sidebar.expandAll()
+        self.apply_closet_filter()
 
     def change_temperature(self, delta):
-        self.temp_spin.setValue(self.temp_spin.value() + delta)
+        slider = self.temp_gauge.slider
+        slider.setValue(slider.value() + delta)
+
+    def recommender(self):
+        if self._recommender is None:
+            self._recommender = OutfitRecommender(self.closet_index, self.color_index, self.embedding_index,
+                                                  self.compatibility)
+        return self._recommender
+
+    def recommend_request(self):
+        return RecommendRequest(
+            situation=self.situation_combo.currentText(),
+            style=self.style_combo.currentText(),
+            weather=self.weather_combo.currentText(),
+            temperature=self.temp_gauge.slider.value(),
+            like_lab=hex_to_lab(self.like_colors),
+            avoid_lab=hex_to_lab(self.avoid_colors),
+            priority='color' if self.priority_color_radio.isChecked() else 'style',
+            top_n=RESULT_OUTFIT_COUNT,
+        )
 
     def on_recommend_clicked(self):
-        # 예시: 이미지 경로를 실제 추천 결과에 맞게 전달
-        # 실제 구현에서는 추천 알고리즘 결과를 받아서 경로를 전달해야 함
-        top_path = "./images/top.png"
-        bottom_path = "./images/bottom.png"
-        outer_path = "./images/outer.png"
-        shoes_path = "./images/shoes.png"
-        accessory_path = "./images/belt.png"
-        # 필수 이미지가 없으면 표시하지 않음
-        if not (os.path.exists(top_path) and os.path.exists(bottom_path)):
+        self._recommend_live = True
+        self.start_recommendation()
+
+    def start_recommendation(self):
+        # 이전 작업은 취소하고(결과는 버림) 현재 조건으로 새 작업 시작. 탐색/디코딩은 스레드 풀에서
+        self.cancel_recommendation()
+        job = RecommendJob(self.recommender(), self.recommend_request(), self.mask_store, parent=self)
+        job.results_ready.connect(lambda outfits, images, job=job: self.on_recommend_results(job, outfits, images))
+        job.finished.connect(lambda cancelled, job=job: self.on_recommend_finished(job, cancelled))
+        self.recommend_job = job
+        self.outfit_result_widget.set_title("추천 코디 찾는 중...")
+        job.start()
+
+    def cancel_recommendation(self):
+        if self.recommend_job is not None:
+            self.recommend_job.cancel()
+            self.recommend_job = None
+
+    def on_preferences_changed(self, *args):
+        if not self._recommend_live:
+            return
+        self.cancel_recommendation()
+        self._recommend_timer.start()
+
+    def refresh_recommendation(self):
+        if self._recommend_live:
+            self.start_recommendation()
+
+    def on_recommend_results(self, job, outfits, images):
+        # 취소된(이전 조건의) 작업이 늦게 보낸 결과는 무시
+        if job is not self.recommend_job:
             return
-        self.outfit_result_widget.show_outfit_result(
-            top_path, bottom_path, outer_path, shoes_path, accessory_path
-        )
\ No newline at end of file
+        self.recommended_outfits = outfits
+        if outfits:
+            self.outfit_result_widget.show_outfits(outfits, images)
+
+    def on_recommend_finished(self, job, cancelled):
+        # top-k 궁합 캐시면 이번 추천 후보 중 캐시에 없던 옷에 유휴 시간에 행을 줌
+        if self.compatibility.has_pending:
+            self._compat_timer.start()
+        if job is self.recommend_job:
+            self.recommend_job = None
+            if self.recommended_outfits:
+                self.outfit_result_widget.set_title("추천 코디")
+            else:
+                self.outfit_result_widget.show_message("조건에 맞는 상의/하의가 없습니다")
+        job.deleteLater()
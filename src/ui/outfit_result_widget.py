@@ -1,10 +1,47 @@
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton
 from PySide6.QtCore import Qt
-from PySide6.QtGui import QPixmap
+from PySide6.QtGui import QPainter, QPixmap
 import os
 
+from src.ai.compatibility import SLOTS
+from src.ui.pixmap_cache import default_pixmap_cache, pixmap_nbytes
+from src.ui.recommend_job import RESULT_IMAGE_SIZE
+from src.utils import perf
+from src.utils.lru import LRUCache
+from src.utils.thumbnails import decode_thumbnail
+
+COLLAGE_SPACING = 26          # 코디 이미지 사이 간격 (예전 라벨 간격 18 + 아래 여백 8)
+# 합성한 코디 이미지 보관 상한: 추천 결과 50개를 다 넘겨 봐도 다시 합성하지 않도록
+MAX_CACHED_COLLAGES = 64
+MAX_CACHED_COLLAGE_MB = 48
+PREFETCH_RADIUS = 1           # 보고 있는 코디의 앞뒤 몇 개를 미리 읽어 둘지
+
+
+def outfit_key(outfit):
+    return tuple(outfit.path(slot) for slot in SLOTS)
+
+
+def compose_collage(pixmaps, width=RESULT_IMAGE_SIZE):
+    # 슬롯 이미지를 세로로 이어 붙인 한 장 (가로 가운데 정렬, 배경 투명)
+    # 너비를 고정해 슬롯 수가 같은 코디끼리는 크기가 같음 -> 넘길 때 창을 다시 배치하지 않음
+    pixmaps = [p for p in pixmaps if p is not None and not p.isNull()]
+    if not pixmaps:
+        return QPixmap()
+    width = max([width] + [p.width() for p in pixmaps])
+    height = sum(p.height() for p in pixmaps) + COLLAGE_SPACING * (len(pixmaps) - 1)
+    collage = QPixmap(width, height)
+    collage.fill(Qt.transparent)
+    painter = QPainter(collage)
+    y = 0
+    for pixmap in pixmaps:
+        painter.drawPixmap((width - pixmap.width()) // 2, y, pixmap)
+        y += pixmap.height() + COLLAGE_SPACING
+    painter.end()
+    return collage
+
+
 class OutfitResultWidget(QWidget):
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, loader=None, pixmap_cache=None):
         super().__init__(parent)
         self.setObjectName("OutfitResultWidget")
         self.layout = QVBoxLayout(self)
@@ -14,22 +51,178 @@ class OutfitResultWidget(QWidget):
         # 제목 라벨
         self.title_label = QLabel("추천 코디")
         self.title_label.setAlignment(Qt.AlignCenter)
-        self.title_label.setStyleSheet("font-size: 28px; font-weight: bold; color: white; margin-bottom: 12px;")
+        self.title_label.setObjectName("outfit_title")
         self.layout.addWidget(self.title_label)
 
-        # 이미지 라벨 리스트
-        self.image_labels = []
+        # 이전/다음 코디 (결과가 두 개 이상일 때만 표시)
+        self.nav_widget = QWidget()
+        nav_layout = QHBoxLayout(self.nav_widget)
+        nav_layout.setContentsMargins(0, 0, 0, 0)
+        self.prev_btn = QPushButton("◀ 이전")
+        self.prev_btn.clicked.connect(self.show_previous)
+        self.page_label = QLabel()
+        self.page_label.setAlignment(Qt.AlignCenter)
+        self.page_label.setObjectName("outfit_page")
+        self.next_btn = QPushButton("다음 ▶")
+        self.next_btn.clicked.connect(self.show_next)
+        nav_layout.addWidget(self.prev_btn)
+        nav_layout.addStretch(1)
+        nav_layout.addWidget(self.page_label)
+        nav_layout.addStretch(1)
+        nav_layout.addWidget(self.next_btn)
+        self.nav_widget.hide()
+        self.layout.addWidget(self.nav_widget)
+
+        # 코디 이미지: 슬롯 이미지를 한 장으로 합성해 라벨 하나에 표시 (라벨은 만들고 지우지 않고 계속 재사용)
+        # 두 라벨 모두 고정 크기로 두어 내용이 바뀌어도 창 전체 레이아웃을 다시 계산하지 않게 함
+        # (크기가 자유로운 라벨은 글자/이미지를 바꿀 때마다 옷장 격자까지 다시 배치/그림 -> 넘길 때마다 약 7ms)
+        self.image_label = QLabel()
+        self.image_label.setAlignment(Qt.AlignCenter)
+        self.image_label.setObjectName("outfit_image")
+        self.image_label.hide()
+        self.layout.addWidget(self.image_label, 0, Qt.AlignHCenter)
+
+        # (경로, 'outfit') -> 슬롯 이미지. 옷장 격자와 같은 캐시를 씀
+        self.pixmaps = pixmap_cache or default_pixmap_cache()
+        # 코디 키(슬롯별 경로) -> 합성한 이미지
+        self.collages = LRUCache(max_items=MAX_CACHED_COLLAGES, max_bytes=MAX_CACHED_COLLAGE_MB * 1024 * 1024,
+                                 sizeof=pixmap_nbytes)
+        self.loader = loader              # OutfitImageLoader (없으면 GUI 스레드에서 바로 디코딩)
+        if loader is not None:
+            loader.images_ready.connect(self._on_images_ready)
+        self.outfits = []
+        self.index = 0
+
+    def clear_images(self):
+        self.outfits = []
+        self.index = 0
+        self.image_label.clear()
+        self.image_label.hide()
+        self.nav_widget.hide()
+
+    def show_message(self, text):
+        self.clear_images()
+        self.title_label.setText(text)
+
+    def set_title(self, text):
+        self.title_label.setText(text)
+
+    @perf.traced('OutfitResultWidget.show_outfits', 'ui')
+    def show_outfits(self, outfits, images=None):
+        # 추천 결과 목록을 받아 첫 코디부터 표시
+        # images: 작업 스레드에서 미리 디코딩한 첫 코디의 슬롯별 QImage (없으면 None)
+        self.outfits = list(outfits)
+        self.index = 0
+        if not self.outfits:
+            self.clear_images()
+            return
+        if images:
+            self._store_images(self.outfits[0], images)
+        count = len(self.outfits)
+        self.page_label.setText(f"{count} / {count}")
+        self._fix_size(self.page_label)
+        self._show_current()
+
+    def show_next(self):
+        if self.index + 1 < len(self.outfits):
+            self.index += 1
+            self._show_current()
 
+    def show_previous(self):
+        if self.index > 0:
+            self.index -= 1
+            self._show_current()
+
+    @perf.traced('OutfitResultWidget.show_outfit', 'ui')
+    def _show_current(self):
+        outfit = self.outfits[self.index]
+        collage = self._collage_for(outfit)
+        if collage is None:
+            if self.loader is not None:
+                # 디코딩이 끝나면 _on_images_ready에서 표시. 그 사이에는 이전 이미지를 그대로 둠
+                self.loader.request(outfit_key(outfit), self._slot_items(outfit))
+            else:
+                self._store_images(outfit, [self._decode(item) for item in self._slot_items(outfit)])
+                collage = self._collage_for(outfit)
+        if collage is not None:
+            self._set_collage(collage)
+        count = len(self.outfits)
+        self.page_label.setText(f"{self.index + 1} / {count}")
+        self.prev_btn.setEnabled(self.index > 0)
+        self.next_btn.setEnabled(self.index + 1 < count)
+        self.nav_widget.setVisible(count > 1)
+        self._prefetch()
+
+    def _prefetch(self):
+        # 앞뒤 코디의 슬롯 이미지를 미리 디코딩해 두어 넘길 때 바로 합성된 이미지가 나오게 함
+        if self.loader is None:
+            return
+        for index in range(self.index - PREFETCH_RADIUS, self.index + PREFETCH_RADIUS + 1):
+            if index == self.index or not 0 <= index < len(self.outfits):
+                continue
+            outfit = self.outfits[index]
+            key = outfit_key(outfit)
+            if key in self.collages or self.loader.is_pending(key):
+                continue
+            items = self._slot_items(outfit)
+            if any(item is not None and self._slot_pixmap(item) is None for item in items):
+                self.loader.request(key, items)
+
+    def _on_images_ready(self, key, images):
+        outfit = next((o for o in self.outfits if outfit_key(o) == key), None)
+        if outfit is None:
+            return
+        self._store_images(outfit, images)
+        collage = self._collage_for(outfit)
+        if collage is not None and self.outfits and outfit_key(self.outfits[self.index]) == key:
+            self._set_collage(collage)
+
+    def _slot_items(self, outfit):
+        return [outfit.items.get(slot) for slot in SLOTS]
+
+    def _slot_pixmap(self, item):
+        return self.pixmaps.get((item.path, 'outfit'), RESULT_IMAGE_SIZE)
+
+    def _store_images(self, outfit, images):
+        # 디코딩에 실패한 이미지도 빈 픽스맵으로 넣어 다시 요청하지 않게 함
+        for item, image in zip(self._slot_items(outfit), images):
+            if item is not None and image is not None:
+                self.pixmaps.put((item.path, 'outfit'), RESULT_IMAGE_SIZE, QPixmap.fromImage(image))
+
+    def _collage_for(self, outfit):
+        # 합성한 이미지가 있으면 그것을, 슬롯 이미지가 다 있으면 합성해 캐시에 넣고 돌려줌. 모자라면 None
+        key = outfit_key(outfit)
+        collage = self.collages.get(key)
+        if collage is None:
+            pixmaps = [self._slot_pixmap(item) for item in self._slot_items(outfit) if item is not None]
+            if any(pixmap is None for pixmap in pixmaps):
+                return None
+            collage = compose_collage(pixmaps)
+            self.collages.put(key, collage)
+        return collage
+
+    def _set_collage(self, collage):
+        self.image_label.setPixmap(collage)
+        self._fix_size(self.image_label)
+        self.image_label.setVisible(not collage.isNull())
+
+    def _fix_size(self, label):
+        # 내용에 맞는 크기가 바뀐 경우에만 고정 크기를 다시 지정 (이때만 레이아웃이 다시 계산됨)
+        hint = label.sizeHint()
+        if label.minimumSize() != hint or label.maximumSize() != hint:
+            label.setFixedSize(hint)
+
+    def _decode(self, item):
+        return decode_thumbnail(item.path, RESULT_IMAGE_SIZE) if item is not None else None
+
+    @perf.traced('OutfitResultWidget.show_outfit_result', 'ui')
     def show_outfit_result(self, top_path, bottom_path, outer_path=None, shoes_path=None, accessory_path=None):
         # 필수 이미지 없으면 표시하지 않음
         if not (top_path and bottom_path):
             return
 
-        # 이전 이미지 제거
-        for lbl in self.image_labels:
-            self.layout.removeWidget(lbl)
-            lbl.deleteLater()
-        self.image_labels.clear()
+        self.clear_images()
+        self.title_label.setText("추천 코디")
 
         # 이미지 경로 리스트 (순서대로)
         image_paths = [
@@ -39,14 +232,17 @@ class OutfitResultWidget(QWidget):
             shoes_path,
             accessory_path
         ]
-
-        for path in image_paths:
-            if path and os.path.exists(path):
-                pixmap = QPixmap(path)
-                if not pixmap.isNull():
-                    img_label = QLabel()
-                    img_label.setAlignment(Qt.AlignCenter)
-                    img_label.setPixmap(pixmap.scaledToWidth(200, Qt.SmoothTransformation))
-                    img_label.setStyleSheet("margin-bottom: 8px;")
-                    self.layout.addWidget(img_label)
-                    self.image_labels.append(img_label)
\ No newline at end of file
+        key = tuple(image_paths)
+        collage = self.collages.get(key)
+        if collage is None:
+            pixmaps = []
+            for path in image_paths:
+                if path and os.path.exists(path):
+                    pixmap = self.pixmaps.get((path, 'outfit'), RESULT_IMAGE_SIZE)
+                    if pixmap is None:
+                        image = decode_thumbnail(path, RESULT_IMAGE_SIZE)
+                        pixmap = self.pixmaps.put((path, 'outfit'), RESULT_IMAGE_SIZE, QPixmap.fromImage(image))
+                    pixmaps.append(pixmap)
+            collage = compose_collage(pixmaps)
+            self.collages.put(key, collage)
+        self._set_collage(collage)
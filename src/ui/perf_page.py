@@ -0,0 +1,126 @@
+import time
+
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtWidgets import (
+    QAbstractItemView, QCheckBox, QFileDialog, QHBoxLayout, QHeaderView, QLabel, QListWidget, QListWidgetItem,
+    QPlainTextEdit, QPushButton, QTableWidget, QTableWidgetItem, QVBoxLayout, QWidget
+)
+
+from src.ai.inference import loaded_service
+from src.utils import perf
+from src.utils.stall import STALL_MS
+
+REFRESH_MS = 500     # 페이지가 보이는 동안 표 갱신 간격
+STAT_COLUMNS = ["구간", "분류", "횟수", "합계 ms", "평균 ms", "최대 ms", "마지막 ms"]
+
+
+class PerfPage(QWidget):
+    # 설정 > 성능: 계측 켜기/끄기, 구간별 누적 시간, GUI 멈춤(스택), 추론 서비스 상태, Chrome trace 내보내기
+    def __init__(self, stall_detector, parent=None):
+        super().__init__(parent)
+        self.stall_detector = stall_detector
+        layout = QVBoxLayout(self)
+
+        controls = QHBoxLayout()
+        self.enable_check = QCheckBox("계측 켜기")
+        self.enable_check.setChecked(perf.enabled())
+        self.enable_check.toggled.connect(self.set_enabled)
+        reset_btn = QPushButton("초기화")
+        reset_btn.clicked.connect(self.reset)
+        export_btn = QPushButton("trace 내보내기")
+        export_btn.clicked.connect(self.export_trace)
+        controls.addWidget(self.enable_check)
+        controls.addStretch(1)
+        controls.addWidget(reset_btn)
+        controls.addWidget(export_btn)
+        layout.addLayout(controls)
+
+        self.summary_label = QLabel()
+        layout.addWidget(self.summary_label)
+
+        self.stats_table = QTableWidget(0, len(STAT_COLUMNS))
+        self.stats_table.setHorizontalHeaderLabels(STAT_COLUMNS)
+        self.stats_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.stats_table.verticalHeader().setVisible(False)
+        self.stats_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        layout.addWidget(self.stats_table, 2)
+
+        layout.addWidget(QLabel(f"GUI 멈춤 ({STALL_MS}ms 초과, 최근 순)"))
+        stall_row = QHBoxLayout()
+        self.stall_list = QListWidget()
+        self.stall_list.currentItemChanged.connect(self.show_stall_stack)
+        self.stack_view = QPlainTextEdit()
+        self.stack_view.setReadOnly(True)
+        stall_row.addWidget(self.stall_list, 1)
+        stall_row.addWidget(self.stack_view, 2)
+        layout.addLayout(stall_row, 1)
+
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setInterval(REFRESH_MS)
+        self._refresh_timer.timeout.connect(self.refresh)
+        self._shown_stalls = 0
+
+    def set_enabled(self, on):
+        perf.set_enabled(on)
+        if on:
+            self.stall_detector.start()
+        else:
+            self.stall_detector.stop()
+        self.refresh()
+
+    def reset(self):
+        perf.reset()
+        self.stall_list.clear()
+        self.stack_view.clear()
+        self._shown_stalls = 0
+        self.refresh()
+
+    def export_trace(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Chrome trace 저장", f"trace_{time.strftime('%Y%m%d_%H%M%S')}.json",
+                                              "Trace (*.json)")
+        if path:
+            perf.export_chrome_trace(path)
+            self.summary_label.setText(f"저장됨: {path}")
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self._refresh_timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._refresh_timer.stop()
+
+    def refresh(self):
+        rows = perf.stats()
+        self.stats_table.setRowCount(len(rows))
+        for r, row in enumerate(rows):
+            for c, value in enumerate(row):
+                text = f"{value:.1f}" if isinstance(value, float) else str(value)
+                self.stats_table.setItem(r, c, QTableWidgetItem(text))
+
+        # 새로 생긴 멈춤만 목록 맨 위에 추가 (목록은 보관 개수만큼만 유지)
+        total, stalls = perf.stalls()
+        new = min(total - self._shown_stalls, len(stalls))
+        for at, duration, stack in stalls[len(stalls) - new:]:
+            item = QListWidgetItem(f"{at:8.1f}s  {duration:6.1f}ms")
+            item.setData(Qt.UserRole, stack or "스택 없음 (스택을 뜨기 전에 끝났거나 네이티브 코드에서 멈춤)")
+            self.stall_list.insertItem(0, item)
+        while self.stall_list.count() > perf.MAX_STALLS:
+            self.stall_list.takeItem(self.stall_list.count() - 1)
+        self._shown_stalls = total
+
+        state = "켜짐" if perf.enabled() else "꺼짐"
+        summary = f"계측 {state} · 멈춤 {total}회"
+        service = loaded_service()
+        if service is not None:
+            s = service.stats()
+            p50 = f"{s['p50_ms']:.1f}" if s['p50_ms'] is not None else "-"
+            p99 = f"{s['p99_ms']:.1f}" if s['p99_ms'] is not None else "-"
+            cache = s['tensor_cache']
+            summary += (f" · 추론 대기 {s['queue_depth']} (최대 {s['max_queue_depth']}) · 요청 {s['requests']}"
+                        f" · 지연 p50 {p50} / p99 {p99}ms · 전처리 캐시 {cache['hits']}/{cache['hits'] + cache['misses']}")
+        self.summary_label.setText(summary)
+
+    def show_stall_stack(self, current, previous):
+        self.stack_view.setPlainText(current.data(Qt.UserRole) if current is not None else "")
@@ -0,0 +1,64 @@
+from src.utils.lru import LRUCache
+
+# 크기 구간: 요청 크기를 이 중 가장 가까운 큰 값으로 올려 묶음 (비슷한 크기끼리 같은 항목을 씀)
+SIZE_BUCKETS = (100, 200, 400)
+# 화면용 픽스맵 보관 상한 (항목 수 / 메가바이트). 격자 썸네일 + 추천 결과 이미지
+MAX_CACHED_PIXMAPS = 1000
+MAX_CACHED_PIXMAP_MB = 64
+
+
+def pixmap_nbytes(pixmap):
+    return pixmap.width() * pixmap.height() * pixmap.depth() // 8
+
+
+def size_bucket(size):
+    for bucket in SIZE_BUCKETS:
+        if size <= bucket:
+            return bucket
+    return size
+
+
+class PixmapCache:
+    # (키, 크기 구간) -> 줄여 둔 QPixmap. 옷장 격자/비슷한 옷 목록/추천 결과가 함께 씀 (GUI 스레드 전용)
+    # 키는 보통 원본 경로, 같은 경로라도 다르게 그린 이미지는 (경로, 종류) 튜플
+    def __init__(self, max_items=MAX_CACHED_PIXMAPS, max_mb=MAX_CACHED_PIXMAP_MB):
+        self._lru = LRUCache(max_items=max_items, max_bytes=max_mb * 1024 * 1024, sizeof=pixmap_nbytes)
+
+    def __len__(self):
+        return len(self._lru)
+
+    @property
+    def hits(self):
+        return self._lru.hits
+
+    @property
+    def misses(self):
+        return self._lru.misses
+
+    @property
+    def total_bytes(self):
+        return self._lru.total_bytes
+
+    def contains(self, key, size):
+        return (key, size_bucket(size)) in self._lru
+
+    def get(self, key, size):
+        return self._lru.get((key, size_bucket(size)))
+
+    def put(self, key, size, pixmap):
+        self._lru.put((key, size_bucket(size)), pixmap)
+        return pixmap
+
+    def clear(self):
+        self._lru.clear()
+
+
+_default_cache = None
+
+
+def default_pixmap_cache():
+    # QPixmap은 GUI 스레드에서만 만들고 쓰므로 잠금 없이 하나만 둠
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = PixmapCache()
+    return _default_cache
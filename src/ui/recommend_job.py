@@ -0,0 +1,95 @@
+import threading
+
+from PySide6.QtCore import QObject, QThreadPool, Signal
+
+from src.ai.compatibility import SLOTS
+from src.ai.segment import garment_mask
+from src.utils.thumbnails import cutout_image, decode_thumbnail
+
+RESULT_IMAGE_SIZE = 200   # OutfitResultWidget에 표시하는 이미지 크기
+
+
+def outfit_image(item, mask_store=None):
+    # 결과 표시용 QImage (mask_store가 있으면 배경을 지운 이미지). 빈 슬롯이면 None
+    if item is None:
+        return None
+    image = decode_thumbnail(item.path, RESULT_IMAGE_SIZE)
+    mask = garment_mask(item.path, item.content_hash, mask_store)
+    if mask is not None and not image.isNull():
+        image = cutout_image(image, mask)
+    return image
+
+
+class RecommendJob(QObject):
+    # 코디 탐색과 결과 이미지 디코딩을 스레드 풀에서 실행
+    # 빔 폭을 넓혀 가며 탐색하고, 결과가 바뀔 때마다 GUI 스레드로 전달
+    results_ready = Signal(list, list)    # (list[Outfit], 첫 코디의 슬롯별 QImage 또는 None)
+    finished = Signal(bool)               # 취소 여부
+
+    def __init__(self, recommender, request, mask_store=None, parent=None):
+        super().__init__(parent)
+        self.recommender = recommender    # 옷장 스냅샷이라 작업 중에 옷장이 바뀌어도 안전
+        self.request = request
+        self.mask_store = mask_store      # MaskStore가 있으면 배경을 지운(잘라낸) 이미지로 표시
+        self.cancelled = threading.Event()
+        self._images = {}                 # 경로 -> QImage (탐색 단계 사이에 같은 이미지를 다시 디코딩하지 않음)
+
+    def start(self):
+        QThreadPool.globalInstance().start(self._run)
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def _image_for(self, item):
+        if item is None:
+            return None
+        image = self._images.get(item.path)
+        if image is None:
+            image = self._images[item.path] = outfit_image(item, self.mask_store)
+        return image
+
+    def _run(self):
+        try:
+            last = None
+            for outfits in self.recommender.iter_recommend(self.request, should_stop=self.cancelled.is_set):
+                key = [[item.item_id for item in outfit.items.values()] for outfit in outfits]
+                if key == last:
+                    continue
+                last = key
+                images = [self._image_for(outfits[0].items.get(slot)) for slot in SLOTS] if outfits else []
+                if self.cancelled.is_set():
+                    break
+                self.results_ready.emit(outfits, images)
+        finally:
+            self.finished.emit(self.cancelled.is_set())
+
+
+class OutfitImageLoader(QObject):
+    # 코디를 넘겨 볼 때 쓸 슬롯 이미지를 스레드 풀에서 디코딩 (보고 있는 코디와 앞뒤 코디 미리 읽기)
+    images_ready = Signal(object, list)   # (코디 키, 슬롯별 QImage 또는 None)
+
+    def __init__(self, mask_store=None, parent=None):
+        super().__init__(parent)
+        self.mask_store = mask_store
+        self._pending = set()             # 디코딩 중인 코디 키 (같은 코디를 두 번 요청하지 않음)
+        self.images_ready.connect(self._on_ready)
+
+    @property
+    def has_pending(self):
+        return bool(self._pending)
+
+    def is_pending(self, key):
+        return key in self._pending
+
+    def request(self, key, items):
+        # items: 슬롯 순서의 ClosetItem 또는 None
+        if key in self._pending:
+            return
+        self._pending.add(key)
+        QThreadPool.globalInstance().start(lambda: self._run(key, items))
+
+    def _run(self, key, items):
+        self.images_ready.emit(key, [outfit_image(item, self.mask_store) for item in items])
+
+    def _on_ready(self, key, images):
+        self._pending.discard(key)
@@ -0,0 +1,240 @@
+import time
+from string import Template
+
+# === 테마 색상 정의 ===
+# 다크모드(현재)
+DARK_THEME = {
+    'DARK_BG': '#23243A',         # 전체 배경
+    'CARD_BG': '#282A36',         # 카드/프레임/그룹박스 배경
+    'ACCENT_PURPLE': '#6C63FF',   # 강조(테두리/버튼)
+    'ACCENT_BLUE': '#4F8CFF',     # 버튼/포커스
+    'ACCENT_YELLOW': '#FFE066',   # 포인트
+    'TEXT_COLOR': '#E0E0E0',      # 메인 텍스트
+    'BORDER_RADIUS': '12px',
+    'SIDEBAR_BG': '#23243A',      # 사이드바/입력창 배경
+    'SIDEBAR_TEXT': '#E0E0E0',    # 사이드바/라벨 텍스트
+    'SIDEBAR_BTN_BG': '#353570',  # 버튼 배경
+    'SIDEBAR_BTN_TEXT': '#E0E0E0',# 버튼 텍스트
+    'ITEM_BG': '#282A36',         # 아이템/리스트 배경
+    'INPUT_BG': '#2C2D3C',        # 입력창 배경
+    'INPUT_TEXT': '#E0E0E0',      # 입력창 텍스트
+    'INPUT_PLACEHOLDER': '#B0B0B0', # 입력창 placeholder
+    'INPUT_BORDER': '#6C63FF',    # 입력창 테두리
+}
+
+# 기본(라이트) 모드: 이미지 참고
+LIGHT_THEME = {
+    'DARK_BG': '#E3F3FC',      # 전체 배경 (가장 밝은 하늘색)
+    'CARD_BG': '#C7E4F5',      # 패널/박스 배경 (밝은 하늘색)
+    'ACCENT_PURPLE': '#0077B6',
+    'ACCENT_BLUE': '#0099CC',
+    'ACCENT_YELLOW': '#FFD600',
+    'TEXT_COLOR': '#222',
+    'BORDER_RADIUS': '12px',
+    'SIDEBAR_BG': '#B3DDF2',   # 사이드바/입력창 배경
+    'SIDEBAR_TEXT': '#003344',
+    'SIDEBAR_BTN_BG': '#0099CC',
+    'SIDEBAR_BTN_TEXT': '#FFF',
+    'ITEM_BG': '#E3F3FC',
+    'INPUT_BG': '#FFFFFF',
+    'INPUT_TEXT': '#222',
+    'INPUT_PLACEHOLDER': '#888',
+    'INPUT_BORDER': '#0099CC',
+}
+
+THEMES = {'dark': DARK_THEME, 'light': LIGHT_THEME}
+
+# 메인 창에 한 번에 적용하는 스타일시트 템플릿 ($키 = 테마 색상)
+# 위젯은 objectName(#이름)과 동적 속성([accent="..."])으로 구분하고, 위젯마다 setStyleSheet를 호출하지 않음
+# 같은 우선순위의 규칙은 뒤에 오는 것이 이기므로, 개별 위젯 규칙은 일반 규칙 뒤에 둠
+STYLESHEET_TEMPLATE = Template("""
+QMainWindow, QWidget#central_widget, QFrame#center_bg_frame {
+    background: $DARK_BG;
+}
+QFrame#left_frame, QFrame#center_frame, QFrame#result_frame, QFrame#right_frame {
+    background: $CARD_BG;
+    border-radius: $BORDER_RADIUS;
+}
+QWidget#sidebar_panel {
+    background: transparent;
+}
+
+/* 좌측 패널 */
+QTreeWidget#sidebar {
+    background: $SIDEBAR_BG;
+    color: $SIDEBAR_TEXT;
+    border-radius: 8px;
+    font-size: 15px;
+    border: 2px solid $ACCENT_PURPLE;
+}
+QLineEdit#sidebar_search {
+    padding: 6px 10px;
+    border-radius: 8px;
+    background: $INPUT_BG;
+    color: $INPUT_TEXT;
+    border: 2px solid $INPUT_BORDER;
+    font-size: 15px;
+}
+QToolButton#sidebar_toggle_btn {
+    background: $SIDEBAR_BTN_BG;
+    color: $SIDEBAR_BTN_TEXT;
+    border-radius: 8px;
+    font-size: 16px;
+    padding: 4px 10px;
+    font-weight: bold;
+}
+QLabel#closet_tab_label {
+    background: $CARD_BG;
+    color: $ACCENT_PURPLE;
+    border: 2px solid $ACCENT_PURPLE;
+    border-radius: 8px;
+    font-size: 15px;
+    padding: 4px 14px;
+    margin-left: 8px;
+    margin-top: 2px;
+    font-weight: bold;
+}
+QListView#image_list, QListView#similar_list {
+    background: $ITEM_BG;
+    border-radius: 10px;
+    border: 2px solid $ACCENT_PURPLE;
+    color: $SIDEBAR_TEXT;
+}
+QLabel#similar_label, QLabel#import_status_label {
+    color: $TEXT_COLOR;
+}
+QPushButton#upload_button {
+    padding: 12px 0;
+    background: $ACCENT_BLUE;
+    color: #fff;
+    border-radius: 8px;
+    font-weight: bold;
+    font-size: 15px;
+    border: none;
+}
+
+/* 중앙: 추천 결과 */
+QLabel#outfit_title {
+    font-size: 28px;
+    font-weight: bold;
+    color: $TEXT_COLOR;
+    margin-bottom: 12px;
+}
+QLabel#outfit_image {
+    margin-bottom: 8px;
+}
+QLabel#outfit_page {
+    font-size: 14px;
+    color: $TEXT_COLOR;
+}
+
+/* 우측 패널: 그룹박스는 accent 속성으로 테두리/제목 색 구분 */
+QFrame#right_frame QGroupBox {
+    margin: 10px 0 0 0;
+    padding: 10px 16px 10px 16px;
+    border-radius: 10px;
+    border: 2px solid $ACCENT_PURPLE;
+    background: $CARD_BG;
+    color: $ACCENT_PURPLE;
+    font-size: 16px;
+    font-weight: bold;
+}
+QFrame#right_frame QGroupBox::title {
+    subcontrol-origin: margin;
+    subcontrol-position: top left;
+    left: 12px;
+    top: 6px;
+    padding: 0 4px;
+}
+QFrame#right_frame QGroupBox[accent="blue"] {
+    border-color: $ACCENT_BLUE;
+    color: $ACCENT_BLUE;
+}
+QFrame#right_frame QGroupBox[accent="yellow"] {
+    border-color: $ACCENT_YELLOW;
+    color: #B8860B;
+}
+QFrame#right_frame QLabel, QFrame#right_frame QPushButton {
+    color: $TEXT_COLOR;
+    font-size: 15px;
+    font-weight: bold;
+    background: $CARD_BG;
+    border: none;
+}
+QFrame#right_frame QComboBox, QFrame#right_frame QSpinBox {
+    padding: 8px;
+    border-radius: 6px;
+    background: $INPUT_BG;
+    color: $INPUT_TEXT;
+    border: 2px solid $INPUT_BORDER;
+    font-size: 15px;
+}
+QFrame#right_frame QComboBox QAbstractItemView {
+    background: $CARD_BG;
+    color: $INPUT_TEXT;
+    selection-background-color: $ACCENT_PURPLE;
+}
+QFrame#right_frame QRadioButton {
+    color: $TEXT_COLOR;
+    font-size: 15px;
+    background: $CARD_BG;
+}
+/* 온도 게이지 (숫자 라벨은 위의 우측 패널 공통 라벨 규칙을 따름) */
+QSlider#temp_slider::groove:horizontal {
+    border-radius: 8px;
+    height: 10px;
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 $ACCENT_PURPLE, stop:1 $ACCENT_BLUE);
+}
+QSlider#temp_slider::handle:horizontal {
+    background: $ACCENT_YELLOW;
+    border: 2px solid #fff;
+    width: 18px;
+    margin: -4px 0;
+    border-radius: 9px;
+}
+
+/* 대화상자 */
+QDialog#ImageTagDialog, QDialog#ImageTagDialog QWidget,
+QDialog#ImportReviewDialog, QDialog#ImportReviewDialog QWidget {
+    background: $CARD_BG;
+    color: $TEXT_COLOR;
+}
+QDialog#ImageTagDialog QComboBox {
+    padding: 4px;
+    border-radius: 6px;
+    border: 1px solid #444;
+    background: $DARK_BG;
+    color: $TEXT_COLOR;
+}
+QDialog#ImageTagDialog QLabel#tag_preview {
+    background: $DARK_BG;
+    border-radius: 8px;
+    border: 1px solid #444;
+}
+QDialog#ImageTagDialog QPushButton#register_btn {
+    padding: 10px 32px;
+    background: $ACCENT_PURPLE;
+    color: white;
+    border-radius: 8px;
+    font-weight: bold;
+}
+""")
+
+_compiled = {}   # 테마 이름 -> 완성된 스타일시트 (한 번만 치환)
+
+
+def compile_stylesheet(name):
+    qss = _compiled.get(name)
+    if qss is None:
+        qss = _compiled[name] = STYLESHEET_TEMPLATE.substitute(THEMES[name])
+    return qss
+
+
+def apply_stylesheet(window, name):
+    # 최상위 창의 스타일시트를 한 번만 교체 -> Qt가 창과 자식(부모가 창인 대화상자 포함)을 한 번에 다시 polish
+    # QApplication.setStyleSheet는 앱의 모든 위젯/스타일을 다시 만들어 측정상 약 3배 느림
+    # (걸린 시간 ms, 이미 컴파일된 테마였는지) 반환
+    cached = name in _compiled
+    start = time.perf_counter()
+    window.setStyleSheet(compile_stylesheet(name))
+    return (time.perf_counter() - start) * 1000.0, cached
@@ -0,0 +1,19 @@
+import hashlib
+
+
+def content_hash(path, chunk_size=1 << 20):
+    # 파일 내용 기반 해시 (경로가 바뀌어도 같은 이미지면 같은 키)
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    # 배포 파일(모델 등) 무결성 확인용 SHA-256
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
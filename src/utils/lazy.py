@@ -0,0 +1,45 @@
+import importlib
+import threading
+
+_import_lock = threading.Lock()
+
+
+class LazyModule:
+    # 첫 속성 접근 때 실제로 import하는 모듈 대리 객체 (무거운 ML/이미지 모듈을 시작 시간에서 제외)
+    # 설치되지 않았거나 import에 실패하면 bool(모듈)이 False, 속성 접근은 ImportError
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._error = None
+
+    def _load(self):
+        if self._module is None and self._error is None:
+            # 작업 스레드 여러 개가 동시에 처음 접근해도 한 번만 import
+            with _import_lock:
+                if self._module is None and self._error is None:
+                    try:
+                        self._module = importlib.import_module(self._name)
+                    except ImportError as e:
+                        self._error = e
+        return self._module
+
+    @property
+    def loaded(self):
+        return self._module is not None
+
+    def __bool__(self):
+        return self._load() is not None
+
+    def __getattr__(self, attr):
+        module = self._load()
+        if module is None:
+            raise ImportError(f"{self._name} 모듈을 불러올 수 없습니다") from self._error
+        return getattr(module, attr)
+
+    def __repr__(self):
+        state = 'loaded' if self._module is not None else 'failed' if self._error is not None else 'pending'
+        return f"<LazyModule {self._name} ({state})>"
+
+
+def lazy_import(name):
+    return LazyModule(name)
@@ -0,0 +1,62 @@
+from collections import OrderedDict
+
+
+class LRUCache:
+    # 항목 수 또는 바이트 상한을 넘으면 가장 오래 쓰이지 않은 항목부터 제거
+    def __init__(self, max_items=None, max_bytes=None, sizeof=None):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof or (lambda value: 0)
+        self._data = OrderedDict()   # key -> (value, nbytes)
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.on_evict = None         # 선택: 제거 시 콜백(key, value)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, value):
+        if key in self._data:
+            self.total_bytes -= self._data.pop(key)[1]
+        nbytes = self.sizeof(value)
+        self._data[key] = (value, nbytes)
+        self.total_bytes += nbytes
+        self._evict()
+
+    def pop(self, key, default=None):
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return default
+        self.total_bytes -= entry[1]
+        return entry[0]
+
+    def clear(self):
+        self._data.clear()
+        self.total_bytes = 0
+
+    def keys(self):
+        return list(self._data.keys())
+
+    def _evict(self):
+        # 방금 넣은 항목(맨 뒤)은 남겨둠
+        while len(self._data) > 1 and (
+            (self.max_items is not None and len(self._data) > self.max_items)
+            or (self.max_bytes is not None and self.total_bytes > self.max_bytes)
+        ):
+            key, (value, nbytes) = self._data.popitem(last=False)
+            self.total_bytes -= nbytes
+            if self.on_evict is not None:
+                self.on_evict(key, value)
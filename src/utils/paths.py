@@ -0,0 +1,11 @@
+import os
+
+# 앱 데이터(캐시/DB) 기본 위치. EDGE_FASHION_HOME 환경변수로 변경 가능
+APP_DIR_NAME = ".edge_fashion_copilot"
+
+
+def app_data_dir(*parts):
+    base = os.environ.get("EDGE_FASHION_HOME") or os.path.join(os.path.expanduser("~"), APP_DIR_NAME)
+    path = os.path.join(base, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
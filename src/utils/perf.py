@@ -0,0 +1,167 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+# 핫패스 계측: 꺼져 있으면 데코레이터/컨텍스트 매니저는 플래그 하나만 확인하고 바로 원래 함수를 실행
+# EDGE_FASHION_TRACE=1 로 시작하면 처음부터 켜짐 (설정 > 성능 페이지에서 켜고 끌 수 있음)
+MAX_EVENTS = 100000      # Chrome trace로 내보낼 최근 구간 수
+MAX_STALLS = 50          # 보관할 최근 GUI 멈춤 수
+
+_EPOCH = time.perf_counter()
+_lock = threading.Lock()
+_events = deque(maxlen=MAX_EVENTS)    # (이름, 분류, 시작 s, 길이 s, 스레드 id, 인자)
+_stats = {}                            # 이름 -> _Stat
+_stalls = deque(maxlen=MAX_STALLS)     # (시작 s, 길이 ms, 스택 문자열 또는 None)
+_thread_names = {}
+_stall_total = 0                       # 지금까지 기록한 멈춤 수 (보관 개수와 별개)
+_enabled = os.environ.get('EDGE_FASHION_TRACE') == '1'
+
+
+class _Stat:
+    __slots__ = ('category', 'count', 'total', 'max', 'last')
+
+    def __init__(self, category):
+        self.category = category
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+
+def enabled():
+    return _enabled
+
+
+def set_enabled(on):
+    global _enabled
+    _enabled = bool(on)
+
+
+def reset():
+    global _stall_total
+    with _lock:
+        _stall_total = 0
+        _events.clear()
+        _stats.clear()
+        _stalls.clear()
+
+
+def record(name, category, start, end, args=None):
+    # start/end: time.perf_counter() 값
+    duration = end - start
+    thread = threading.current_thread()
+    with _lock:
+        _thread_names[thread.ident] = thread.name
+        _events.append((name, category, start, duration, thread.ident, args))
+        stat = _stats.get(name)
+        if stat is None:
+            stat = _stats[name] = _Stat(category)
+        stat.count += 1
+        stat.total += duration
+        stat.last = duration
+        if duration > stat.max:
+            stat.max = duration
+
+
+class _Span:
+    __slots__ = ('name', 'category', 'args', 'start')
+
+    def __init__(self, name, category, args):
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, self.category, self.start, time.perf_counter(), self.args)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name, category='app', args=None):
+    # with perf.span('이름'): ...  (꺼져 있으면 공유 no-op 객체)
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name, category, args)
+
+
+def traced(name=None, category='app'):
+    # 함수/메서드 데코레이터. 이름을 생략하면 qualname
+    def decorate(fn):
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(label, category, start, time.perf_counter())
+        return wrapper
+    return decorate
+
+
+def record_stall(start, duration_ms, stack=None):
+    global _stall_total
+    with _lock:
+        _stalls.append((start, duration_ms, stack))
+        _stall_total += 1
+    record('GUI 멈춤', 'stall', start, start + duration_ms / 1000.0, {'stack': stack} if stack else None)
+
+
+def stats():
+    # [(이름, 분류, 횟수, 합계 ms, 평균 ms, 최대 ms, 마지막 ms)] 합계가 큰 순
+    with _lock:
+        rows = [(name, s.category, s.count, s.total * 1000.0, s.total * 1000.0 / s.count, s.max * 1000.0,
+                 s.last * 1000.0) for name, s in _stats.items()]
+    rows.sort(key=lambda row: row[3], reverse=True)
+    return rows
+
+
+def stalls():
+    # (지금까지의 멈춤 수, [(시작 후 경과 s, 길이 ms, 스택)] 최근 MAX_STALLS개, 최근 것이 마지막)
+    with _lock:
+        return _stall_total, [(start - _EPOCH, duration, stack) for start, duration, stack in _stalls]
+
+
+def chrome_trace():
+    # Chrome trace-event 형식 (chrome://tracing, Perfetto에서 열림). 시간 단위는 마이크로초
+    pid = os.getpid()
+    with _lock:
+        events = list(_events)
+        names = dict(_thread_names)
+    trace = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': thread_name}}
+             for tid, thread_name in names.items()]
+    for name, category, start, duration, tid, args in events:
+        event = {'name': name, 'cat': category, 'ph': 'X', 'pid': pid, 'tid': tid,
+                 'ts': round((start - _EPOCH) * 1e6, 1), 'dur': round(duration * 1e6, 1)}
+        if args:
+            event['args'] = args
+        trace.append(event)
+    return {'traceEvents': trace, 'displayTimeUnit': 'ms'}
+
+
+def export_chrome_trace(path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(chrome_trace(), f, ensure_ascii=False)
+    return path
@@ -0,0 +1,65 @@
+import sys
+import threading
+import time
+import traceback
+
+from PySide6.QtCore import QObject, Qt, QTimer
+
+from src.utils import perf
+
+STALL_MS = 16            # 한 프레임(60Hz)보다 오래 이벤트 루프가 돌지 못하면 멈춤으로 기록
+HEARTBEAT_MS = 5         # GUI 스레드 타이머 간격
+STACK_DEPTH = 12         # 멈춤 중에 떠 두는 GUI 스레드 스택 깊이
+
+
+class StallDetector(QObject):
+    # GUI 스레드는 HEARTBEAT_MS마다 시각을 남기고, 감시 스레드가 그 시각이 STALL_MS 넘게 멈추면 GUI 스레드 스택을 떠 둠
+    # 다음 박동에서 실제 멈춘 길이와 함께 perf.record_stall로 기록 (켜져 있는 동안만 타이머/감시 스레드가 돔)
+    def __init__(self, threshold_ms=STALL_MS, parent=None):
+        super().__init__(parent)
+        self.threshold = threshold_ms / 1000.0
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.setInterval(HEARTBEAT_MS)
+        self._timer.timeout.connect(self._beat)
+        self._gui_ident = threading.get_ident()
+        self._last_beat = 0.0
+        self._stack = None
+        self._stop = None        # 실행 중인 감시 스레드의 종료 신호
+
+    @property
+    def running(self):
+        return self._stop is not None
+
+    def start(self):
+        if self.running:
+            return
+        self._gui_ident = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._stack = None
+        self._stop = threading.Event()
+        threading.Thread(target=self._watch, args=(self._stop,), name='stall-watchdog', daemon=True).start()
+        self._timer.start()
+
+    def stop(self):
+        if self._stop is not None:
+            self._stop.set()
+            self._stop = None
+        self._timer.stop()
+
+    def _beat(self):
+        now = time.perf_counter()
+        blocked = now - self._last_beat - HEARTBEAT_MS / 1000.0
+        if blocked > self.threshold:
+            perf.record_stall(self._last_beat, blocked * 1000.0, self._stack)
+        self._stack = None
+        self._last_beat = now
+
+    def _watch(self, stop):
+        # 멈춤 하나당 스택은 한 번만 (가장 처음 확인한 위치 = 보통 멈춘 원인)
+        while not stop.wait(self.threshold / 2):
+            beat = self._last_beat
+            if self._stack is None and time.perf_counter() - beat > self.threshold:
+                frame = sys._current_frames().get(self._gui_ident)
+                if frame is not None and self._last_beat == beat:
+                    self._stack = ''.join(traceback.format_stack(frame, limit=STACK_DEPTH))
@@ -0,0 +1,177 @@
+import os
+
+import numpy as np
+from PySide6.QtCore import QObject, QRunnable, QSize, QThreadPool, Qt, Signal
+from PySide6.QtGui import QImage, QImageReader
+
+from src.utils import perf
+from src.utils.hashing import content_hash
+from src.utils.lazy import lazy_import
+from src.utils.paths import app_data_dir
+
+# Pillow는 첫 디코딩 때(작업 스레드에서) 불러옴. 없으면 QImageReader 경로만 사용
+Image = lazy_import('PIL.Image')
+ImageOps = lazy_import('PIL.ImageOps')
+
+THUMBNAIL_SIZE = 100
+JPEG_EXTS = ('.jpg', '.jpeg')
+
+
+def _decode_with_pillow(path, size):
+    with Image.open(path) as img:
+        # JPEG는 draft 모드로 DCT 단계에서 1/2~1/8 축소 디코딩
+        if path.lower().endswith(JPEG_EXTS):
+            img.draft('RGB', (size * 2, size * 2))
+        img = ImageOps.exif_transpose(img)
+        img.thumbnail((size, size), Image.LANCZOS)
+        img = img.convert('RGBA')
+        data = img.tobytes()
+        # tobytes 버퍼 수명과 분리하기 위해 copy()
+        return QImage(data, img.width, img.height, img.width * 4, QImage.Format_RGBA8888).copy()
+
+
+def _decode_with_qt(path, size):
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)
+    src_size = reader.size()
+    if src_size.isValid():
+        # 디코더 단계에서 축소 (JPEG는 libjpeg scale 사용)
+        reader.setScaledSize(src_size.scaled(size, size, Qt.KeepAspectRatio))
+    image = reader.read()
+    if image.isNull():
+        return image
+    if image.width() > size or image.height() > size:
+        image = image.scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    return image
+
+
+@perf.traced('thumbnails.decode', 'decode')
+def decode_thumbnail(path, size=THUMBNAIL_SIZE):
+    if Image:
+        try:
+            return _decode_with_pillow(path, size)
+        except Exception:
+            pass
+    return _decode_with_qt(path, size)
+
+
+def cutout_image(image, mask):
+    # 옷 영역 마스크(bool, 가로세로 비율만 같으면 됨)를 알파로 -> 배경이 투명한 QImage
+    # 마스크를 부드럽게 늘려 가장자리 계단을 줄임
+    alpha = np.ascontiguousarray(mask, dtype=np.uint8) * 255
+    h, w = alpha.shape
+    alpha_image = QImage(alpha.data, w, h, w, QImage.Format_Grayscale8)
+    alpha_image = alpha_image.scaled(image.size(), Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+    out = image.convertToFormat(QImage.Format_ARGB32)
+    out.setAlphaChannel(alpha_image)
+    return out
+
+
+class ThumbnailCache:
+    # 내용 해시를 키로 하는 디스크 썸네일 캐시: <dir>/<hash[:2]>/<hash>_<size>.png
+    def __init__(self, cache_dir=None, size=THUMBNAIL_SIZE):
+        self.cache_dir = cache_dir or app_data_dir('thumbnails')
+        self.size = size
+        # (path, mtime, 파일크기) -> 해시. 같은 파일을 다시 해시하지 않도록 메모
+        self._hash_memo = {}
+
+    def key_for(self, path):
+        st = os.stat(path)
+        memo_key = (path, st.st_mtime_ns, st.st_size)
+        digest = self._hash_memo.get(memo_key)
+        if digest is None:
+            digest = content_hash(path)
+            self._hash_memo[memo_key] = digest
+        return digest
+
+    def remember(self, path, mtime_ns, size, digest):
+        # 옷장 DB에 저장된 해시로 메모를 채워 시작 후 원본을 다시 해시하지 않게 함
+        self._hash_memo[(path, mtime_ns, size)] = digest
+
+    def path_for(self, digest):
+        return os.path.join(self.cache_dir, digest[:2], f"{digest}_{self.size}.png")
+
+    def load(self, digest):
+        cached = self.path_for(digest)
+        if os.path.exists(cached):
+            image = QImage(cached)
+            if not image.isNull():
+                return image
+        return None
+
+    def store(self, digest, image):
+        cached = self.path_for(digest)
+        os.makedirs(os.path.dirname(cached), exist_ok=True)
+        tmp = f"{cached}.{os.getpid()}.tmp"
+        if image.save(tmp, 'PNG'):
+            os.replace(tmp, cached)
+
+    def get_or_create(self, path):
+        digest = self.key_for(path)
+        image = self.load(digest)
+        if image is None:
+            image = decode_thumbnail(path, self.size)
+            if not image.isNull():
+                self.store(digest, image)
+        return digest, image
+
+
+class _ThumbnailTask(QRunnable):
+    def __init__(self, service, path):
+        super().__init__()
+        # 취소(tryTake)를 위해 파이썬 쪽에서 수명 관리
+        self.setAutoDelete(False)
+        self.service = service
+        self.path = path
+
+    def run(self):
+        try:
+            digest, image = self.service.cache.get_or_create(self.path)
+        except OSError:
+            digest, image = '', QImage()
+        # 워커 스레드에서 emit -> GUI 스레드 슬롯으로 queued 전달
+        self.service.thumbnail_ready.emit(self.path, digest, image)
+
+
+class ThumbnailService(QObject):
+    # (원본 경로, 내용 해시, 썸네일 QImage)
+    thumbnail_ready = Signal(str, str, QImage)
+
+    def __init__(self, cache=None, max_threads=None, parent=None):
+        super().__init__(parent)
+        self.cache = cache or ThumbnailCache()
+        self.pool = QThreadPool(self)
+        # GUI 스레드 몫으로 코어 하나는 남겨둠
+        self.pool.setMaxThreadCount(max_threads or max(1, (os.cpu_count() or 2) - 1))
+        self._pending = {}   # 경로 -> 대기/실행 중 작업
+        self.thumbnail_ready.connect(self._on_ready)
+
+    @property
+    def icon_size(self):
+        return QSize(self.cache.size, self.cache.size)
+
+    def request(self, path, priority=0):
+        if path in self._pending:
+            return
+        task = _ThumbnailTask(self, path)
+        self._pending[path] = task
+        self.pool.start(task, priority)
+
+    def is_pending(self, path):
+        return path in self._pending
+
+    def cancel_except(self, keep_paths):
+        # 아직 시작하지 않은 작업 중 keep_paths에 없는 것은 큐에서 제거
+        for path, task in list(self._pending.items()):
+            if path not in keep_paths and self.pool.tryTake(task):
+                del self._pending[path]
+
+    def request_many(self, paths):
+        for path in paths:
+            self.request(path)
+
+    def _on_ready(self, path, digest, image):
+        self._pending.pop(path, None)
+
+    def wait_for_done(self, msecs=-1):
+        return self.pool.waitForDone(msecs)
@@ -0,0 +1,79 @@
+import numpy as np
+
+from src.data.ann_index import BRUTE_FORCE_MAX, IVFIndex, spherical_kmeans
+
+
+def unit(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def reference_kmeans_step(sample, k, seed):
+    # spherical_kmeans와 같은 초기 중심에서 한 번 반복: 군집별 평균을 정규화, 빈 군집은 그대로
+    rng = np.random.default_rng(seed)
+    centroids = sample[rng.choice(len(sample), k, replace=False)].copy()
+    assign = (sample @ centroids.T).argmax(axis=1)
+    for c in range(k):
+        members = sample[assign == c]
+        if len(members):
+            centroids[c] = members.mean(axis=0)
+    return unit(centroids)
+
+
+def test_kmeans_centroids_are_cluster_means():
+    rng = np.random.default_rng(7)
+    sample = unit(rng.normal(size=(150, 8)))
+    for seed in range(5):
+        expected = reference_kmeans_step(sample, 6, seed)
+        np.testing.assert_allclose(spherical_kmeans(sample, 6, iterations=1, seed=seed), expected, atol=1e-5)
+
+
+def test_kmeans_with_empty_trailing_clusters():
+    # 같은 벡터가 반복된 표본: 초기 중심이 겹쳐 뒤쪽 군집이 비는 경우 (마지막 비지 않은 군집 합이 잘리면 안 됨)
+    sample = unit([[1, 0, 0]] * 3 + [[0.2 * i, 1, 0] for i in range(7)])
+    empty_seen = False
+    for seed in range(40):
+        rng = np.random.default_rng(seed)
+        init = sample[rng.choice(len(sample), 3, replace=False)]
+        assign = (sample @ init.T).argmax(axis=1)
+        empty_seen |= np.bincount(assign, minlength=3)[-1] == 0
+        expected = reference_kmeans_step(sample, 3, seed)
+        np.testing.assert_allclose(spherical_kmeans(sample, 3, iterations=1, seed=seed), expected, atol=1e-5)
+    assert empty_seen
+
+
+def clustered_vectors(n, dim, clusters, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    labels = rng.integers(clusters, size=n)
+    return unit(centers[labels] + 0.3 * rng.normal(size=(n, dim)))
+
+
+def test_ivf_recall_against_brute_force():
+    vectors = clustered_vectors(BRUTE_FORCE_MAX + 2000, 32, 60)
+    index = IVFIndex(32)
+    index.add_many(range(len(vectors)), vectors)
+    queries = clustered_vectors(50, 32, 60, seed=1)
+    found = 0
+    for query in queries:
+        keys, sims = index.search(query, k=10)
+        truth = np.argsort(-(vectors @ query))[:10]
+        found += len(set(keys.tolist()) & set(truth.tolist()))
+        assert np.all(np.diff(sims) <= 0)
+    assert index.centroids is not None
+    assert found / (10 * len(queries)) >= 0.9
+
+
+def test_ivf_removed_and_replaced_keys():
+    vectors = clustered_vectors(BRUTE_FORCE_MAX + 500, 16, 30)
+    index = IVFIndex(16)
+    index.add_many(range(len(vectors)), vectors)
+    index.search(vectors[0])
+    index.remove(0)
+    keys, _ = index.search(vectors[0], k=5)
+    assert 0 not in keys
+    # 같은 키를 새 벡터로 바꾸면 새 위치에서 찾힘
+    index.add(1, vectors[2])
+    keys, sims = index.search(vectors[2], k=2)
+    assert set(keys.tolist()) == {1, 2} and sims[0] > 0.999
+    assert len(index) == len(vectors) - 1
@@ -0,0 +1,93 @@
+import numpy as np
+
+from src.ai.compatibility import CompatibilityCache
+from src.ai.recommend import OutfitRecommender, RecommendRequest
+from src.data.categories import CATEGORIES
+from src.data.closet_index import ClosetIndex
+from src.data.color_index import ColorIndex
+
+
+def add_items(closet, colors, start, count, rng):
+    categories = list(CATEGORIES)
+    for i in range(start, start + count):
+        category = categories[i % len(categories)]
+        subs = CATEGORIES[category]
+        item = closet.add(f'/closet/{i}.jpg', {category: subs[rng.integers(len(subs))]}, f'hash{i}')
+        labs = np.column_stack([rng.uniform(20, 90, 3), rng.uniform(-60, 60, 3), rng.uniform(-60, 60, 3)])
+        colors.add(item.item_id, labs.astype(np.float32), np.array([0.6, 0.3, 0.1], dtype=np.float32))
+
+
+def all_pair_scores(recommender, request):
+    scores, keep = recommender.item_scores(request)
+    slots = recommender.candidates(request, scores, keep)
+    return [recommender.pair_scores(slots[a][1], slots[b][1], request.priority, slots[a][0], slots[b][0])
+            for b in range(len(slots)) for a in range(b)]
+
+
+def test_cached_pair_scores_match_direct(tmp_path):
+    rng = np.random.default_rng(0)
+    closet, colors = ClosetIndex(), ColorIndex()
+    add_items(closet, colors, 0, 400, rng)
+    cache = CompatibilityCache(closet, colors, directory=str(tmp_path))
+    cache.touch(list(closet.items))
+    while cache.index_pending():
+        pass
+    # 캐시에 아직 없는 새 옷: 그 옷의 행/열만 직접 계산해 채워야 함
+    add_items(closet, colors, 400, 20, rng)
+    request = RecommendRequest(temperature=5)
+    cached = all_pair_scores(OutfitRecommender(closet, colors, compatibility=cache), request)
+    direct = all_pair_scores(OutfitRecommender(closet, colors), request)
+    assert len(cached) == len(direct)
+    for got, expected in zip(cached, direct):
+        assert not np.isnan(got).any()
+        # 캐시는 float16이라 작은 반올림 차이만 허용
+        np.testing.assert_allclose(got, expected, atol=2e-3)
+    cache.close()
+
+
+def cache_hit_rate(cache, recommender, request):
+    scores, keep = recommender.item_scores(request)
+    slots = recommender.candidates(request, scores, keep)
+    hits = cells = 0
+    for b in range(len(slots)):
+        for a in range(b):
+            rows_a, rows_b = slots[a][1], slots[b][1]
+            rows_a, rows_b = rows_a[rows_a >= 0], rows_b[rows_b >= 0]
+            values = cache.lookup(slots[a][0], recommender.item_ids[rows_a], slots[b][0], recommender.item_ids[rows_b])
+            cells += values[..., 0].size
+            hits += int((~np.isnan(values[..., 0])).sum())
+    return hits / cells
+
+
+def test_top_k_cache_keeps_recent_candidates(tmp_path):
+    rng = np.random.default_rng(1)
+    closet, colors = ClosetIndex(), ColorIndex()
+    add_items(closet, colors, 0, 600, rng)
+    top_k = 64
+    cache = CompatibilityCache(closet, colors, directory=str(tmp_path), top_k=top_k)
+    cache.touch(list(closet.items))
+    while cache.index_pending():
+        pass
+    # 추천 후보로 조회되기 전에는 행을 두지 않음
+    assert not any(rows.keys for rows in cache.rows)
+    cached = OutfitRecommender(closet, colors, compatibility=cache)
+    direct = OutfitRecommender(closet, colors)
+    requests = [RecommendRequest(temperature=t, style=style) for t in (3, 18, 30) for style in ('캐주얼', '포멀')]
+    for request in requests:
+        for got, expected in zip(all_pair_scores(cached, request), all_pair_scores(direct, request)):
+            np.testing.assert_allclose(got, expected, atol=2e-3)
+        # 조회에서 빠진 후보는 유휴 시간에 행을 받고, 같은 조건의 다음 추천부터는 캐시에서 읽음
+        while cache.index_pending():
+            pass
+        assert cache_hit_rate(cache, cached, request) == 1.0
+        for got, expected in zip(all_pair_scores(cached, request), all_pair_scores(direct, request)):
+            np.testing.assert_allclose(got, expected, atol=2e-3)
+        assert all(len(rows.keys) <= top_k and rows.capacity <= top_k for rows in cache.rows)
+    cache.close()
+    # 다시 열면 행과 조회 시각이 그대로: 마지막 조건의 후보는 계속 캐시에 있음
+    reopened = CompatibilityCache(closet, colors, directory=str(tmp_path), top_k=top_k)
+    reopened.touch(list(closet.items))
+    while reopened.index_pending():
+        pass
+    assert cache_hit_rate(reopened, OutfitRecommender(closet, colors, compatibility=reopened), requests[-1]) == 1.0
+    reopened.close()
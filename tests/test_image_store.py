@@ -0,0 +1,44 @@
+import os
+
+from src.data.image_store import ImageStore
+from src.utils.hashing import content_hash
+
+
+def write(path, data):
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def test_ingest_copy_is_independent_of_original(tmp_path):
+    store = ImageStore(str(tmp_path / 'store'))
+    original = str(tmp_path / 'photo.jpg')
+    write(original, b'original bytes')
+    digest = content_hash(original)
+    blob = store.ingest(original, digest)
+    assert os.stat(blob).st_nlink == 1
+    # 원본을 제자리에서 고쳐도 해시 이름의 blob은 그대로
+    with open(original, 'r+b') as f:
+        f.write(b'EDITED')
+    assert read(blob) == b'original bytes'
+    assert store.ingest(blob, digest) == blob
+
+
+def test_ingest_replaces_hard_linked_blob(tmp_path):
+    store = ImageStore(str(tmp_path / 'store'))
+    original = str(tmp_path / 'photo.jpg')
+    write(original, b'original bytes')
+    digest = content_hash(original)
+    # 예전 버전처럼 원본과 하드 링크로 묶인 blob이 원본 편집으로 바뀐 상태
+    blob = store.path_for(digest, '.jpg')
+    os.makedirs(os.path.dirname(blob))
+    os.link(original, blob)
+    write(original, b'edited in place')
+    copy = str(tmp_path / 'copy.jpg')
+    write(copy, b'original bytes')
+    assert store.ingest(copy, digest) == blob
+    assert read(blob) == b'original bytes' and os.stat(blob).st_nlink == 1
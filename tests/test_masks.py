@@ -0,0 +1,37 @@
+import numpy as np
+
+from src.ai.segment import decode_mask, encode_mask
+from src.data.mask_store import MaskStore
+
+
+def test_rle_round_trip():
+    rng = np.random.default_rng(3)
+    masks = [
+        rng.random((96, 72)) < 0.5,
+        np.zeros((40, 96), dtype=bool),
+        np.ones((96, 96), dtype=bool),
+        np.pad(np.ones((50, 30), dtype=bool), 20),
+    ]
+    starts_true = np.zeros((10, 10), dtype=bool)
+    starts_true[0, :3] = True
+    masks.append(starts_true)
+    for mask in masks:
+        blob = encode_mask(mask)
+        decoded = decode_mask(blob, mask.shape)
+        assert decoded.dtype == bool and decoded.shape == mask.shape
+        np.testing.assert_array_equal(decoded, mask)
+
+
+def test_mask_store_reopen_drops_incomplete_records(tmp_path):
+    mask = np.pad(np.ones((30, 20), dtype=bool), 5)
+    store = MaskStore(str(tmp_path))
+    store.put('aaa', mask)
+    store.put('bbb', ~mask)
+    store.close()
+    # 마지막 기록의 데이터가 잘린 경우 (쓰는 도중 종료)
+    with open(store.data_path, 'r+b') as f:
+        f.truncate(f.seek(0, 2) - 1)
+    reopened = MaskStore(str(tmp_path))
+    assert 'aaa' in reopened and 'bbb' not in reopened
+    np.testing.assert_array_equal(reopened.get('aaa'), mask)
+    reopened.close()
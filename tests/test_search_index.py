@@ -0,0 +1,33 @@
+from src.data.closet_index import ClosetItem
+from src.data.search_index import ClosetSearchIndex
+
+
+def test_search_indexes_items_added_between_queries():
+    index = ClosetSearchIndex()
+    for i in range(3):
+        index.add(ClosetItem(i, f'/closet/{i}.jpg', '상의', '티셔츠'))
+    assert sorted(index.search('티셔츠')) == [0, 1, 2]
+    # 질의 사이에 추가한 항목은 다음 질의가 색인한 뒤 마스크를 만들어야 함
+    index.add(ClosetItem(3, '/closet/3.jpg', '상의', '티셔츠'))
+    index.add(ClosetItem(4, '/closet/4.jpg', '하의', '청바지'))
+    assert sorted(index.search('티셔츠')) == [0, 1, 2, 3]
+    assert sorted(index.search('ㅊㅂ')) == [4]
+
+
+def test_search_reuses_rows_of_replaced_items():
+    index = ClosetSearchIndex()
+    for i in range(10):
+        index.add(ClosetItem(i, f'/closet/{i}.jpg', '상의', '셔츠'))
+    index.index_pending()
+    size = index.size
+    # 태그를 고치면 같은 id로 다시 등록됨: 비운 행을 재사용해 행 수가 늘지 않아야 함
+    for round_ in range(5):
+        for i in range(10):
+            index.add(ClosetItem(i, f'/closet/{i}.jpg', '상의', '셔츠', {'색': f'색{round_}'}))
+        assert sorted(index.search('셔츠')) == list(range(10))
+    assert index.size == size
+    assert sorted(index.search('색4')) == list(range(10))
+    assert len(index.search('색3')) == 0
+    index.remove(5)
+    assert sorted(index.search('셔츠')) == [0, 1, 2, 3, 4, 6, 7, 8, 9]
+    assert index.label_counts(index.match_mask('셔츠')) == {('상의', '셔츠'): 9}